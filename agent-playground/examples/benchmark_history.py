@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark saving and loading task history in JSON and binary formats.
+
+Generates synthetic TaskResults shaped like real agent outputs and times the
+previous JSON path (dataclasses.asdict + indented JSON), the current JSON path
+and the binary history format with and without compression:
+
+    python examples/benchmark_history.py --records 100000
+
+No LLM calls are made and no API key is required.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.history_store import HistoryWriter, read_history
+from src.multi_agent_orchestrator import TaskResult, TaskType
+
+WORDS = (
+    "function variable return value error handling input validation loop "
+    "performance memory cache request response database query index thread "
+    "lock test coverage module class method interface dependency"
+).split()
+
+
+def make_results(count: int, seed: int):
+    """Build synthetic task results with review-like outputs."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+
+    def text(words: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(words))
+
+    results = []
+    for index in range(count):
+        sections = {
+            name: text(rng.randint(20, 80))
+            for name in rng.sample(["bugs", "style", "performance", "security"], 3)
+        }
+        failed = rng.random() < 0.05
+        results.append(
+            TaskResult(
+                agent_name="Code Reviewer",
+                task_type=TaskType.CODE_REVIEW,
+                input_data=text(rng.randint(30, 120)),
+                output={
+                    "agent": "Code Reviewer",
+                    "input_type": "code",
+                    "review": "\n\n".join(sections.values()),
+                    "sections": sections,
+                    "summary": text(15),
+                    "severity_level": rng.choice(["low", "medium", "high"]),
+                },
+                timestamp=start + timedelta(seconds=index),
+                execution_time=rng.uniform(0.5, 20.0),
+                success=not failed,
+                error_message="Request timed out" if failed else None,
+                cache_hit="exact" if rng.random() < 0.2 else None,
+            )
+        )
+    return results
+
+
+def legacy_to_dict(result: TaskResult) -> dict:
+    """TaskResult.to_dict as it was before the hand-written version."""
+    data = asdict(result)
+    data["task_type"] = result.task_type.value
+    data["timestamp"] = result.timestamp.isoformat()
+    return data
+
+
+def save_json(path, results, to_dict):
+    with open(path, "w") as f:
+        json.dump([to_dict(result) for result in results], f, indent=2)
+
+
+def load_json(path):
+    with open(path, "r") as f:
+        return [TaskResult.from_dict(item) for item in json.load(f)]
+
+
+def save_binary(path, results, compress):
+    with HistoryWriter(path, compress=compress, append=False) as writer:
+        writer.write_all(results)
+
+
+def load_binary(path):
+    return [TaskResult.from_dict(item) for item in read_history(path)]
+
+
+def timed(function, *args):
+    """Run a function and return (result, elapsed seconds)."""
+    start_time = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start_time
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--records", type=int, default=100000, help="Number of task results"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    results = make_results(args.records, args.seed)
+    print(f"📚 {len(results)} task results\n")
+
+    formats = [
+        (
+            "JSON (asdict, previous)",
+            "json",
+            lambda p: save_json(p, results, legacy_to_dict),
+            load_json,
+        ),
+        (
+            "JSON (to_dict)",
+            "json",
+            lambda p: save_json(p, results, TaskResult.to_dict),
+            load_json,
+        ),
+        ("Binary", "hist", lambda p: save_binary(p, results, False), load_binary),
+        ("Binary + zlib", "hist", lambda p: save_binary(p, results, True), load_binary),
+    ]
+
+    print(
+        f"{'Format':<26} {'Save (s)':>9} {'Save rec/s':>11} "
+        f"{'Load (s)':>9} {'Load rec/s':>11} {'Size (MB)':>10}"
+    )
+    print("-" * 81)
+    with tempfile.TemporaryDirectory() as directory:
+        for name, extension, save, load in formats:
+            path = os.path.join(directory, f"history.{extension}")
+            _, save_time = timed(save, path)
+            loaded, load_time = timed(load, path)
+            assert len(loaded) == len(results)
+            assert loaded[-1].to_dict() == results[-1].to_dict()
+            size = os.path.getsize(path) / 1024 / 1024
+            print(
+                f"{name:<26} {save_time:>9.2f} {len(results) / save_time:>11,.0f} "
+                f"{load_time:>9.2f} {len(results) / load_time:>11,.0f} {size:>10.1f}"
+            )
+            os.remove(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
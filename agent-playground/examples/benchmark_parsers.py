@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark agent post-processing on recorded LLM responses.
+
+Record a cassette once against a real provider:
+
+    python run.py cli review --file mycode.py --record-cassette review.jsonl.gz
+
+Then time the response parsers on the recorded data without any LLM calls:
+
+    python examples/benchmark_parsers.py review.jsonl.gz --repeat 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.agents.cassette import Cassette
+
+
+def build_agents(cassette_path):
+    """Create agents in replay mode so that no API key is required."""
+    os.environ["LLM_CASSETTE_MODE"] = "replay"
+    os.environ["LLM_CASSETTE_PATH"] = cassette_path
+
+    from src.agents import (
+        ArchitectureAdvisor,
+        CodeReviewer,
+        DocumentationAgent,
+        TestWriter,
+    )
+
+    reviewer = CodeReviewer()
+    writer = TestWriter()
+    documenter = DocumentationAgent()
+    advisor = ArchitectureAdvisor()
+
+    return {
+        reviewer.name: [
+            ("_parse_review_sections", reviewer._parse_review_sections),
+        ],
+        writer.name: [
+            (
+                "_analyze_test_coverage",
+                lambda text: writer._analyze_test_coverage(text, text),
+            ),
+            ("_count_tests", writer._count_tests),
+            ("_extract_setup_instructions", writer._extract_setup_instructions),
+        ],
+        documenter.name: [
+            (
+                "_analyze_documentation",
+                lambda text: documenter._analyze_documentation(text, text),
+            ),
+            ("_extract_sections", documenter._extract_sections),
+        ],
+        advisor.name: [
+            (
+                "_analyze_architecture",
+                lambda text: advisor._analyze_architecture(text, text, "medium"),
+            ),
+            ("_extract_patterns", advisor._extract_patterns),
+            ("_extract_technologies", advisor._extract_technologies),
+            ("_assess_risks", advisor._assess_risks),
+        ],
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "cassette", help="Cassette file recorded with --record-cassette"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=100, help="Iterations per recorded response"
+    )
+    args = parser.parse_args()
+
+    cassette = Cassette(args.cassette, mode="replay")
+    parsers = build_agents(args.cassette)
+
+    print(f"📼 {len(cassette)} recorded responses in {args.cassette}\n")
+    print(f"{'Agent':<22} {'Parser':<30} {'Calls':>8} {'Avg (µs)':>10}")
+    print("-" * 74)
+
+    for agent_name, functions in parsers.items():
+        texts = [
+            entry["r"] for entry in cassette.entries() if entry.get("a") == agent_name
+        ]
+        if not texts:
+            continue
+
+        for function_name, function in functions:
+            start_time = time.perf_counter()
+            for _ in range(args.repeat):
+                for text in texts:
+                    function(text)
+            elapsed = time.perf_counter() - start_time
+            calls = args.repeat * len(texts)
+            print(
+                f"{agent_name:<22} {function_name:<30} {calls:>8} {elapsed / calls * 1e6:>10.1f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local retrieval index on a repository.
+
+Measures a cold index build, loading a persisted index, a no-op update (no
+files changed), re-indexing changed files and query latency:
+
+    python examples/benchmark_retrieval.py ~/src/cpython --queries 500
+
+No LLM calls are made and no API key is required.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.retrieval import RetrievalIndex
+
+
+def timed(function, *args):
+    """Run a function and return (result, elapsed seconds)."""
+    start_time = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start_time
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("root", help="Repository to index")
+    parser.add_argument(
+        "--queries", type=int, default=200, help="Number of queries to time"
+    )
+    parser.add_argument(
+        "--changed", type=int, default=10, help="Number of files to re-index"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_path = os.path.join(directory, "index.json")
+
+        index = RetrievalIndex(args.root, index_path=index_path)
+        files, build_time = timed(index.update)
+        stats = index.get_stats()
+        print(
+            f"📚 {stats['definitions']} definitions in {files} files, "
+            f"{stats['terms']} terms\n"
+        )
+        if not stats["definitions"]:
+            print("No definitions found.")
+            return 1
+
+        _, save_time = timed(index.save)
+        loaded, load_time = timed(RetrievalIndex, args.root, index_path)
+        _, noop_time = timed(loaded.update)
+
+        paths = random.sample(sorted(index.files), min(args.changed, len(index.files)))
+        _, reindex_time = timed(lambda: [index.reindex_file(path) for path in paths])
+
+        print(f"{'Operation':<32} {'Time (ms)':>12}")
+        print("-" * 45)
+        print(f"{'Cold build':<32} {build_time * 1000:>12.1f}")
+        print(f"{'Save':<32} {save_time * 1000:>12.1f}")
+        print(f"{'Load persisted index':<32} {load_time * 1000:>12.1f}")
+        print(f"{'Update (nothing changed)':<32} {noop_time * 1000:>12.1f}")
+        print(
+            f"{f'Re-index {len(paths)} changed files':<32} {reindex_time * 1000:>12.1f}"
+        )
+
+    # Queries: source snippets of random definitions, as an agent input would be
+    documents = list(index.documents.values())
+    latencies = []
+    for _ in range(args.queries):
+        query = random.choice(documents)["snippet"]
+        _, elapsed = timed(index.search, query)
+        latencies.append(elapsed * 1000)
+
+    latencies.sort()
+    print(f"\n🔎 {len(latencies)} queries (ms):")
+    print(
+        f"  p50 {statistics.median(latencies):.2f}  "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.2f}  "
+        f"max {latencies[-1]:.2f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
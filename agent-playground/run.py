@@ -6,6 +6,7 @@ This script provides an easy way to run the system with various options.
 """
 
 import argparse
+import importlib.util
 import os
 import sys
 from pathlib import Path
@@ -47,17 +48,14 @@ def check_environment():
 
     print("✅ .env file found")
 
-    # Check for requirements
-    try:
-        import dotenv
-        import langchain
-        import langchain_openai
-
-        print("✅ All required packages are installed")
-    except ImportError as e:
-        print(f"{Fore.RED}❌ Missing package: {e}{Style.RESET_ALL}")
-        print(f"Please run: pip install -r requirements.txt")
-        return False
+    # Check for requirements (without importing them, which takes seconds)
+    for package in ["dotenv", "langchain", "langchain_openai"]:
+        if importlib.util.find_spec(package) is None:
+            print(f"{Fore.RED}❌ Missing package: {package}{Style.RESET_ALL}")
+            print(f"Please run: pip install -r requirements.txt")
+            return False
+
+    print("✅ All required packages are installed")
 
     # Check OpenAI API key
     from dotenv import load_dotenv
@@ -83,6 +81,20 @@ def run_cli():
     return cli.run()
 
 
+def run_daemon(args):
+    """Manage the CLI daemon."""
+    from src.daemon import main as daemon_main
+
+    return daemon_main(args or ["status"])
+
+
+def run_watch(args):
+    """Watch a directory and review changes as files are saved."""
+    from src.watcher import main as watch_main
+
+    return watch_main(args)
+
+
 def run_example():
     """Run an example analysis."""
     from src.multi_agent_orchestrator import SimpleMultiAgentOrchestrator
@@ -136,6 +148,8 @@ def show_help():
   {Fore.GREEN}check{Style.RESET_ALL}       - Check environment setup
   {Fore.GREEN}example{Style.RESET_ALL}     - Run example analysis
   {Fore.GREEN}cli{Style.RESET_ALL}         - Run CLI interface (pass arguments to CLI)
+  {Fore.GREEN}daemon{Style.RESET_ALL}      - Start, stop or check the CLI daemon (start|stop|status)
+  {Fore.GREEN}watch{Style.RESET_ALL}       - Review changed code whenever files in a directory are saved
   {Fore.GREEN}help{Style.RESET_ALL}        - Show this help message
 
 {Fore.YELLOW}Examples:{Style.RESET_ALL}
@@ -150,6 +164,13 @@ def show_help():
   python run.py cli review --code "def add(a, b): return a + b"
   python run.py cli interactive
 
+  {Fore.CYAN}# Run CLI commands in the background daemon (warm agents){Style.RESET_ALL}
+  python run.py cli review --daemon --file mycode.py
+  python run.py daemon stop
+
+  {Fore.CYAN}# Review edits as you save them{Style.RESET_ALL}
+  python run.py watch src --debounce 1.0
+
   {Fore.CYAN}# Get CLI help{Style.RESET_ALL}
   python run.py cli --help
 
@@ -181,12 +202,19 @@ def main():
         "command",
         nargs="?",
         default="help",
-        choices=["check", "example", "cli", "help"],
+        choices=["check", "example", "cli", "daemon", "watch", "help"],
         help="Command to execute",
     )
 
     # Parse only the first argument to determine command
-    if len(sys.argv) > 1 and sys.argv[1] in ["check", "example", "cli", "help"]:
+    if len(sys.argv) > 1 and sys.argv[1] in [
+        "check",
+        "example",
+        "cli",
+        "daemon",
+        "watch",
+        "help",
+    ]:
         args, remaining_args = parser.parse_known_args()
     else:
         args = parser.parse_args(["--help"])
@@ -212,6 +240,15 @@ def main():
         sys.argv = [sys.argv[0]] + remaining_args
         return run_cli()
 
+    elif args.command == "daemon":
+        return run_daemon(remaining_args)
+
+    elif args.command == "watch":
+        # First check environment
+        if not check_environment():
+            return 1
+        return run_watch(remaining_args)
+
     elif args.command == "help":
         return show_help()
 
@@ -2,28 +2,38 @@
 Multi-Agent Developer Productivity System.
 
 This package provides a modular system of AI agents to assist with software development tasks.
+
+Exports are imported on first access, so that lightweight modules (such as the
+CLI daemon client) can be used without loading the agents and LangChain.
 """
 
-from .agents import (
-    ArchitectureAdvisor,
-    BaseAgent,
-    CodeReviewer,
-    DocumentationAgent,
-    TestWriter,
-)
-from .cli import SimpleCLI
-from .multi_agent_orchestrator import SimpleMultiAgentOrchestrator, TaskResult, TaskType
-
-__all__ = [
-    "BaseAgent",
-    "CodeReviewer",
-    "TestWriter",
-    "DocumentationAgent",
-    "ArchitectureAdvisor",
-    "SimpleMultiAgentOrchestrator",
-    "TaskType",
-    "TaskResult",
-    "SimpleCLI",
-]
+import importlib
+
+# Export name -> module defining it
+_EXPORTS = {
+    "BaseAgent": ".agents",
+    "CodeReviewer": ".agents",
+    "TestWriter": ".agents",
+    "DocumentationAgent": ".agents",
+    "ArchitectureAdvisor": ".agents",
+    "SimpleMultiAgentOrchestrator": ".multi_agent_orchestrator",
+    "TaskType": ".multi_agent_orchestrator",
+    "TaskResult": ".multi_agent_orchestrator",
+    "SimpleCLI": ".cli",
+}
+
+__all__ = list(_EXPORTS)
 
 __version__ = "1.0.0"
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -6,6 +6,7 @@ This package contains specialized AI agents for software development tasks.
 
 from .architecture_advisor import ArchitectureAdvisor
 from .base_agent import BaseAgent
+from .cassette import Cassette
 from .code_reviewer import CodeReviewer
 from .documentation_agent import DocumentationAgent
 from .test_writer import TestWriter
@@ -16,6 +17,7 @@ __all__ = [
     "TestWriter",
     "DocumentationAgent",
     "ArchitectureAdvisor",
+    "Cassette",
 ]
 
 __version__ = "1.0.0"
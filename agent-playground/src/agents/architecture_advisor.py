@@ -3,13 +3,24 @@ Architecture Advisor Agent for the multi-agent developer system.
 """
 
 import os
-from typing import Any, Dict, Optional
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Optional
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
 from .base_agent import BaseAgent
+from .cancellation import CancellationToken
+from .repo_summarizer import RepositorySummarizer
+from .section_parsers import MarkdownSectionParser
+
+# How each input type is referred to in the prompt
+INPUT_LABELS = {
+    "code": "code",
+    "description": "project description",
+    "repository": "repository (hierarchical summary)",
+}
 
 
 class ArchitectureAdvisor(BaseAgent):
@@ -33,6 +44,7 @@ class ArchitectureAdvisor(BaseAgent):
             "model": self.model,
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
+            "stream_usage": True,
             "openai_api_key": self.api_key,
         }
 
@@ -70,7 +82,12 @@ class ArchitectureAdvisor(BaseAgent):
         return self.system_prompt
 
     def process(
-        self, input_data: Any, context: Optional[Dict[str, Any]] = None
+        self,
+        input_data: Any,
+        context: Optional[Dict[str, Any]] = None,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> Dict[str, Any]:
         """
         Provide architectural advice for the provided code or project description.
@@ -78,6 +95,10 @@ class ArchitectureAdvisor(BaseAgent):
         Args:
             input_data: Code or project description (string)
             context: Optional context (e.g., project scale, team size, constraints)
+            on_section: Optional callback receiving advice sections as they complete
+            deadline_at: Optional time.monotonic() value by which the response
+                must be complete (may shorten or truncate it)
+            cancel_token: Optional token aborting the request when cancelled
 
         Returns:
             Dictionary with architectural advice
@@ -87,20 +108,123 @@ class ArchitectureAdvisor(BaseAgent):
 
         # Determine if input is code or project description
         input_type = self._determine_input_type(input_data)
+        return self._advise(
+            input_data, input_type, context, on_section, deadline_at, cancel_token
+        )
+
+    def process_repository(
+        self,
+        root: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        limiter: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        Provide architectural advice for a whole repository.
+
+        The repository is summarized hierarchically (files, packages, repository)
+        with cached summaries, so only changed files cost LLM calls on later runs.
+
+        Args:
+            root: Repository root directory
+            context: Optional context (e.g., project scale, team size, constraints)
+            on_section: Optional callback receiving advice sections as they complete
+            deadline_at: Optional time.monotonic() deadline for the summaries
+                and the advice request
+            cancel_token: Optional token aborting the requests when cancelled
+            limiter: Optional AdaptiveConcurrencyLimiter every request takes a
+                slot from
+
+        Returns:
+            Dictionary with architectural advice and the repository summary
+
+        Raises:
+            ValueError: If root is not a directory or contains no source files
+            TaskCancelled: If the token was cancelled while summarizing
+            TimeoutError: If the deadline passed while summarizing
+        """
+        summarizer = RepositorySummarizer.from_env(self, limiter)
+        repository = summarizer.summarize(root, deadline_at, cancel_token)
+
+        context = dict(context or {})
+        if "project_scale" not in context:
+            # Scale from the repository size, not from the summary's length
+            lines = repository.stats["lines"]
+            if lines > 100000:
+                context["project_scale"] = "enterprise"
+            elif lines > 10000:
+                context["project_scale"] = "large"
+            elif lines > 1000:
+                context["project_scale"] = "medium"
+            else:
+                context["project_scale"] = "small"
+
+        with ExitStack() as stack:
+            if limiter:
+                stack.enter_context(limiter.slot())
+            result = self._advise(
+                repository.to_prompt(summarizer.max_prompt_tokens),
+                "repository",
+                context,
+                on_section,
+                deadline_at,
+                cancel_token,
+            )
+        result["repository"] = {
+            "root": root,
+            "summary": repository.summary,
+            "packages": repository.packages,
+            "package_graph": repository.package_graph,
+            "import_graph": repository.import_graph,
+            "stats": repository.stats,
+        }
+        return result
+
+    def _advise(
+        self,
+        input_data: str,
+        input_type: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Dict[str, Any]:
+        """
+        Request and analyze architectural advice for prepared input.
 
+        Args:
+            input_data: Code, project description or repository summary
+            input_type: "code", "description" or "repository"
+            context: Optional context information
+            on_section: Optional callback receiving advice sections
+            deadline_at: Optional time.monotonic() deadline
+            cancel_token: Optional cancellation token
+
+        Returns:
+            Dictionary with architectural advice
+        """
         # Extract project requirements from context
         requirements = self._extract_requirements(context)
 
         # Determine project scale
         project_scale = self._determine_project_scale(input_data, context)
 
+        # Only code benefits from compaction; descriptions are sent verbatim
+        if input_type == "code":
+            text, compacted = self._compact_input(input_data, context)
+        else:
+            text, compacted = input_data, None
+        max_tokens = self._output_budget(input_data, context)
+
         # Prepare the prompt
         prompt = ChatPromptTemplate.from_messages(
             [
                 SystemMessage(content=self.system_prompt),
                 HumanMessage(
-                    content=f"Please provide architectural advice for the following {'code' if input_type == 'code' else 'project description'}:\n\n"
-                    f"Input:\n{input_data}\n\n"
+                    content=f"Please provide architectural advice for the following {INPUT_LABELS[input_type]}:\n\n"
+                    f"Input:\n{text}\n\n"
                     f"Project Scale: {project_scale}\n"
                     f"Requirements: {requirements}\n"
                     f"Additional Context: {context or 'No additional context provided'}\n\n"
@@ -118,7 +242,22 @@ class ArchitectureAdvisor(BaseAgent):
 
         # Generate architectural advice
         messages = prompt.format_messages()
-        response = self.llm.invoke(messages)
+        if on_section:
+            response = self._invoke_llm_with_sections(
+                messages,
+                MarkdownSectionParser(),
+                on_section,
+                deadline_at,
+                max_tokens,
+                cancel_token,
+            )
+        else:
+            response = self._invoke_llm(
+                messages,
+                deadline_at=deadline_at,
+                max_tokens=max_tokens,
+                cancel_token=cancel_token,
+            )
 
         advice = response.content
 
@@ -127,7 +266,7 @@ class ArchitectureAdvisor(BaseAgent):
             advice, input_data, project_scale
         )
 
-        return {
+        result = {
             "agent": self.name,
             "input_type": input_type,
             "project_scale": project_scale,
@@ -139,6 +278,10 @@ class ArchitectureAdvisor(BaseAgent):
             "risk_assessment": self._assess_risks(advice),
         }
 
+        self._annotate_result(result, response, compacted)
+
+        return result
+
     def _determine_input_type(self, input_data: str) -> str:
         """
         Determine if input is code or project description.
@@ -572,6 +715,19 @@ class ArchitectureAdvisor(BaseAgent):
         output += f"  Project Scale: {result['project_scale'].upper()}\n"
         output += f"  Requirements: {result['requirements']}\n"
 
+        repository = result.get("repository")
+        if repository:
+            stats = repository["stats"]
+            output += f"\n🗂️  Repository: {repository['root']}\n"
+            output += f"  Files: {stats['files']} ({stats['lines']} lines)\n"
+            output += f"  Packages: {len(repository['packages'])}\n"
+            output += (
+                f"  Summaries: {stats['summarized']} generated, "
+                f"{stats['cached']} cached\n"
+            )
+            for package, dependencies in repository["package_graph"].items():
+                output += f"  {package} → {', '.join(dependencies)}\n"
+
         # Add architecture analysis
         analysis = result["analysis"]
         output += f"\n🏗️  Architecture Analysis:\n"
@@ -621,3 +777,5 @@ class ArchitectureAdvisor(BaseAgent):
         ]
         for i, point in enumerate(key_points[:5], 1):
             output += f"  {i}. {point}\n"
+
+        return output
@@ -2,15 +2,46 @@
 Base Agent class for the multi-agent developer system.
 """
 
+import asyncio
+import hashlib
 import os
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
+from langchain_core.messages import AIMessage
+
+from .cancellation import CancellationToken, DeadlineExceeded, TaskCancelled
+from .cassette import Cassette
+from .compaction import CompactedSource, compact_source, estimate_tokens
+from .micro_batcher import MicroBatcher
+from .token_budget import TokenBudgetPolicy, policy_for
 
 # Load environment variables
 load_dotenv()
 
+# Smallest completion budget given to an agent that starts close to its deadline
+MIN_DEADLINE_TOKENS = 256
+
+# Event loop that runs cancellable streams (started on first use)
+_stream_loop: Optional[asyncio.AbstractEventLoop] = None
+_stream_loop_lock = threading.Lock()
+
+
+def _get_stream_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop for cancellable streams, starting it once."""
+    global _stream_loop
+    with _stream_loop_lock:
+        if _stream_loop is None:
+            _stream_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_stream_loop.run_forever, name="llm-stream-loop", daemon=True
+            ).start()
+        return _stream_loop
+
 
 class BaseAgent(ABC):
     """Base class for all agents in the system."""
@@ -30,11 +61,31 @@ class BaseAgent(ABC):
         self.temperature = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
         self.max_tokens = int(os.getenv("MAX_TOKENS", "2000"))
         self.verbose = os.getenv("VERBOSE", "True").lower() == "true"
+        self.compact_inputs = os.getenv("INPUT_COMPACTION", "False").lower() == "true"
+        # Per-request output budgets sized from the input (optional)
+        self.token_policy: Optional[TokenBudgetPolicy] = None
+        if os.getenv("DYNAMIC_MAX_TOKENS", "False").lower() == "true":
+            self.token_policy = policy_for(name)
+        self.token_stats = {"requests": 0, "requested": 0, "used": 0, "truncated": 0}
+        self._token_stats_lock = threading.Lock()
+        # Expected generation speed, used to size max_tokens under a deadline
+        self.deadline_tokens_per_second = float(
+            os.getenv("DEADLINE_TOKENS_PER_SECOND", "40")
+        )
 
-        # Get API key from environment
+        # Record/replay cassette (optional)
+        self.cassette = Cassette.from_env()
+
+        # Aggregate concurrent non-streaming requests into batches (optional)
+        self.batcher = MicroBatcher.from_env(lambda: self.llm)
+
+        # Get API key from environment (not needed when replaying a cassette)
         self.api_key = os.getenv("OPENAI_API_KEY")
         if not self.api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
+            if self.cassette and self.cassette.mode == "replay":
+                self.api_key = "cassette-replay"
+            else:
+                raise ValueError("OPENAI_API_KEY not found in environment variables")
 
         # Get custom API base URL (optional)
         self.api_base_url = os.getenv("OPENAI_API_BASE_URL")
@@ -49,9 +100,31 @@ class BaseAgent(ABC):
         """
         pass
 
+    def cache_scope(self) -> Tuple[str, ...]:
+        """
+        Get the settings this agent's outputs depend on, for cache keys.
+
+        Returns:
+            Tuple of agent name, model, temperature, token budget and a hash of
+            the system prompt
+        """
+        prompt = self.get_system_prompt().encode("utf-8")
+        return (
+            self.name,
+            self.model,
+            str(self.temperature),
+            str(self.max_tokens),
+            hashlib.sha256(prompt).hexdigest(),
+        )
+
     @abstractmethod
     def process(
-        self, input_data: Any, context: Optional[Dict[str, Any]] = None
+        self,
+        input_data: Any,
+        context: Optional[Dict[str, Any]] = None,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> Dict[str, Any]:
         """
         Process input data and return results.
@@ -59,12 +132,331 @@ class BaseAgent(ABC):
         Args:
             input_data: The input to process (could be code, text, etc.)
             context: Optional context information
+            on_section: Optional callback receiving (section name, text) as soon
+                as each section of the streamed response is complete
+            deadline_at: Optional time.monotonic() value by which the response
+                must be complete; the result is marked "degraded" if it had to
+                be shortened or truncated
+            cancel_token: Optional token aborting the request when cancelled;
+                the result holds what was generated until then and is marked
+                "degraded" as "cancelled"
 
         Returns:
             Dictionary with processing results
         """
         pass
 
+    def _compact_input(
+        self, input_data: str, context: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Optional[CompactedSource]]:
+        """
+        Compact the input before it is placed in the prompt (if enabled).
+
+        Args:
+            input_data: Raw input
+            context: Optional context (the "language" key selects comment syntax)
+
+        Returns:
+            Tuple of (text to send, CompactedSource or None if compaction is off)
+        """
+        if not self.compact_inputs:
+            return input_data, None
+
+        compacted = compact_source(input_data, (context or {}).get("language"))
+        return compacted.text, compacted
+
+    def _output_budget(
+        self, input_data: str, context: Optional[Dict[str, Any]] = None
+    ) -> Optional[int]:
+        """
+        Size the output budget for an input (if dynamic max_tokens is enabled).
+
+        Args:
+            input_data: Raw input
+            context: Optional context (the "language" key selects the parser)
+
+        Returns:
+            max_tokens for the request, or None to use MAX_TOKENS
+        """
+        if not self.token_policy:
+            return None
+        return self.token_policy.budget(input_data, (context or {}).get("language"))
+
+    def get_token_stats(self) -> Dict[str, Any]:
+        """
+        Get requested versus used output tokens.
+
+        Returns:
+            Dictionary with request count, token totals, truncated responses
+            and the fraction of the requested budget that was used
+        """
+        with self._token_stats_lock:
+            stats = dict(self.token_stats)
+        stats["utilization"] = (
+            stats["used"] / stats["requested"] if stats["requested"] else 0.0
+        )
+        return stats
+
+    def _invoke_llm(
+        self,
+        messages: List[Any],
+        on_chunk: Optional[Callable[[str], None]] = None,
+        deadline_at: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Any:
+        """
+        Send messages to the agent's LLM.
+
+        All agents go through this method so that cross-cutting behaviour
+        (such as cassette record/replay) applies uniformly.
+
+        Args:
+            messages: Chat messages to send
+            on_chunk: Optional callback; if given, the response is streamed and
+                each text chunk is passed to it as it arrives
+            deadline_at: Optional time.monotonic() deadline; the request gets
+                the remaining time as timeout and a max_tokens budget it can
+                generate in time, and is cut off (keeping the streamed part)
+                when the deadline passes
+            max_tokens: Output budget for this request (defaults to MAX_TOKENS)
+            cancel_token: Optional cancellation token; requests with a token are
+                streamed so that cancelling it stops the generation, keeping
+                the streamed part
+
+        Returns:
+            The LLM response message
+
+        Raises:
+            TaskCancelled: If the token was cancelled before anything was
+                generated
+        """
+        budget = max_tokens or self.max_tokens
+        limit = self._max_tokens_for(deadline_at, budget)
+
+        def request() -> Any:
+            response = self._call_llm(
+                messages, on_chunk, deadline_at, limit, cancel_token
+            )
+            metadata = response.response_metadata
+            truncated = metadata.get("finish_reason") == "length"
+            if truncated and limit < budget and not metadata.get("degraded"):
+                # Cut short by the budget that was shrunk to meet the deadline
+                metadata["degraded"] = "reduced"
+            return response
+
+        if self.cassette is None:
+            response = request()
+        else:
+            # Keyed on the configured budget: the deadline-derived limit
+            # depends on timing and would differ between record and replay
+            params = {
+                "model": self.model,
+                "temperature": self.temperature,
+                "max_tokens": budget,
+            }
+            response = self.cassette.invoke(
+                request, messages, params, agent_name=self.name, on_chunk=on_chunk
+            )
+
+        metadata = response.response_metadata
+        truncated = metadata.get("finish_reason") == "length"
+        used = (response.usage_metadata or {}).get("output_tokens") or (
+            estimate_tokens(response.content)
+        )
+        metadata["token_budget"] = {"requested": limit, "used": used}
+        with self._token_stats_lock:
+            self.token_stats["requests"] += 1
+            self.token_stats["requested"] += limit
+            self.token_stats["used"] += used
+            self.token_stats["truncated"] += int(truncated)
+
+        return response
+
+    def _max_tokens_for(self, deadline_at: Optional[float], budget: int) -> int:
+        """Completion budget that can be generated before the deadline."""
+        if deadline_at is None:
+            return budget
+
+        remaining = deadline_at - time.monotonic()
+        affordable = int(remaining * self.deadline_tokens_per_second)
+        return min(budget, max(affordable, MIN_DEADLINE_TOKENS))
+
+    def _call_llm(
+        self,
+        messages: List[Any],
+        on_chunk: Optional[Callable[[str], None]] = None,
+        deadline_at: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Any:
+        """Perform the LLM request, streaming it for callbacks, deadlines and tokens."""
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+
+        options = {}
+        if max_tokens is not None and max_tokens != self.max_tokens:
+            options["max_tokens"] = max_tokens
+
+        llm = self.llm.bind(**options) if options else self.llm
+        if deadline_at is not None:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded("Deadline exceeded before the request was sent")
+            llm = llm.bind(timeout=remaining)
+        elif on_chunk is None:
+            if self.batcher:
+                return self.batcher.invoke(messages, cancel_token, **options)
+            if cancel_token is None:
+                return llm.invoke(messages)
+
+        content = []
+        usage_metadata = None
+        finish_reason = None
+        partial = False
+        try:
+            for chunk in self._stream(llm, messages, cancel_token):
+                text = chunk.content if isinstance(chunk.content, str) else ""
+                if text:
+                    content.append(text)
+                    if on_chunk:
+                        on_chunk(text)
+                usage_metadata = (
+                    getattr(chunk, "usage_metadata", None) or usage_metadata
+                )
+                metadata = chunk.response_metadata or {}
+                finish_reason = metadata.get("finish_reason", finish_reason)
+                if deadline_at is not None and time.monotonic() >= deadline_at:
+                    partial = True
+                    break
+        except Exception as e:
+            if deadline_at is None or time.monotonic() < deadline_at:
+                raise
+            if not content:
+                # Our own deadline cut the request off, not the provider
+                raise TimeoutError("Deadline exceeded before a response arrived") from e
+            # Keep what was streamed if the deadline cut the request off
+            partial = True
+
+        response_metadata = {"finish_reason": finish_reason}
+        if cancel_token and cancel_token.cancelled:
+            if not content:
+                raise TaskCancelled(cancel_token.reason)
+            response_metadata["degraded"] = "cancelled"
+        elif partial:
+            response_metadata["degraded"] = "partial"
+
+        return AIMessage(
+            content="".join(content),
+            usage_metadata=usage_metadata,
+            response_metadata=response_metadata,
+        )
+
+    def _stream(
+        self, llm: Any, messages: List[Any], cancel_token: Optional[CancellationToken]
+    ) -> Any:
+        """
+        Iterate over the chunks of a streamed response.
+
+        With a cancellation token, the stream is consumed on a shared event
+        loop so that cancelling returns at once and aborts the HTTP request,
+        closing its connection even before the first chunk has arrived.
+        """
+        if cancel_token is None:
+            yield from llm.stream(messages)
+            return
+
+        chunks: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+
+        async def produce() -> None:
+            try:
+                async for chunk in llm.astream(messages):
+                    chunks.put(("chunk", chunk))
+            except asyncio.CancelledError:
+                pass
+            except BaseException as e:
+                chunks.put(("error", e))
+            finally:
+                chunks.put(("done", None))
+
+        future = asyncio.run_coroutine_threadsafe(produce(), _get_stream_loop())
+
+        def cancel() -> None:
+            future.cancel()
+            chunks.put(("done", None))
+
+        unregister = cancel_token.on_cancel(cancel)
+        try:
+            while True:
+                kind, item = chunks.get()
+                if kind == "done":
+                    return
+                if kind == "error":
+                    raise item
+                yield item
+        finally:
+            # Also reached when the caller stops early (e.g. at a deadline)
+            future.cancel()
+            unregister()
+
+    def _invoke_llm_with_sections(
+        self,
+        messages: List[Any],
+        parser: Any,
+        on_section: Callable[[str, str], None],
+        deadline_at: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Any:
+        """
+        Stream a response through an incremental section parser.
+
+        Args:
+            messages: Chat messages to send
+            parser: Incremental parser with feed()/close() (see section_parsers)
+            on_section: Callback receiving each completed (name, text) section
+            deadline_at: Optional time.monotonic() deadline (see _invoke_llm)
+            max_tokens: Output budget for this request (defaults to MAX_TOKENS)
+            cancel_token: Optional cancellation token (see _invoke_llm)
+
+        Returns:
+            The LLM response message
+        """
+
+        def on_chunk(chunk: str) -> None:
+            for name, text in parser.feed(chunk):
+                on_section(name, text)
+
+        response = self._invoke_llm(
+            messages, on_chunk, deadline_at, max_tokens, cancel_token
+        )
+        for name, text in parser.close():
+            on_section(name, text)
+        return response
+
+    def _annotate_result(
+        self,
+        result: Dict[str, Any],
+        response: Any,
+        compacted: Optional[CompactedSource] = None,
+    ) -> None:
+        """
+        Attach request details (compaction, degradation, token budget) to a result.
+
+        Args:
+            result: Result dictionary being built by process()
+            response: The LLM response message
+            compacted: CompactedSource if the input was compacted
+        """
+        if compacted:
+            result["compaction"] = compacted.report()
+
+        metadata = response.response_metadata
+        if metadata.get("degraded"):
+            result["degraded"] = metadata["degraded"]
+        if metadata.get("token_budget"):
+            result["token_budget"] = metadata["token_budget"]
+
     def format_output(self, result: Any) -> str:
         """
         Format the agent's output for display.
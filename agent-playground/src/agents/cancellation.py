@@ -0,0 +1,96 @@
+"""
+Cooperative cancellation of agent tasks.
+
+A CancellationToken is passed down from the orchestrator to the agents and
+their LLM requests. Cancelling it stops streaming requests at once (closing the
+connection, so the provider stops generating) and makes tasks that have not
+started yet return without calling the LLM.
+"""
+
+import threading
+from typing import Callable, List, Optional
+
+
+class TaskCancelled(Exception):
+    """Raised when work is abandoned because its token was cancelled."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work is not started because its deadline has passed."""
+
+
+class CancellationToken:
+    """Thread-safe flag signalling that a task should stop."""
+
+    def __init__(self):
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called."""
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "Cancelled") -> None:
+        """
+        Request cancellation (further calls have no effect).
+
+        Args:
+            reason: Message used for the error of cancelled tasks
+        """
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raise TaskCancelled if the token was cancelled.
+
+        Raises:
+            TaskCancelled: If cancel() was called
+        """
+        if self._event.is_set():
+            raise TaskCancelled(self.reason)
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Register a callback to run when the token is cancelled.
+
+        The callback runs immediately if the token is already cancelled.
+
+        Args:
+            callback: Function called (once) from the cancelling thread
+
+        Returns:
+            Function unregistering the callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the token is cancelled.
+
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the token was cancelled
+        """
+        return self._event.wait(timeout)
+
+    def _unregister(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
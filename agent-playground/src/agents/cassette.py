@@ -0,0 +1,202 @@
+"""
+Record/replay cassettes for LLM requests.
+
+A cassette stores every request/response pair an agent exchanges with the LLM,
+keyed by a hash of the request, so that workloads can later be replayed
+deterministically without contacting a provider.
+
+Agents configured from the environment share one Cassette per file, so that
+agents recording in parallel append to it under a single lock.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage
+
+# Cassettes created by from_env, by (resolved path, mode)
+_shared: Dict[Tuple[str, str], "Cassette"] = {}
+_shared_lock = threading.Lock()
+
+
+class Cassette:
+    """Compact, append-only store of recorded LLM interactions."""
+
+    MODES = ("record", "replay")
+
+    def __init__(self, path: str, mode: str, replay_latency: bool = False):
+        """
+        Initialize the cassette.
+
+        Args:
+            path: Path to the cassette file (gzip-compressed JSON lines)
+            mode: Either "record" or "replay"
+            replay_latency: Whether replay should sleep for the recorded latency
+        """
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Invalid cassette mode: {mode}. Valid modes: {list(self.MODES)}"
+            )
+
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._replay_positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            self._load()
+        elif mode == "replay":
+            raise ValueError(f"Cassette file not found: {path}")
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """
+        Create a cassette from environment variables.
+
+        Every caller configured with the same file gets the same instance.
+
+        Returns:
+            Cassette instance, or None if LLM_CASSETTE_MODE is not set
+        """
+        mode = os.getenv("LLM_CASSETTE_MODE", "").lower()
+        if not mode or mode == "off":
+            return None
+
+        path = os.getenv("LLM_CASSETTE_PATH", "llm_cassette.jsonl.gz")
+        replay_latency = (
+            os.getenv("LLM_CASSETTE_REPLAY_LATENCY", "False").lower() == "true"
+        )
+        key = (os.path.realpath(path), mode)
+        with _shared_lock:
+            cassette = _shared.get(key)
+            if cassette is None:
+                cassette = _shared[key] = cls(path, mode, replay_latency)
+            cassette.replay_latency = replay_latency
+        return cassette
+
+    @staticmethod
+    def request_key(messages: List[Any], params: Dict[str, Any]) -> str:
+        """
+        Compute the cassette key for a request.
+
+        Args:
+            messages: Chat messages sent to the LLM
+            params: Generation parameters that influence the response
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = {
+            "messages": [[message.type, message.content] for message in messages],
+            "params": params,
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def invoke(
+        self,
+        request: Callable[[], Any],
+        messages: List[Any],
+        params: Dict[str, Any],
+        agent_name: Optional[str] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> Any:
+        """
+        Serve a request from the cassette or record it.
+
+        Args:
+            request: Callable performing the real LLM request when recording
+            messages: Chat messages to send
+            params: Generation parameters that form part of the request key
+            agent_name: Name of the requesting agent (stored for later analysis)
+            on_chunk: Optional streaming callback; replayed responses are
+                delivered to it line by line
+
+        Returns:
+            The (recorded or replayed) LLM response message
+        """
+        key = self.request_key(messages, params)
+
+        if self.mode == "replay":
+            entry = self._next_entry(key)
+            if self.replay_latency:
+                time.sleep(entry["t"])
+            if on_chunk:
+                for line in entry["r"].splitlines(keepends=True):
+                    on_chunk(line)
+            return AIMessage(
+                content=entry["r"],
+                response_metadata={"cassette": "replay"},
+                usage_metadata=entry.get("u"),
+            )
+
+        start_time = time.perf_counter()
+        response = request()
+        latency = time.perf_counter() - start_time
+
+        if response.response_metadata.get("degraded"):
+            # Cancelled, deadline-truncated or shortened responses are not
+            # complete answers and must not be replayed as such
+            return response
+
+        self._record(
+            {
+                "k": key,
+                "a": agent_name,
+                "t": round(latency, 4),
+                "r": response.content,
+                "u": getattr(response, "usage_metadata", None),
+            }
+        )
+        return response
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        Get all recorded entries.
+
+        Returns:
+            List of entries with "k" (key), "a" (agent), "t" (latency) and
+            "r" (response) fields
+        """
+        with self._lock:
+            return [entry for group in self._entries.values() for entry in group]
+
+    def _next_entry(self, key: str) -> Dict[str, Any]:
+        """Return the next recorded response for a key, cycling on repeats."""
+        with self._lock:
+            group = self._entries.get(key)
+            if not group:
+                raise ValueError(
+                    f"No cassette entry for request {key[:12]} in {self.path}"
+                )
+            position = self._replay_positions.get(key, 0)
+            self._replay_positions[key] = position + 1
+            return group[position % len(group)]
+
+    def _record(self, entry: Dict[str, Any]) -> None:
+        """Append an entry to memory and to the cassette file."""
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._entries.setdefault(entry["k"], []).append(entry)
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(line)
+
+    def _load(self) -> None:
+        """Load entries from the cassette file."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["k"], []).append(entry)
+
+    def __len__(self) -> int:
+        """Number of recorded interactions."""
+        with self._lock:
+            return sum(len(group) for group in self._entries.values())
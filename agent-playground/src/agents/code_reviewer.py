@@ -3,13 +3,16 @@ Code Reviewer Agent for the multi-agent developer system.
 """
 
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
 from .base_agent import BaseAgent
+from .cancellation import CancellationToken
+from .section_parsers import ReviewSectionParser
+from .static_analysis import StaticReport, analyze_source
 
 
 class CodeReviewer(BaseAgent):
@@ -34,6 +37,7 @@ class CodeReviewer(BaseAgent):
             "model": self.model,
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
+            "stream_usage": True,
             "openai_api_key": self.api_key,
         }
 
@@ -42,6 +46,13 @@ class CodeReviewer(BaseAgent):
 
         self.llm = ChatOpenAI(**llm_kwargs)
 
+        # Local static analysis fast path for trivial or unparseable inputs
+        self.static_fast_path = os.getenv("STATIC_FAST_PATH", "False").lower() == "true"
+        self.static_max_lines = int(os.getenv("STATIC_FAST_PATH_MAX_LINES", "10"))
+        self.static_max_complexity = int(
+            os.getenv("STATIC_FAST_PATH_MAX_COMPLEXITY", "3")
+        )
+
         # Get custom prompt from environment or use default
         self.system_prompt = os.getenv(
             "CODE_REVIEWER_PROMPT",
@@ -67,7 +78,12 @@ class CodeReviewer(BaseAgent):
         return self.system_prompt
 
     def process(
-        self, input_data: Any, context: Optional[Dict[str, Any]] = None
+        self,
+        input_data: Any,
+        context: Optional[Dict[str, Any]] = None,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> Dict[str, Any]:
         """
         Review and analyze code.
@@ -75,6 +91,10 @@ class CodeReviewer(BaseAgent):
         Args:
             input_data: Code to review (string)
             context: Optional context (e.g., language, framework)
+            on_section: Optional callback receiving review sections as they complete
+            deadline_at: Optional time.monotonic() value by which the response
+                must be complete (may shorten or truncate it)
+            cancel_token: Optional token aborting the request when cancelled
 
         Returns:
             Dictionary with review results
@@ -82,12 +102,27 @@ class CodeReviewer(BaseAgent):
         if not isinstance(input_data, str):
             raise ValueError("Code Reviewer expects string input (code)")
 
+        if self.static_fast_path and self._is_python(context):
+            report = analyze_source(input_data, "Python")
+            # A fragment (e.g. a diff region) may not parse on its own
+            answer_errors = not self._is_fragment(input_data, context)
+            if (report.syntax_error and answer_errors) or report.is_trivial(
+                self.static_max_lines, self.static_max_complexity
+            ):
+                return self._local_review(report, on_section)
+            if report.parsed:
+                # Let the model build on the local findings instead of repeating them
+                context = {**(context or {}), "static_analysis": report.summary()}
+
+        code, compacted = self._compact_input(input_data, context)
+        max_tokens = self._output_budget(input_data, context)
+
         # Prepare the prompt
         prompt = ChatPromptTemplate.from_messages(
             [
                 SystemMessage(content=self.system_prompt),
                 HumanMessage(
-                    content=f"Please review the following code:\n\n{input_data}\n\n"
+                    content=f"Please review the following code:\n\n{code}\n\n"
                     f"Context: {context or 'No additional context provided'}"
                 ),
             ]
@@ -95,13 +130,107 @@ class CodeReviewer(BaseAgent):
 
         # Generate review
         messages = prompt.format_messages()
-        response = self.llm.invoke(messages)
+
+        if on_section:
+            # Stream the review and parse sections while tokens arrive
+            parser = ReviewSectionParser()
+
+            def emit(name: str, text: str) -> None:
+                if compacted:
+                    text = compacted.remap_line_references(text)
+                on_section(name, text)
+
+            response = self._invoke_llm_with_sections(
+                messages, parser, emit, deadline_at, max_tokens, cancel_token
+            )
+            sections = parser.result()
+        else:
+            response = self._invoke_llm(
+                messages,
+                deadline_at=deadline_at,
+                max_tokens=max_tokens,
+                cancel_token=cancel_token,
+            )
+            sections = None
 
         # Parse and structure the response
         review_text = response.content
+        if compacted:
+            # Findings refer to compacted line numbers; map them back
+            review_text = compacted.remap_line_references(review_text)
+            if sections:
+                sections = {
+                    name: compacted.remap_line_references(text)
+                    for name, text in sections.items()
+                }
 
         # Extract key sections (this is a simple heuristic - could be enhanced)
-        sections = self._parse_review_sections(review_text)
+        if sections is None:
+            sections = self._parse_review_sections(review_text)
+
+        result = {
+            "agent": self.name,
+            "input_type": "code",
+            "review": review_text,
+            "sections": sections,
+            "summary": self._generate_summary(sections),
+            "severity_level": self._assess_severity(sections),
+        }
+
+        self._annotate_result(result, response, compacted)
+
+        return result
+
+    @staticmethod
+    def _is_python(context: Optional[Dict[str, Any]]) -> bool:
+        """Whether the context identifies the input as Python code."""
+        context = context or {}
+        language = str(context.get("language") or "").lower()
+        return language == "python" or str(context.get("file") or "").endswith(".py")
+
+    @staticmethod
+    def _is_fragment(code: str, context: Optional[Dict[str, Any]]) -> bool:
+        """Whether the input is an excerpt of a file rather than a whole module."""
+        if "changed_lines" in (context or {}):
+            # Region sent by diff-scoped review or watch mode
+            return True
+        first_line = next((line for line in code.split("\n") if line.strip()), "")
+        return first_line[:1].isspace()
+
+    def _local_review(
+        self,
+        report: StaticReport,
+        on_section: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build a review from the static analysis report without calling the LLM.
+
+        Args:
+            report: Static analysis report of the input
+            on_section: Optional callback receiving the review sections
+
+        Returns:
+            Dictionary with review results
+        """
+        sections: Dict[str, str] = {}
+        for finding in report.findings:
+            line = f"- Line {finding.line}: {finding.message}"
+            sections[finding.category] = (
+                f"{sections[finding.category]}\n{line}"
+                if finding.category in sections
+                else line
+            )
+
+        if sections:
+            review_text = "\n\n".join(
+                f"## {name.capitalize()}\n{text}" for name, text in sections.items()
+            )
+        else:
+            review_text = "No issues found by local static analysis."
+
+        if on_section:
+            for name, text in sections.items():
+                on_section(name, text)
 
         return {
             "agent": self.name,
@@ -110,6 +239,8 @@ class CodeReviewer(BaseAgent):
             "sections": sections,
             "summary": self._generate_summary(sections),
             "severity_level": self._assess_severity(sections),
+            "local": True,
+            "static_analysis": report.to_dict(),
         }
 
     def _parse_review_sections(self, review_text: str) -> Dict[str, str]:
@@ -122,70 +253,10 @@ class CodeReviewer(BaseAgent):
         Returns:
             Dictionary of sections
         """
-        sections = {
-            "bugs": "",
-            "style": "",
-            "performance": "",
-            "security": "",
-            "maintainability": "",
-            "tests": "",
-            "general": "",
-        }
-
-        # Simple keyword-based parsing (could be enhanced with more sophisticated NLP)
-        text_lower = review_text.lower()
-
-        # Look for sections in the text
-        lines = review_text.split("\n")
-        current_section = "general"
-
-        for line in lines:
-            line_lower = line.lower().strip()
-
-            # Check for section headers
-            if any(
-                keyword in line_lower
-                for keyword in ["bug", "error", "issue", "problem"]
-            ):
-                if "bug" in line_lower or "error" in line_lower:
-                    current_section = "bugs"
-            elif any(
-                keyword in line_lower
-                for keyword in ["style", "format", "convention", "best practice"]
-            ):
-                current_section = "style"
-            elif any(
-                keyword in line_lower
-                for keyword in ["performance", "optimization", "speed", "efficiency"]
-            ):
-                current_section = "performance"
-            elif any(
-                keyword in line_lower
-                for keyword in ["security", "vulnerability", "secure", "attack"]
-            ):
-                current_section = "security"
-            elif any(
-                keyword in line_lower
-                for keyword in ["maintain", "readability", "clean", "refactor"]
-            ):
-                current_section = "maintainability"
-            elif any(
-                keyword in line_lower
-                for keyword in ["test", "coverage", "unit", "integration"]
-            ):
-                current_section = "tests"
-            elif line_lower.startswith("#") or line_lower.startswith("##"):
-                # Reset to general for new major sections
-                current_section = "general"
-
-            # Add line to current section
-            if sections[current_section]:
-                sections[current_section] += "\n" + line
-            else:
-                sections[current_section] = line
-
-        # Clean up empty sections
-        return {k: v for k, v in sections.items() if v.strip()}
+        parser = ReviewSectionParser()
+        parser.feed(review_text)
+        parser.close()
+        return parser.result()
 
     def _generate_summary(self, sections: Dict[str, str]) -> str:
         """
@@ -0,0 +1,318 @@
+"""
+Input compaction for the multi-agent developer system.
+
+Source code sent to agents often carries license headers, commented-out code,
+generated regions and long runs of blank or repeated lines. Compaction removes
+them before the prompt is built while keeping a mapping from compacted lines
+back to the original line numbers.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .normalization import HASH_COMMENT_LANGUAGES
+
+# Keywords identifying a license/copyright header
+LICENSE_KEYWORDS = (
+    "license",
+    "copyright",
+    "spdx-license-identifier",
+    "permission is hereby granted",
+    "all rights reserved",
+)
+
+GENERATED_BEGIN = re.compile(r"(begin|start)\s+(auto-?)?generated", re.IGNORECASE)
+GENERATED_END = re.compile(r"end\s+(auto-?)?generated", re.IGNORECASE)
+
+# Comment lines that look like disabled code rather than prose
+COMMENTED_CODE = re.compile(
+    r"^(def |class |return\b|import |from \S+ import |if .*:$|for .*:$|while .*:$|"
+    r"print\(|\w+(\.\w+)*\s*=[^=]|\w+(\.\w+)*\(.*\)\s*;?$|[{}]$|.*;$)"
+)
+
+# Maximum size (in lines) of a block considered for repeat elision
+MAX_REPEAT_BLOCK = 8
+MIN_REPEATS = 3
+
+# "line 12", "Lines 3-5", "lines 3 to 5", "L12"
+LINE_REFERENCE = re.compile(r"\b((?i:lines?)\s*|L)(\d+)(?:(\s*(?:-|–|to)\s*)(\d+))?")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a text.
+
+    Uses the common heuristic of roughly four characters per token.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Estimated token count
+    """
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class CompactedSource:
+    """Compacted source code with a mapping back to original line numbers."""
+
+    text: str
+    line_map: List[int]
+    original_text: str = field(repr=False)
+    elided: Dict[str, int] = field(default_factory=dict)
+
+    def original_line(self, line: int) -> int:
+        """
+        Map a 1-based compacted line number to the original line number.
+
+        Args:
+            line: Line number in the compacted text
+
+        Returns:
+            Line number in the original text
+        """
+        if not self.line_map:
+            return line
+        index = min(max(line, 1), len(self.line_map)) - 1
+        return self.line_map[index]
+
+    def remap_line_references(self, text: str) -> str:
+        """
+        Rewrite "line N" / "lines N-M" / "LN" references to original lines.
+
+        Args:
+            text: Agent output referring to compacted line numbers
+
+        Returns:
+            Text referring to original line numbers
+        """
+
+        def replace(match: re.Match) -> str:
+            keyword, start, separator, end = match.groups()
+            mapped = f"{keyword}{self.original_line(int(start))}"
+            if end:
+                mapped += f"{separator}{self.original_line(int(end))}"
+            return mapped
+
+        return LINE_REFERENCE.sub(replace, text)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarize the savings achieved by compaction.
+
+        Returns:
+            Dictionary with byte and token counts before and after compaction
+        """
+        original_bytes = len(self.original_text.encode("utf-8"))
+        compacted_bytes = len(self.text.encode("utf-8"))
+        original_tokens = estimate_tokens(self.original_text)
+        compacted_tokens = estimate_tokens(self.text)
+
+        return {
+            "original_bytes": original_bytes,
+            "compacted_bytes": compacted_bytes,
+            "bytes_saved": original_bytes - compacted_bytes,
+            "original_tokens": original_tokens,
+            "compacted_tokens": compacted_tokens,
+            "tokens_saved": original_tokens - compacted_tokens,
+            "elided_lines": dict(self.elided),
+        }
+
+
+def compact_source(code: str, language: Optional[str] = None) -> CompactedSource:
+    """
+    Compact source code before sending it to an agent.
+
+    Args:
+        code: Source code to compact
+        language: Optional language hint used to recognise comments
+
+    Returns:
+        CompactedSource with the compacted text and line mapping
+    """
+    prefix = _comment_prefix(language)
+    lines = [(number, line.rstrip()) for number, line in enumerate(code.split("\n"), 1)]
+    elided = {"license": 0, "commented_code": 0, "generated": 0, "repeated": 0}
+
+    lines, elided["license"] = _strip_license_header(lines, prefix)
+    lines, elided["generated"] = _elide_generated_blocks(lines, prefix)
+    lines, elided["commented_code"] = _strip_commented_code(lines, prefix)
+    lines, elided["repeated"] = _elide_repeated_blocks(lines, prefix)
+    lines, elided["blank"] = _collapse_blank_lines(lines)
+
+    return CompactedSource(
+        text="\n".join(line for _, line in lines),
+        line_map=[number for number, _ in lines],
+        original_text=code,
+        elided={k: v for k, v in elided.items() if v},
+    )
+
+
+def _comment_prefix(language: Optional[str]) -> str:
+    """Return the line comment prefix for a language."""
+    language = (language or "python").lower()
+    return "#" if language in HASH_COMMENT_LANGUAGES else "//"
+
+
+def _is_comment(line: str, prefix: str) -> bool:
+    stripped = line.strip()
+    return stripped.startswith(prefix) or stripped.startswith(("/*", "*", "*/"))
+
+
+def _comment_body(line: str, prefix: str) -> str:
+    return line.strip().lstrip(prefix).lstrip("/*").strip()
+
+
+def _strip_license_header(
+    lines: List[Tuple[int, str]], prefix: str
+) -> Tuple[List[Tuple[int, str]], int]:
+    """Remove a leading comment block that contains license keywords."""
+    start = 0
+    # Keep shebang and encoding declarations
+    while start < len(lines) and re.match(
+        r"^(#!|#.*coding[:=])", lines[start][1].strip()
+    ):
+        start += 1
+
+    end = start
+    while end < len(lines) and (
+        _is_comment(lines[end][1], prefix) or not lines[end][1].strip()
+    ):
+        end += 1
+
+    header = " ".join(line for _, line in lines[start:end]).lower()
+    if end > start and any(keyword in header for keyword in LICENSE_KEYWORDS):
+        return lines[:start] + lines[end:], end - start
+    return lines, 0
+
+
+def _elide_generated_blocks(
+    lines: List[Tuple[int, str]], prefix: str
+) -> Tuple[List[Tuple[int, str]], int]:
+    """Replace regions between generated-code markers with a placeholder."""
+    result = []
+    removed = 0
+    index = 0
+
+    while index < len(lines):
+        number, line = lines[index]
+        if GENERATED_BEGIN.search(line):
+            end = index + 1
+            while end < len(lines) and not GENERATED_END.search(lines[end][1]):
+                end += 1
+            if end < len(lines):
+                count = end - index + 1
+                indent = line[: len(line) - len(line.lstrip())]
+                result.append(
+                    (
+                        number,
+                        f"{indent}{prefix} ... generated block elided ({count} lines)",
+                    )
+                )
+                removed += count - 1
+                index = end + 1
+                continue
+        result.append((number, line))
+        index += 1
+
+    return result, removed
+
+
+def _strip_commented_code(
+    lines: List[Tuple[int, str]], prefix: str
+) -> Tuple[List[Tuple[int, str]], int]:
+    """Remove runs of two or more comment lines that contain disabled code."""
+    result = []
+    removed = 0
+    index = 0
+
+    while index < len(lines):
+        end = index
+        while (
+            end < len(lines)
+            and lines[end][1].strip().startswith(prefix)
+            and COMMENTED_CODE.match(_comment_body(lines[end][1], prefix))
+        ):
+            end += 1
+
+        if end - index >= 2:
+            removed += end - index
+            index = end
+        else:
+            result.append(lines[index])
+            index += 1
+
+    return result, removed
+
+
+def _elide_repeated_blocks(
+    lines: List[Tuple[int, str]], prefix: str
+) -> Tuple[List[Tuple[int, str]], int]:
+    """Collapse blocks of lines repeated back-to-back MIN_REPEATS or more times."""
+    result = []
+    removed = 0
+    index = 0
+    texts = [line for _, line in lines]
+
+    while index < len(lines):
+        size, repeats = _find_repeat(texts, index)
+        if repeats < MIN_REPEATS:
+            result.append(lines[index])
+            index += 1
+            continue
+
+        first = texts[index]
+        indent = first[: len(first) - len(first.lstrip())]
+        result.extend(lines[index : index + size])
+        result.append(
+            (
+                lines[index + size][0],
+                f"{indent}{prefix} ... previous {size} line(s) repeated "
+                f"{repeats - 1} more time(s)",
+            )
+        )
+        removed += (repeats - 1) * size - 1
+        index += repeats * size
+
+    return result, removed
+
+
+def _find_repeat(texts: List[str], index: int) -> Tuple[int, int]:
+    """Find the smallest block starting at index that repeats back-to-back."""
+    for size in range(1, MAX_REPEAT_BLOCK + 1):
+        block = texts[index : index + size]
+        if len(block) < size:
+            break
+        if not any(line.strip() for line in block):
+            continue
+
+        repeats = 1
+        while texts[index + repeats * size : index + (repeats + 1) * size] == block:
+            repeats += 1
+        if repeats >= MIN_REPEATS:
+            return size, repeats
+
+    return 1, 1
+
+
+def _collapse_blank_lines(
+    lines: List[Tuple[int, str]],
+) -> Tuple[List[Tuple[int, str]], int]:
+    """Collapse runs of blank lines into a single blank line."""
+    result = []
+    removed = 0
+
+    for number, line in lines:
+        if not line.strip() and (not result or not result[-1][1].strip()):
+            removed += 1
+            continue
+        result.append((number, line))
+
+    # Drop a trailing blank line
+    if result and not result[-1][1].strip():
+        result.pop()
+        removed += 1
+
+    return result, removed
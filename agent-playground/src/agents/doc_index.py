@@ -0,0 +1,276 @@
+"""
+Symbol-level documentation index for incremental documentation.
+
+Python input is split into symbols (functions, classes and methods). Each
+documentation section is stored under the hash of its symbol's source, so a
+later run only asks the LLM to document symbols that are new or changed and
+splices the refreshed sections between the ones it already has.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import tempfile
+import textwrap
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Bump when the documentation prompt changes so that old sections are not reused
+PROMPT_VERSION = "1"
+
+# Heading of the section listing the symbol sections
+API_HEADING = "## API Reference"
+
+
+@dataclass
+class Symbol:
+    """A documentable definition of a Python module."""
+
+    name: str
+    kind: str
+    signature: str
+    source: str
+    digest: str
+
+    @property
+    def section_key(self) -> str:
+        """Key of the symbol's section, as produced by MarkdownSectionParser."""
+        return self.name.lower().replace(" ", "_")
+
+
+def extract_symbols(code: str) -> List[Symbol]:
+    """
+    Split Python source into top-level functions, classes and methods.
+
+    A class symbol covers the class statement without its methods, so editing
+    one method only invalidates that method.
+
+    Args:
+        code: Python source code
+
+    Returns:
+        Symbols in source order (empty if the code does not parse)
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return []
+
+    lines = code.split("\n")
+    symbols = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(_symbol(lines, node, node.name, "function"))
+        elif isinstance(node, ast.ClassDef):
+            methods = [
+                child
+                for child in node.body
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+            ]
+            symbols.append(_symbol(lines, node, node.name, "class", methods))
+            for method in methods:
+                symbols.append(
+                    _symbol(lines, method, f"{node.name}.{method.name}", "method")
+                )
+    return symbols
+
+
+def surface_digest(symbols: List[Symbol], code: str) -> str:
+    """
+    Hash of a module's public surface: its docstring and symbol signatures.
+
+    The module overview is regenerated only when this changes.
+
+    Args:
+        symbols: Symbols of the module
+        code: Python source code
+
+    Returns:
+        Hex digest
+    """
+    try:
+        docstring = ast.get_docstring(ast.parse(code)) or ""
+    except (SyntaxError, ValueError):
+        docstring = ""
+    surface = [docstring] + [f"{s.kind} {s.name}: {s.signature}" for s in symbols]
+    return _digest("\n".join(surface))
+
+
+def _symbol(
+    lines: List[str],
+    node: ast.AST,
+    name: str,
+    kind: str,
+    excluded: Optional[List[ast.AST]] = None,
+) -> Symbol:
+    """Build the symbol of a definition, leaving out excluded child nodes."""
+    start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+    end = node.end_lineno or node.lineno
+
+    skipped = set()
+    for child in excluded or []:
+        child_start = min([child.lineno] + [d.lineno for d in child.decorator_list])
+        skipped.update(range(child_start, (child.end_lineno or child.lineno) + 1))
+    source = textwrap.dedent(
+        "\n".join(
+            lines[number - 1]
+            for number in range(start, end + 1)
+            if number not in skipped
+        )
+    )
+
+    # Header text up to the body (taken from the source to also work on 3.8)
+    body = node.body[0]
+    if body.lineno == node.lineno:
+        header = lines[node.lineno - 1][: body.col_offset]
+    else:
+        header = " ".join(
+            line.strip() for line in lines[node.lineno - 1 : body.lineno - 1]
+        )
+    signature = header.strip().rstrip(":").strip()
+
+    return Symbol(
+        name=name,
+        kind=kind,
+        signature=signature,
+        source=source,
+        digest=_digest(source),
+    )
+
+
+def _digest(text: str) -> str:
+    """Stable hash of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DocumentationIndex:
+    """Documentation sections keyed by symbol hash, persisted as one JSON file."""
+
+    def __init__(
+        self, path: Optional[str] = ".doc_index.json", max_entries: int = 5000
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            path: JSON file to load from and save to (in-memory only if None)
+            max_entries: Least recently used sections beyond this are dropped on save
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+        # Serializes saves, so an older snapshot never replaces a newer one
+        self._save_lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "stored": 0}
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                if data.get("version") == PROMPT_VERSION:
+                    self._entries = data.get("entries", {})
+            except (OSError, ValueError, AttributeError):
+                self._entries = {}
+
+    @classmethod
+    def from_env(cls) -> Optional["DocumentationIndex"]:
+        """
+        Build an index from environment variables.
+
+        Returns:
+            DocumentationIndex, or None if DOC_INCREMENTAL is not enabled
+        """
+        if os.getenv("DOC_INCREMENTAL", "False").lower() != "true":
+            return None
+
+        return cls(
+            path=os.getenv("DOC_INDEX_PATH", ".doc_index.json") or None,
+            max_entries=int(os.getenv("DOC_INDEX_MAX_ENTRIES", "5000")),
+        )
+
+    @staticmethod
+    def key(scope: Tuple[str, ...], name: str, digest: str) -> str:
+        """
+        Build the index key of a section.
+
+        Args:
+            scope: Settings the section depends on (agent settings, format,
+                audience)
+            name: Symbol name (or a reserved name such as "__overview__")
+            digest: Hash of the symbol source
+
+        Returns:
+            Index key
+        """
+        return _digest("\0".join((PROMPT_VERSION,) + tuple(scope) + (name, digest)))
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a section."""
+        with self._lock:
+            self.stats["lookups"] += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.stats["hits"] += 1
+            entry["used"] = time.time()
+            return entry["section"]
+
+    def put(self, key: str, section: str) -> None:
+        """Store a section."""
+        with self._lock:
+            self._entries[key] = {"section": section, "used": time.time()}
+            self.stats["stored"] += 1
+
+    def save(self) -> None:
+        """Write the index, keeping the most recently used sections."""
+        if not self.path:
+            return
+
+        with self._save_lock:
+            with self._lock:
+                entries = self._entries
+                if len(entries) > self.max_entries:
+                    recent = sorted(
+                        entries, key=lambda key: entries[key]["used"], reverse=True
+                    )
+                    self._entries = entries = {
+                        key: entries[key] for key in recent[: self.max_entries]
+                    }
+                data = {
+                    "version": PROMPT_VERSION,
+                    "entries": {key: dict(entry) for key, entry in entries.items()},
+                }
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            # A unique temporary file per save, so other processes never share it
+            fd, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                os.replace(temporary, self.path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+
+    def get_stats(self) -> Dict[str, object]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with entry count, lookups, hits, hit rate and stored sections
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        stats["hit_rate"] = (
+            stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+        )
+        return stats
@@ -3,13 +3,22 @@ Documentation Agent for the multi-agent developer system.
 """
 
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
 from .base_agent import BaseAgent
+from .cancellation import CancellationToken
+from .doc_index import (
+    API_HEADING,
+    DocumentationIndex,
+    Symbol,
+    extract_symbols,
+    surface_digest,
+)
+from .section_parsers import MarkdownSectionParser
 
 
 class DocumentationAgent(BaseAgent):
@@ -33,6 +42,7 @@ class DocumentationAgent(BaseAgent):
             "model": self.model,
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
+            "stream_usage": True,
             "openai_api_key": self.api_key,
         }
 
@@ -41,6 +51,9 @@ class DocumentationAgent(BaseAgent):
 
         self.llm = ChatOpenAI(**llm_kwargs)
 
+        # Optional symbol-level index for incremental documentation
+        self.doc_index = DocumentationIndex.from_env()
+
         # Get custom prompt from environment or use default
         self.system_prompt = os.getenv(
             "DOCUMENTATION_AGENT_PROMPT",
@@ -68,7 +81,12 @@ class DocumentationAgent(BaseAgent):
         return self.system_prompt
 
     def process(
-        self, input_data: Any, context: Optional[Dict[str, Any]] = None
+        self,
+        input_data: Any,
+        context: Optional[Dict[str, Any]] = None,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> Dict[str, Any]:
         """
         Create documentation for the provided code.
@@ -76,6 +94,10 @@ class DocumentationAgent(BaseAgent):
         Args:
             input_data: Code to document (string)
             context: Optional context (e.g., language, documentation format, target audience)
+            on_section: Optional callback receiving documentation sections as they complete
+            deadline_at: Optional time.monotonic() value by which the response
+                must be complete (may shorten or truncate it)
+            cancel_token: Optional token aborting the request when cancelled
 
         Returns:
             Dictionary with documentation results
@@ -88,13 +110,30 @@ class DocumentationAgent(BaseAgent):
         language = self._detect_language(input_data, context)
         audience = context.get("audience", "developers") if context else "developers"
 
+        if self.doc_index and language == "Python":
+            symbols = extract_symbols(input_data)
+            if symbols:
+                return self._process_incremental(
+                    input_data,
+                    symbols,
+                    doc_format,
+                    audience,
+                    context,
+                    on_section,
+                    deadline_at,
+                    cancel_token,
+                )
+
+        code, compacted = self._compact_input(input_data, {"language": language})
+        max_tokens = self._output_budget(input_data, {"language": language})
+
         # Prepare the prompt
         prompt = ChatPromptTemplate.from_messages(
             [
                 SystemMessage(content=self.system_prompt),
                 HumanMessage(
                     content=f"Please create comprehensive documentation for the following {language} code:\n\n"
-                    f"Code:\n{input_data}\n\n"
+                    f"Code:\n{code}\n\n"
                     f"Documentation Format: {doc_format}\n"
                     f"Target Audience: {audience}\n"
                     f"Additional Context: {context or 'No additional context provided'}\n\n"
@@ -111,14 +150,29 @@ class DocumentationAgent(BaseAgent):
 
         # Generate documentation
         messages = prompt.format_messages()
-        response = self.llm.invoke(messages)
+
+        if on_section:
+            # Stream the documentation and split sections while tokens arrive
+            parser = MarkdownSectionParser()
+            response = self._invoke_llm_with_sections(
+                messages, parser, on_section, deadline_at, max_tokens, cancel_token
+            )
+            sections = parser.result()
+        else:
+            response = self._invoke_llm(
+                messages,
+                deadline_at=deadline_at,
+                max_tokens=max_tokens,
+                cancel_token=cancel_token,
+            )
+            sections = None
 
         documentation = response.content
 
         # Analyze the documentation
         doc_analysis = self._analyze_documentation(documentation, input_data)
 
-        return {
+        result = {
             "agent": self.name,
             "input_type": "code",
             "language": language,
@@ -126,10 +180,223 @@ class DocumentationAgent(BaseAgent):
             "target_audience": audience,
             "documentation": documentation,
             "analysis": doc_analysis,
-            "sections": self._extract_sections(documentation),
+            "sections": (
+                sections
+                if sections is not None
+                else self._extract_sections(documentation)
+            ),
             "estimated_reading_time": self._estimate_reading_time(documentation),
         }
 
+        self._annotate_result(result, response, compacted)
+
+        return result
+
+    def _process_incremental(
+        self,
+        input_data: str,
+        symbols: List[Symbol],
+        doc_format: str,
+        audience: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Dict[str, Any]:
+        """
+        Document only new or changed symbols and splice in the indexed sections.
+
+        Args:
+            input_data: Python code to document
+            symbols: Symbols of the code, in source order
+            doc_format: Documentation format
+            audience: Target audience
+            context: Optional context
+            on_section: Optional callback receiving documentation sections
+            deadline_at: Optional time.monotonic() value by which the response
+                must be complete
+            cancel_token: Optional token aborting the request when cancelled
+
+        Returns:
+            Dictionary with documentation results
+        """
+        # Sections depend on the system prompt and temperature, not just the model
+        scope = self.cache_scope() + (doc_format, audience)
+        overview_key = self.doc_index.key(
+            scope, "__overview__", surface_digest(symbols, input_data)
+        )
+        overview = self.doc_index.get(overview_key)
+        keys = {s.name: self.doc_index.key(scope, s.name, s.digest) for s in symbols}
+        indexed = {s.name: self.doc_index.get(keys[s.name]) for s in symbols}
+        stale = [s for s in symbols if indexed[s.name] is None]
+
+        if on_section:
+            # Indexed sections are ready before any request is made
+            if overview is not None:
+                on_section("introduction", overview)
+            for symbol in symbols:
+                if indexed[symbol.name] is not None:
+                    on_section(symbol.section_key, indexed[symbol.name])
+
+        response = None
+        compacted = None
+        missing = []
+        overview_regenerated = False
+        if stale or overview is None:
+            stale_code = "\n\n".join(s.source for s in stale)
+            code, compacted = self._compact_input(stale_code, {"language": "Python"})
+            max_tokens = self._output_budget(
+                stale_code or input_data, {"language": "Python"}
+            )
+            messages = self._incremental_messages(
+                code, symbols, stale, overview is None, doc_format, audience, context
+            )
+
+            if on_section:
+                parser = MarkdownSectionParser()
+                response = self._invoke_llm_with_sections(
+                    messages,
+                    parser,
+                    on_section,
+                    deadline_at,
+                    max_tokens,
+                    cancel_token,
+                )
+                generated = parser.result()
+            else:
+                response = self._invoke_llm(
+                    messages,
+                    deadline_at=deadline_at,
+                    max_tokens=max_tokens,
+                    cancel_token=cancel_token,
+                )
+                generated = self._extract_sections(response.content)
+
+            # A shortened or cut-off response may end in a truncated section:
+            # don't index it
+            metadata = response.response_metadata
+            complete = (
+                not metadata.get("degraded")
+                and metadata.get("finish_reason") != "length"
+            )
+
+            # Match sections to symbols by heading, ignoring code markup
+            by_name = {
+                key.replace("`", "").replace("*", "").split("(")[0].strip(): text
+                for key, text in generated.items()
+            }
+            for symbol in stale:
+                text = by_name.get(symbol.section_key)
+                if text is None:
+                    missing.append(symbol.name)
+                    continue
+                body = text.split("\n", 1)[1] if "\n" in text else ""
+                indexed[symbol.name] = f"### {symbol.name}\n{body}".rstrip()
+                if complete:
+                    self.doc_index.put(keys[symbol.name], indexed[symbol.name])
+
+            if overview is None and generated.get("introduction", "").strip():
+                overview = generated["introduction"].strip()
+                if complete:
+                    self.doc_index.put(overview_key, overview)
+                overview_regenerated = True
+
+            self.doc_index.save()
+
+        # Splice the sections in source order; undocumented symbols keep a stub
+        sections = {
+            "introduction": overview or "# Documentation",
+            "api_reference": API_HEADING,
+        }
+        for symbol in symbols:
+            sections[symbol.section_key] = (
+                indexed[symbol.name] or f"### {symbol.name}\n\n`{symbol.signature}`"
+            )
+        documentation = "\n\n".join(text.strip() for text in sections.values())
+
+        result = {
+            "agent": self.name,
+            "input_type": "code",
+            "language": "Python",
+            "documentation_format": doc_format,
+            "target_audience": audience,
+            "documentation": documentation,
+            "analysis": self._analyze_documentation(documentation, input_data),
+            "sections": sections,
+            "estimated_reading_time": self._estimate_reading_time(documentation),
+            "incremental": {
+                "symbols": len(symbols),
+                "regenerated": [s.name for s in stale if s.name not in missing],
+                "reused": len(symbols) - len(stale),
+                "missing": missing,
+                "overview_regenerated": overview_regenerated,
+            },
+        }
+
+        if response is not None:
+            self._annotate_result(result, response, compacted)
+
+        return result
+
+    def _incremental_messages(
+        self,
+        code: str,
+        symbols: List[Symbol],
+        stale: List[Symbol],
+        with_overview: bool,
+        doc_format: str,
+        audience: str,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        """
+        Build the prompt documenting only the stale symbols of a module.
+
+        Args:
+            code: Source of the stale symbols (possibly compacted)
+            symbols: All symbols of the module
+            stale: Symbols to document
+            with_overview: Whether to also write the module overview
+            doc_format: Documentation format
+            audience: Target audience
+            context: Optional context
+
+        Returns:
+            Chat messages
+        """
+        outline = "\n".join(f"- {s.kind} {s.name}: {s.signature}" for s in symbols)
+        request = "Please document part of a Python module.\n\n"
+        request += f"Module outline:\n{outline}\n\n"
+
+        if with_overview:
+            request += (
+                "Start with a level-1 heading and an overview of the whole module: "
+                "its purpose, main classes and functions and how they fit together.\n\n"
+            )
+        if stale:
+            names = ", ".join(s.name for s in stale)
+            request += (
+                f"Then write one section for each of these definitions, in this "
+                f"order: {names}. Start each section with a level-3 heading that "
+                f"is exactly the name, e.g. '### {stale[0].name}'. Describe its "
+                f"purpose, parameters, return value and exceptions, with a short "
+                f"usage example. Do not document any other definitions.\n\n"
+                f"Code:\n{code}\n\n"
+            )
+
+        request += (
+            f"Documentation Format: {doc_format}\n"
+            f"Target Audience: {audience}\n"
+            f"Additional Context: {context or 'No additional context provided'}"
+        )
+
+        prompt = ChatPromptTemplate.from_messages(
+            [
+                SystemMessage(content=self.system_prompt),
+                HumanMessage(content=request),
+            ]
+        )
+        return prompt.format_messages()
+
     def _get_documentation_format(
         self, context: Optional[Dict[str, Any]] = None
     ) -> str:
@@ -278,42 +545,10 @@ class DocumentationAgent(BaseAgent):
         Returns:
             Dictionary of sections
         """
-        sections = {}
-        current_section = "introduction"
-        current_content = []
-
-        lines = documentation.split("\n")
-
-        for line in lines:
-            line_stripped = line.strip()
-
-            # Check for section headers
-            if line_stripped.startswith("# "):
-                if current_content:
-                    sections[current_section] = "\n".join(current_content)
-                current_section = "introduction"
-                current_content = [line]
-            elif line_stripped.startswith("## "):
-                if current_content:
-                    sections[current_section] = "\n".join(current_content)
-                # Extract section name from header
-                section_name = line_stripped[3:].lower().replace(" ", "_")
-                current_section = section_name
-                current_content = [line]
-            elif line_stripped.startswith("### "):
-                if current_content:
-                    sections[current_section] = "\n".join(current_content)
-                section_name = line_stripped[4:].lower().replace(" ", "_")
-                current_section = section_name
-                current_content = [line]
-            else:
-                current_content.append(line)
-
-        # Add the last section
-        if current_content:
-            sections[current_section] = "\n".join(current_content)
-
-        return sections
+        parser = MarkdownSectionParser()
+        parser.feed(documentation)
+        parser.close()
+        return parser.result()
 
     def _estimate_reading_time(self, documentation: str) -> str:
         """
@@ -355,6 +590,19 @@ class DocumentationAgent(BaseAgent):
         output += f"  Target Audience: {result['target_audience']}\n"
         output += f"  Estimated Reading Time: {result['estimated_reading_time']}\n"
 
+        incremental = result.get("incremental")
+        if incremental:
+            output += (
+                f"  Incremental: {len(incremental['regenerated'])} of "
+                f"{incremental['symbols']} symbols regenerated, "
+                f"{incremental['reused']} reused from the index\n"
+            )
+            if incremental["missing"]:
+                output += (
+                    f"  Not documented by the model: "
+                    f"{', '.join(incremental['missing'])}\n"
+                )
+
         # Add analysis details
         analysis = result["analysis"]
         output += f"\n✅ Documentation Quality:\n"
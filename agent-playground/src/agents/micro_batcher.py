@@ -0,0 +1,218 @@
+"""
+Micro-batching of LLM requests.
+
+Requests that arrive within a short window (or until a batch is full) are
+collected and dispatched together through the LangChain batch interface, then
+the responses are handed back to the waiting callers. Servers with continuous
+batching (e.g., local inference servers) process such bursts much more
+efficiently than a trickle of individual requests.
+
+A cancelled request is dropped from the queue if its batch has not been sent
+yet; otherwise its caller is released at once and its response is discarded.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .cancellation import CancellationToken, TaskCancelled
+
+# A queued request: (messages, request options, future, enqueue time)
+_Request = Tuple[List[Any], Dict[str, Any], Future, float]
+
+
+class MicroBatcher:
+    """Aggregation queue that sends requests to an LLM in batches."""
+
+    def __init__(
+        self,
+        get_llm: Callable[[], Any],
+        window: float = 0.02,
+        max_batch_size: int = 8,
+        max_concurrent_batches: int = 4,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            get_llm: Callable returning the LLM to dispatch batches to (resolved
+                at dispatch time, so the agent may replace its LLM)
+            window: Seconds to wait for more requests after the first one
+            max_batch_size: Maximum number of requests per batch
+            max_concurrent_batches: Number of batches that may be in flight
+        """
+        self.get_llm = get_llm
+        self.window = window
+        self.max_batch_size = max(1, max_batch_size)
+
+        self.stats = {"batches": 0, "requests": 0, "full_batches": 0}
+        self._pending: List[_Request] = []
+        self._condition = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrent_batches),
+            thread_name_prefix="micro-batch",
+        )
+
+    @classmethod
+    def from_env(cls, get_llm: Callable[[], Any]) -> Optional["MicroBatcher"]:
+        """
+        Create a batcher from environment variables.
+
+        Args:
+            get_llm: Callable returning the LLM to dispatch batches to
+
+        Returns:
+            MicroBatcher instance, or None if MICRO_BATCH is not enabled
+        """
+        if os.getenv("MICRO_BATCH", "False").lower() != "true":
+            return None
+
+        return cls(
+            get_llm,
+            window=float(os.getenv("MICRO_BATCH_WINDOW_MS", "20")) / 1000,
+            max_batch_size=int(os.getenv("MICRO_BATCH_SIZE", "8")),
+            max_concurrent_batches=int(os.getenv("MICRO_BATCH_CONCURRENCY", "4")),
+        )
+
+    def invoke(
+        self,
+        messages: List[Any],
+        cancel_token: Optional[CancellationToken] = None,
+        **options: Any,
+    ) -> Any:
+        """
+        Queue a request and wait for its response.
+
+        Args:
+            messages: Chat messages to send
+            cancel_token: Optional token abandoning the request
+            **options: Request options bound on the LLM (e.g., max_tokens);
+                only requests with equal options share a batch
+
+        Returns:
+            The LLM response message
+
+        Raises:
+            TaskCancelled: If the token was cancelled before the response arrived
+        """
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+
+        future: Future = Future()
+        request = (messages, options, future, time.monotonic())
+        with self._condition:
+            self._pending.append(request)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(
+                    target=self._collect, name="micro-batcher", daemon=True
+                )
+                self._dispatcher.start()
+            self._condition.notify_all()
+
+        if cancel_token is None:
+            return future.result()
+
+        def cancel() -> None:
+            with self._condition:
+                if request in self._pending:
+                    self._pending.remove(request)
+            self._settle(future, exception=TaskCancelled(cancel_token.reason))
+
+        unregister = cancel_token.on_cancel(cancel)
+        try:
+            return future.result()
+        finally:
+            unregister()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get batching statistics.
+
+        Returns:
+            Dictionary with batch and request counts and the average occupancy
+        """
+        with self._condition:
+            stats = dict(self.stats)
+        average = stats["requests"] / stats["batches"] if stats["batches"] else 0.0
+        stats.update(
+            {
+                "window_ms": self.window * 1000,
+                "max_batch_size": self.max_batch_size,
+                "avg_occupancy": average,
+                "fill_ratio": average / self.max_batch_size,
+            }
+        )
+        return stats
+
+    def _collect(self) -> None:
+        """Dispatcher loop: close a batch when it is full or its window expires."""
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+
+                closes_at = self._pending[0][3] + self.window
+                while 0 < len(self._pending) < self.max_batch_size:
+                    remaining = closes_at - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                if not self._pending:
+                    # Every request of the window was cancelled
+                    continue
+                batch = self._pending[: self.max_batch_size]
+                del self._pending[: self.max_batch_size]
+                self.stats["full_batches"] += int(len(batch) == self.max_batch_size)
+
+            # Requests with different options need differently bound LLMs
+            groups: Dict[Tuple, List[_Request]] = {}
+            for request in batch:
+                groups.setdefault(tuple(sorted(request[1].items())), []).append(request)
+            for group in groups.values():
+                self._executor.submit(self._dispatch, group)
+
+    def _dispatch(self, group: List[_Request]) -> None:
+        """Send a batch and hand each response back to its caller."""
+        # Skip requests cancelled while the batch was waiting for a worker
+        group = [request for request in group if not request[2].done()]
+        if not group:
+            return
+
+        with self._condition:
+            self.stats["batches"] += 1
+            self.stats["requests"] += len(group)
+
+        try:
+            llm = self.get_llm()
+            if group[0][1]:
+                llm = llm.bind(**group[0][1])
+            responses = llm.batch(
+                [messages for messages, _, _, _ in group],
+                config={"max_concurrency": len(group)},
+                return_exceptions=True,
+            )
+        except Exception as e:
+            responses = [e] * len(group)
+
+        for (_, _, future, _), response in zip(group, responses):
+            if isinstance(response, Exception):
+                self._settle(future, exception=response)
+            else:
+                self._settle(future, result=response)
+
+    @staticmethod
+    def _settle(
+        future: Future, result: Any = None, exception: Optional[BaseException] = None
+    ) -> None:
+        """Complete a future unless it was already completed (e.g. cancelled)."""
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
@@ -0,0 +1,222 @@
+"""
+Input canonicalization for the multi-agent developer system.
+
+Two inputs that differ only in formatting, comments, docstrings, local
+variable names or the order of their imports produce the same canonical form,
+so that the canonical hash can be used as an alternate cache key.
+"""
+
+import ast
+import hashlib
+import re
+from typing import Dict, Iterator, List, Optional, Set
+
+# Languages whose line comments start with "#"
+HASH_COMMENT_LANGUAGES = {"python", "ruby", "shell", "bash", "perl", "r", "yaml"}
+
+# Languages with "//" line comments and "/* */" block comments
+SLASH_COMMENT_LANGUAGES = {
+    "javascript",
+    "typescript",
+    "java",
+    "go",
+    "rust",
+    "c",
+    "c++",
+    "c#",
+    "kotlin",
+    "swift",
+    "scala",
+    "php",
+}
+
+
+def canonicalize(code: str, language: Optional[str] = None) -> str:
+    """
+    Compute the canonical form of a piece of source code.
+
+    Python input is parsed and dumped as an AST with docstrings removed and
+    function-local names alpha-renamed. Other languages (and Python that does
+    not parse) fall back to comment and whitespace normalization.
+
+    Args:
+        code: Source code to canonicalize
+        language: Optional language hint (e.g., "Python", "JavaScript")
+
+    Returns:
+        Canonical representation of the code
+    """
+    language = (language or "").lower()
+
+    if language in ("", "python"):
+        try:
+            return "py-ast:" + _canonicalize_python(code, strict=not language)
+        except (SyntaxError, ValueError, RecursionError):
+            pass
+
+    # Without a known language comment syntax is left alone: "#define" or
+    # "a // b" may well be code
+    return "text:" + _normalize_text(code, language)
+
+
+def canonical_hash(code: str, language: Optional[str] = None) -> str:
+    """
+    Compute the hash of the canonical form of a piece of source code.
+
+    Args:
+        code: Source code to hash
+        language: Optional language hint
+
+    Returns:
+        Hex digest of the canonical form
+    """
+    canonical = canonicalize(code, language)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _canonicalize_python(code: str, strict: bool = False) -> str:
+    """
+    Return the normalized AST dump of Python source code.
+
+    With strict set (no language hint), input without any statement is
+    rejected: it is all comments to Python, but may be code in another
+    language (e.g., C preprocessor directives).
+    """
+    tree = ast.parse(code)
+    if strict and not tree.body:
+        raise ValueError("No Python statements")
+    _strip_docstrings(tree)
+    _sort_imports(tree)
+    tree = _LocalRenamer().visit(tree)
+    return ast.dump(tree, annotate_fields=False)
+
+
+def _strip_docstrings(tree: ast.AST) -> None:
+    """Remove module, class and function docstrings in place."""
+    for node in ast.walk(tree):
+        if not isinstance(
+            node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+        ):
+            continue
+
+        body = node.body
+        if (
+            body
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)
+        ):
+            body.pop(0)
+            if not body:
+                body.append(ast.Pass())
+
+
+def _sort_imports(tree: ast.Module) -> None:
+    """Sort runs of consecutive top-level imports in place (as isort does)."""
+    body = tree.body
+    start = 0
+    while start < len(body):
+        end = start
+        while end < len(body) and isinstance(body[end], (ast.Import, ast.ImportFrom)):
+            body[end].names.sort(key=lambda alias: (alias.name, alias.asname or ""))
+            end += 1
+        if end - start > 1:
+            body[start:end] = sorted(body[start:end], key=ast.dump)
+        start = end + 1
+
+
+class _LocalRenamer(ast.NodeTransformer):
+    """Rename function-local variables to positional placeholders."""
+
+    def __init__(self):
+        self.scopes: List[Dict[str, str]] = []
+
+    def visit_FunctionDef(self, node: ast.AST) -> ast.AST:
+        params = _parameter_names(node.args)
+        declared = set()
+        stored = []
+
+        for child in _walk_function_body(node):
+            if isinstance(child, (ast.Global, ast.Nonlocal)):
+                declared.update(child.names)
+            elif isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+                if child.id not in stored:
+                    stored.append(child.id)
+
+        # Parameters are part of the public signature, so they keep their names
+        # but still shadow renamed locals of enclosing functions.
+        mapping = {name: name for name in params}
+        depth = len(self.scopes)
+        for name in stored:
+            if name not in params and name not in declared:
+                mapping[name] = f"_v{depth}_{len(mapping)}"
+
+        self.scopes.append(mapping)
+        self.generic_visit(node)
+        self.scopes.pop()
+        return node
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node: ast.Lambda) -> ast.AST:
+        params = _parameter_names(node.args)
+        self.scopes.append({name: name for name in params})
+        self.generic_visit(node)
+        self.scopes.pop()
+        return node
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> ast.AST:
+        # Class attributes are public API, so names bound in the class body
+        # keep their names.
+        self.scopes.append(
+            {
+                child.id: child.id
+                for child in _walk_function_body(node)
+                if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store)
+            }
+        )
+        self.generic_visit(node)
+        self.scopes.pop()
+        return node
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        for mapping in reversed(self.scopes):
+            if node.id in mapping:
+                node.id = mapping[node.id]
+                break
+        return node
+
+
+def _parameter_names(args: ast.arguments) -> Set[str]:
+    """Collect all parameter names of a function signature."""
+    names = {arg.arg for arg in args.posonlyargs + args.args + args.kwonlyargs}
+    if args.vararg:
+        names.add(args.vararg.arg)
+    if args.kwarg:
+        names.add(args.kwarg.arg)
+    return names
+
+
+def _walk_function_body(node: ast.AST) -> Iterator[ast.AST]:
+    """Walk a function body without descending into nested scopes."""
+    pending = list(node.body)
+    while pending:
+        child = pending.pop(0)
+        yield child
+        if isinstance(
+            child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+        ):
+            continue
+        pending.extend(ast.iter_child_nodes(child))
+
+
+def _normalize_text(code: str, language: str) -> str:
+    """Strip the comments of a known language and collapse whitespace."""
+    if language in SLASH_COMMENT_LANGUAGES:
+        code = re.sub(r"/\*.*?\*/", " ", code, flags=re.DOTALL)
+        code = re.sub(r"(^|\s)//.*$", r"\1", code, flags=re.MULTILINE)
+    if language in HASH_COMMENT_LANGUAGES:
+        code = re.sub(r"(^|\s)#.*$", r"\1", code, flags=re.MULTILINE)
+
+    lines = (" ".join(line.split()) for line in code.splitlines())
+    return "\n".join(line for line in lines if line)
@@ -0,0 +1,558 @@
+"""
+Hierarchical (map-reduce) summarization of whole repositories.
+
+Source files are summarized in parallel, the file summaries of each package
+(directory) are reduced into package summaries, and those into a repository
+summary small enough for a single prompt. Every summary is cached under the hash
+of its input, so later runs only re-summarize changed files and the packages
+above them. A module import graph is computed locally and attached.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from .cancellation import CancellationToken, TaskCancelled
+from .compaction import estimate_tokens
+
+# Bump when the prompts change so that old summaries are not reused
+PROMPT_VERSION = "1"
+
+SOURCE_EXTENSIONS = {
+    ".py",
+    ".js",
+    ".jsx",
+    ".ts",
+    ".tsx",
+    ".java",
+    ".go",
+    ".rs",
+    ".c",
+    ".h",
+    ".cc",
+    ".cpp",
+    ".hpp",
+    ".rb",
+    ".sh",
+}
+
+SKIPPED_DIRECTORIES = {
+    "node_modules",
+    "venv",
+    "env",
+    "build",
+    "dist",
+    "site-packages",
+    "__pycache__",
+}
+
+FILE_PROMPT = (
+    "Summarize the purpose of this source file for an architecture review in at "
+    "most a few sentences: its responsibility, main classes and functions, the "
+    "external systems it talks to, and notable design decisions. Do not explain "
+    "the code line by line."
+)
+
+REDUCE_PROMPT = (
+    "Combine the following summaries of {scope} into one summary for an "
+    "architecture review: responsibilities, layering, main abstractions and how "
+    "the parts interact. Keep it short; omit details that do not matter for the "
+    "overall design."
+)
+
+
+@dataclass
+class RepositorySummary:
+    """Summaries and dependency graph of a repository."""
+
+    root: str
+    summary: str
+    packages: Dict[str, str]
+    files: Dict[str, str]
+    import_graph: Dict[str, List[str]]
+    package_graph: Dict[str, List[str]]
+    stats: Dict[str, int] = field(default_factory=dict)
+
+    def to_prompt(self, max_tokens: int = 6000) -> str:
+        """
+        Render the summary as input for the Architecture Advisor.
+
+        Package summaries are included while they fit in the token budget.
+
+        Args:
+            max_tokens: Approximate token budget of the rendered text
+
+        Returns:
+            Repository description
+        """
+        parts = [
+            f"Repository: {os.path.basename(os.path.abspath(self.root))} "
+            f"({self.stats.get('files', 0)} files, {self.stats.get('lines', 0)} lines, "
+            f"{len(self.packages)} packages)",
+            f"\nOverview:\n{self.summary}",
+        ]
+
+        if self.package_graph:
+            parts.append("\nPackage dependencies:")
+            for package, dependencies in sorted(self.package_graph.items()):
+                parts.append(f"- {package} -> {', '.join(dependencies)}")
+
+        used = estimate_tokens("\n".join(parts))
+        packages = ["\nPackages:"]
+        for package, summary in sorted(self.packages.items()):
+            entry = f"- {package}: {summary}"
+            used += estimate_tokens(entry)
+            if used > max_tokens:
+                packages.append("- ... (remaining packages omitted)")
+                break
+            packages.append(entry)
+        if len(packages) > 1:
+            parts.extend(packages)
+
+        return "\n".join(parts)
+
+
+class SummaryCache:
+    """Summaries keyed by the hash of their input, persisted as one JSON file."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path: JSON file to load from and save to (in-memory only if None)
+        """
+        self.path = path
+        self._entries: Dict[str, str] = {}
+        self._used: Set[str] = set()
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self._entries = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._entries = {}
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a summary."""
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is not None:
+                self._used.add(key)
+            return summary
+
+    def put(self, key: str, summary: str) -> None:
+        """Store a summary."""
+        with self._lock:
+            self._entries[key] = summary
+            self._used.add(key)
+
+    def save(self) -> None:
+        """Write the entries used in this run, dropping stale ones."""
+        if not self.path:
+            return
+
+        with self._lock:
+            entries = {key: self._entries[key] for key in self._used}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # A unique temporary file per save, so concurrent runs never share one
+        fd, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+class RepositorySummarizer:
+    """Map-reduce summarizer running on an agent's LLM."""
+
+    def __init__(
+        self,
+        agent: Any,
+        cache_dir: Optional[str] = ".repo_summaries",
+        max_workers: int = 8,
+        max_file_tokens: int = 4000,
+        max_prompt_tokens: int = 6000,
+        summary_tokens: int = 300,
+        limiter: Optional[Any] = None,
+    ):
+        """
+        Initialize the summarizer.
+
+        Args:
+            agent: Agent whose LLM writes the summaries
+            cache_dir: Directory caching summaries across runs, one file per
+                repository (in-memory only if None)
+            max_workers: Number of summaries requested in parallel
+            max_file_tokens: Files are truncated to this many tokens
+            max_prompt_tokens: Maximum input tokens of a reduce request; larger
+                groups are reduced in chunks
+            summary_tokens: max_tokens of each summary request
+            limiter: Optional AdaptiveConcurrencyLimiter each summary request
+                takes a slot from
+        """
+        self.agent = agent
+        self.cache_dir = cache_dir
+        self.cache = SummaryCache()
+        self.max_workers = max(1, max_workers)
+        self.max_file_tokens = max_file_tokens
+        self.max_prompt_tokens = max_prompt_tokens
+        self.summary_tokens = summary_tokens
+        self.limiter = limiter
+
+        self.stats = {"llm_calls": 0, "cached": 0}
+        self._stats_lock = threading.Lock()
+        # Deadline and cancellation token of the current summarize() run
+        self._deadline_at: Optional[float] = None
+        self._cancel_token: Optional[CancellationToken] = None
+
+    @classmethod
+    def from_env(
+        cls, agent: Any, limiter: Optional[Any] = None
+    ) -> "RepositorySummarizer":
+        """
+        Create a summarizer configured from environment variables.
+
+        Args:
+            agent: Agent whose LLM writes the summaries
+            limiter: Optional concurrency limiter for the summary requests
+
+        Returns:
+            RepositorySummarizer instance
+        """
+        return cls(
+            agent,
+            cache_dir=os.getenv("REPO_SUMMARY_CACHE_DIR", ".repo_summaries") or None,
+            max_workers=int(os.getenv("REPO_SUMMARY_WORKERS", "8")),
+            max_file_tokens=int(os.getenv("REPO_SUMMARY_FILE_TOKENS", "4000")),
+            max_prompt_tokens=int(os.getenv("REPO_SUMMARY_PROMPT_TOKENS", "6000")),
+            summary_tokens=int(os.getenv("REPO_SUMMARY_TOKENS", "300")),
+            limiter=limiter,
+        )
+
+    def summarize(
+        self,
+        root: str,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> RepositorySummary:
+        """
+        Summarize a repository.
+
+        Summaries completed before a failure are still saved to the cache.
+
+        Args:
+            root: Repository root directory
+            deadline_at: Optional time.monotonic() deadline for every request
+            cancel_token: Optional token aborting the requests
+
+        Returns:
+            RepositorySummary with file, package and repository summaries
+
+        Raises:
+            ValueError: If root is not a directory or contains no source files
+            TaskCancelled: If the token was cancelled
+            DeadlineExceeded: If the deadline passed before a request was sent
+        """
+        if not os.path.isdir(root):
+            raise ValueError(f"Not a directory: {root}")
+
+        sources = read_sources(root)
+        if not sources:
+            raise ValueError(f"No source files found in {root}")
+
+        self.cache = SummaryCache(self._cache_path(root))
+        self.stats = {"llm_calls": 0, "cached": 0}
+        self._deadline_at = deadline_at
+        self._cancel_token = cancel_token
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="repo-summary"
+            ) as executor:
+                # Map: one summary per file
+                paths = sorted(sources)
+                files = dict(
+                    zip(
+                        paths,
+                        executor.map(
+                            lambda p: self._summarize_file(p, sources[p]), paths
+                        ),
+                    )
+                )
+
+                # Reduce: files into packages, packages into the repository
+                by_package: Dict[str, List[str]] = defaultdict(list)
+                for path in paths:
+                    by_package[package_of(path)].append(f"{path}: {files[path]}")
+                package_names = sorted(by_package)
+                packages = dict(
+                    zip(
+                        package_names,
+                        executor.map(
+                            lambda name: self._reduce(
+                                by_package[name], f"the files of package '{name}'"
+                            ),
+                            package_names,
+                        ),
+                    )
+                )
+
+            import_graph = build_import_graph(sources)
+            summary = self._reduce(
+                [f"{name}: {text}" for name, text in packages.items()],
+                "the packages of a repository",
+            )
+        finally:
+            # Keep the summaries that did complete for the next run
+            self.cache.save()
+
+        return RepositorySummary(
+            root=root,
+            summary=summary,
+            packages=packages,
+            files=files,
+            import_graph=import_graph,
+            package_graph=package_graph(import_graph),
+            stats={
+                "files": len(sources),
+                "lines": sum(text.count("\n") + 1 for text in sources.values()),
+                "summarized": self.stats["llm_calls"],
+                "cached": self.stats["cached"],
+            },
+        )
+
+    def _cache_path(self, root: str) -> Optional[str]:
+        """Cache file of a repository."""
+        if not self.cache_dir:
+            return None
+        name = hashlib.sha256(os.path.abspath(root).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{name[:16]}.json")
+
+    def _summarize_file(self, path: str, text: str) -> str:
+        """Summarize one file (cached by content hash)."""
+        key = _digest("file", self.agent.model, path, text)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        limit = self.max_file_tokens * 4
+        if len(text) > limit:
+            text = text[:limit] + "\n... (truncated)"
+        return self._complete(key, FILE_PROMPT, f"File: {path}\n\n{text}")
+
+    def _reduce(self, items: List[str], scope: str) -> str:
+        """Combine summaries, in chunks that fit the prompt budget if needed."""
+        if len(items) == 1:
+            return items[0].split(": ", 1)[-1]
+
+        chunks: List[List[str]] = [[]]
+        used = 0
+        for item in items:
+            tokens = estimate_tokens(item)
+            # At least two items per chunk, so that every round shrinks the list
+            if len(chunks[-1]) >= 2 and used + tokens > self.max_prompt_tokens:
+                chunks.append([])
+                used = 0
+            chunks[-1].append(item)
+            used += tokens
+
+        if len(chunks) > 1:
+            # Too large for one request: reduce each chunk, then the results
+            partial = [
+                f"part {i}: {self._reduce(chunk, scope)}"
+                for i, chunk in enumerate(chunks, 1)
+            ]
+            return self._reduce(partial, scope)
+
+        text = "\n\n".join(items)
+        key = _digest("reduce", self.agent.model, scope, text)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        return self._complete(key, REDUCE_PROMPT.format(scope=scope), text)
+
+    def _cached(self, key: str) -> Optional[str]:
+        """Look up a summary, counting hits."""
+        summary = self.cache.get(key)
+        if summary is not None:
+            with self._stats_lock:
+                self.stats["cached"] += 1
+        return summary
+
+    def _complete(self, key: str, instruction: str, text: str) -> str:
+        """Request a summary from the LLM and cache it."""
+        messages = [SystemMessage(content=instruction), HumanMessage(content=text)]
+        with ExitStack() as stack:
+            if self.limiter:
+                stack.enter_context(self.limiter.slot())
+            response = self.agent._invoke_llm(
+                messages,
+                deadline_at=self._deadline_at,
+                max_tokens=self.summary_tokens,
+                cancel_token=self._cancel_token,
+            )
+        summary = response.content.strip()
+
+        with self._stats_lock:
+            self.stats["llm_calls"] += 1
+        degraded = response.response_metadata.get("degraded")
+        if degraded == "cancelled":
+            raise TaskCancelled(self._cancel_token.reason)
+        if not degraded:
+            # Summaries cut short by the deadline are used once, not cached
+            self.cache.put(key, summary)
+        return summary
+
+
+def read_sources(root: str) -> Dict[str, str]:
+    """
+    Read the source files of a repository.
+
+    Hidden directories, virtual environments and build output are skipped.
+
+    Args:
+        root: Repository root directory
+
+    Returns:
+        Dictionary of relative path (with "/" separators) to file content
+    """
+    sources = {}
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories[:] = sorted(
+            name
+            for name in subdirectories
+            if not name.startswith(".") and name not in SKIPPED_DIRECTORIES
+        )
+        for filename in filenames:
+            if os.path.splitext(filename)[1] not in SOURCE_EXTENSIONS:
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            if text.strip():
+                sources[os.path.relpath(path, root).replace(os.sep, "/")] = text
+    return sources
+
+
+def package_of(path: str) -> str:
+    """Package (directory) of a relative path, "." for the root."""
+    return os.path.dirname(path) or "."
+
+
+def module_name(path: str) -> str:
+    """Dotted Python module name of a relative path."""
+    parts = path[: -len(".py")].split("/")
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def build_import_graph(sources: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Compute the internal import graph of the Python files in a repository.
+
+    Imports are resolved against the repository's own modules (also when the
+    code is laid out under a source directory such as "src/"); third-party
+    and standard library imports are left out.
+
+    Args:
+        sources: Relative path to content, as returned by read_sources()
+
+    Returns:
+        Dictionary of file path to the sorted file paths it imports
+    """
+    modules = {module_name(path): path for path in sources if path.endswith(".py")}
+
+    # Also index modules by their name relative to each top-level directory
+    suffixes: Dict[str, str] = {}
+    for name, path in modules.items():
+        if "." in name:
+            suffixes.setdefault(name.split(".", 1)[1], path)
+
+    def resolve(name: str) -> Optional[str]:
+        while name:
+            path = modules.get(name) or suffixes.get(name)
+            if path:
+                return path
+            name = name.rpartition(".")[0]
+        return None
+
+    graph = {}
+    for path, text in sources.items():
+        if not path.endswith(".py"):
+            continue
+        try:
+            tree = ast.parse(text)
+        except SyntaxError:
+            continue
+
+        package = module_name(path)
+        if not path.endswith("__init__.py"):
+            package = package.rpartition(".")[0]
+
+        imported = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                base = node.module or ""
+                if node.level:
+                    parent = package.split(".") if package else []
+                    parent = parent[: len(parent) - (node.level - 1)]
+                    base = ".".join(filter(None, [".".join(parent), base]))
+                # "from package import module" imports submodules
+                names = [f"{base}.{alias.name}" for alias in node.names] or [base]
+            else:
+                continue
+
+            for name in names:
+                target = resolve(name)
+                if target and target != path:
+                    imported.add(target)
+
+        if imported:
+            graph[path] = sorted(imported)
+    return graph
+
+
+def package_graph(import_graph: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    Aggregate a file import graph into dependencies between packages.
+
+    Args:
+        import_graph: File path to imported file paths
+
+    Returns:
+        Dictionary of package to the sorted packages it depends on
+    """
+    graph: Dict[str, Set[str]] = defaultdict(set)
+    for path, targets in import_graph.items():
+        for target in targets:
+            if package_of(target) != package_of(path):
+                graph[package_of(path)].add(package_of(target))
+    return {package: sorted(targets) for package, targets in sorted(graph.items())}
+
+
+def _digest(*parts: str) -> str:
+    """Hash a summary's inputs into a cache key."""
+    return hashlib.sha256(
+        "\0".join((PROMPT_VERSION,) + parts).encode("utf-8")
+    ).hexdigest()
@@ -0,0 +1,215 @@
+"""
+Incremental section parsers for agent responses.
+
+The parsers consume response text in arbitrary chunks (as they arrive from a
+streaming LLM call) and report each section segment as soon as it closes, so
+parsing overlaps generation and callers can render sections early.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+# A completed (section name, section text) pair
+Segment = Tuple[str, str]
+
+
+class _LineParser(ABC):
+    """Base class splitting chunked input into complete lines."""
+
+    def __init__(self):
+        self._buffer = ""
+        self._closed = False
+
+    def feed(self, chunk: str) -> List[Segment]:
+        """
+        Consume a chunk of response text.
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            Segments that were completed by this chunk
+        """
+        self._buffer += chunk
+        if "\n" not in self._buffer:
+            return []
+
+        *lines, self._buffer = self._buffer.split("\n")
+        completed = []
+        for line in lines:
+            completed.extend(self._consume(line))
+        return completed
+
+    def close(self) -> List[Segment]:
+        """
+        Finish parsing after the last chunk.
+
+        Returns:
+            Remaining segments, including the one still open
+        """
+        if self._closed:
+            return []
+        self._closed = True
+
+        completed = self._consume(self._buffer)
+        self._buffer = ""
+        completed.extend(self._flush())
+        return completed
+
+    @abstractmethod
+    def _consume(self, line: str) -> List[Segment]:
+        """
+        Process a complete line.
+
+        Args:
+            line: Line without its trailing newline
+
+        Returns:
+            Segments closed by this line
+        """
+        pass
+
+    @abstractmethod
+    def _flush(self) -> List[Segment]:
+        """
+        Close the section still open at the end of the response.
+
+        Returns:
+            Remaining segments
+        """
+        pass
+
+
+class ReviewSectionParser(_LineParser):
+    """Keyword-driven state machine splitting a code review into categories."""
+
+    SECTIONS = (
+        "bugs",
+        "style",
+        "performance",
+        "security",
+        "maintainability",
+        "tests",
+        "general",
+    )
+
+    def __init__(self):
+        super().__init__()
+        # Lines of each section, kept once: the open segment is the tail of
+        # its section's list from _segment_start on
+        self._lines: Dict[str, List[str]] = {name: [] for name in self.SECTIONS}
+        self._current = "general"
+        self._segment_start = 0
+
+    def result(self) -> Dict[str, str]:
+        """
+        Get the parsed sections.
+
+        Returns:
+            Dictionary of non-empty sections
+        """
+        sections = {name: "\n".join(lines) for name, lines in self._lines.items()}
+        return {k: v for k, v in sections.items() if v.strip()}
+
+    def _consume(self, line: str) -> List[Segment]:
+        completed = []
+        section = self._classify(line.lower().strip(), self._current)
+
+        if section != self._current:
+            completed.extend(self._flush())
+            self._current = section
+            self._segment_start = len(self._lines[section])
+
+        self._lines[section].append(line)
+        return completed
+
+    def _flush(self) -> List[Segment]:
+        lines = self._lines[self._current]
+        segment = "\n".join(lines[self._segment_start :])
+        self._segment_start = len(lines)
+        return [(self._current, segment)] if segment.strip() else []
+
+    @staticmethod
+    def _classify(line_lower: str, current_section: str) -> str:
+        """Return the section a line belongs to, given the current section."""
+        # Check for section headers
+        if any(
+            keyword in line_lower for keyword in ["bug", "error", "issue", "problem"]
+        ):
+            if "bug" in line_lower or "error" in line_lower:
+                return "bugs"
+            return current_section
+        elif any(
+            keyword in line_lower
+            for keyword in ["style", "format", "convention", "best practice"]
+        ):
+            return "style"
+        elif any(
+            keyword in line_lower
+            for keyword in ["performance", "optimization", "speed", "efficiency"]
+        ):
+            return "performance"
+        elif any(
+            keyword in line_lower
+            for keyword in ["security", "vulnerability", "secure", "attack"]
+        ):
+            return "security"
+        elif any(
+            keyword in line_lower
+            for keyword in ["maintain", "readability", "clean", "refactor"]
+        ):
+            return "maintainability"
+        elif any(
+            keyword in line_lower
+            for keyword in ["test", "coverage", "unit", "integration"]
+        ):
+            return "tests"
+        elif line_lower.startswith("#") or line_lower.startswith("##"):
+            # Reset to general for new major sections
+            return "general"
+        return current_section
+
+
+class MarkdownSectionParser(_LineParser):
+    """Heading-driven state machine splitting Markdown into sections."""
+
+    def __init__(self):
+        super().__init__()
+        self.sections: Dict[str, str] = {}
+        self._current = "introduction"
+        self._content: List[str] = []
+
+    def result(self) -> Dict[str, str]:
+        """
+        Get the parsed sections.
+
+        Returns:
+            Dictionary of sections keyed by normalized heading
+        """
+        return self.sections
+
+    def _consume(self, line: str) -> List[Segment]:
+        line_stripped = line.strip()
+
+        if line_stripped.startswith("# "):
+            section_name = "introduction"
+        elif line_stripped.startswith("## "):
+            section_name = line_stripped[3:].lower().replace(" ", "_")
+        elif line_stripped.startswith("### "):
+            section_name = line_stripped[4:].lower().replace(" ", "_")
+        else:
+            self._content.append(line)
+            return []
+
+        completed = self._flush()
+        self._current = section_name
+        self._content = [line]
+        return completed
+
+    def _flush(self) -> List[Segment]:
+        if not self._content:
+            return []
+        content = "\n".join(self._content)
+        self.sections[self._current] = content
+        self._content = []
+        return [(self._current, content)]
@@ -0,0 +1,307 @@
+"""
+Local static analysis run before code is sent to the LLM.
+
+Python input is parsed with `ast` to detect syntax errors, compute cyclomatic
+complexity and apply a handful of lint rules. Trivial or unparseable inputs can
+be answered from this report alone; for everything else the findings are passed
+to the reviewer as additional context.
+"""
+
+import ast
+import builtins
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Functions above this cyclomatic complexity are reported
+COMPLEXITY_LIMIT = 10
+
+# Builtins whose shadowing is reported
+SHADOWED_BUILTINS = {
+    name
+    for name in dir(builtins)
+    if not name.startswith("_") and name[0].islower() and name not in ("copyright",)
+}
+
+DECISION_NODES = (
+    ast.If,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.IfExp,
+    ast.ExceptHandler,
+    ast.Assert,
+    ast.comprehension,
+)
+
+
+@dataclass
+class Finding:
+    """A single static analysis finding."""
+
+    line: int
+    rule: str
+    message: str
+    category: str
+
+
+@dataclass
+class StaticReport:
+    """Result of the local analysis of a piece of code."""
+
+    language: str
+    lines: int
+    parsed: bool = False
+    syntax_error: Optional[str] = None
+    functions: int = 0
+    classes: int = 0
+    max_complexity: int = 0
+    findings: List[Finding] = field(default_factory=list)
+
+    def is_trivial(self, max_lines: int, max_complexity: int) -> bool:
+        """
+        Whether the input is small and simple enough to answer locally.
+
+        Args:
+            max_lines: Maximum number of non-blank lines
+            max_complexity: Maximum cyclomatic complexity
+
+        Returns:
+            True if the code parsed and is below both thresholds
+        """
+        return (
+            self.parsed
+            and self.lines <= max_lines
+            and self.max_complexity <= max_complexity
+        )
+
+    def summary(self) -> str:
+        """
+        Describe the report for use as LLM context.
+
+        Returns:
+            Multi-line summary of metrics and findings
+        """
+        text = (
+            f"{self.lines} non-blank lines, {self.functions} functions, "
+            f"{self.classes} classes, max cyclomatic complexity {self.max_complexity}"
+        )
+        if self.findings:
+            text += "; findings:\n" + "\n".join(
+                f"- line {f.line} [{f.rule}]: {f.message}" for f in self.findings
+            )
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return asdict(self)
+
+
+def analyze_source(code: str, language: Optional[str] = None) -> StaticReport:
+    """
+    Run the local checks on source code.
+
+    Only Python is parsed; other or unknown languages get line metrics only.
+
+    Args:
+        code: Source code
+        language: Language of the code, if known
+
+    Returns:
+        StaticReport with metrics and findings
+    """
+    language = language or "Unknown"
+    report = StaticReport(
+        language=language,
+        lines=sum(1 for line in code.split("\n") if line.strip()),
+    )
+    if language.lower() != "python":
+        return report
+
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        report.syntax_error = f"{e.msg} (line {e.lineno})"
+        report.findings.append(
+            Finding(e.lineno or 1, "syntax", f"Syntax error: {e.msg}", "bugs")
+        )
+        return report
+
+    report.parsed = True
+    complexities = [_complexity(tree, module=True)]
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            report.functions += 1
+            complexity = _complexity(node)
+            complexities.append(complexity)
+            if complexity > COMPLEXITY_LIMIT:
+                report.findings.append(
+                    Finding(
+                        node.lineno,
+                        "complexity",
+                        f"`{node.name}` has cyclomatic complexity {complexity} "
+                        f"(limit {COMPLEXITY_LIMIT}); consider splitting it",
+                        "maintainability",
+                    )
+                )
+        elif isinstance(node, ast.ClassDef):
+            report.classes += 1
+
+    report.max_complexity = max(complexities)
+    report.findings.extend(_lint(tree))
+    report.findings.sort(key=lambda f: f.line)
+    return report
+
+
+def _complexity(node: ast.AST, module: bool = False) -> int:
+    """McCabe-style complexity of a function (or of module-level code)."""
+    complexity = 1
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        # Nested functions and classes are measured separately
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            continue
+        if module and isinstance(child, ast.ClassDef):
+            continue
+        if isinstance(child, DECISION_NODES):
+            complexity += 1 + (
+                len(child.ifs) if isinstance(child, ast.comprehension) else 0
+            )
+        elif isinstance(child, ast.BoolOp):
+            complexity += len(child.values) - 1
+        stack.extend(ast.iter_child_nodes(child))
+    return complexity
+
+
+def _lint(tree: ast.AST) -> List[Finding]:
+    """Apply the built-in lint rules."""
+    findings = []
+    imported: Dict[str, int] = {}
+    used = set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ExceptHandler) and node.type is None:
+            findings.append(
+                Finding(
+                    node.lineno,
+                    "bare-except",
+                    "Bare `except:` also catches SystemExit and KeyboardInterrupt; "
+                    "catch specific exceptions",
+                    "bugs",
+                )
+            )
+
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            for default in node.args.defaults + node.args.kw_defaults:
+                if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+                    findings.append(
+                        Finding(
+                            default.lineno,
+                            "mutable-default",
+                            "Mutable default argument is shared between calls; "
+                            "use None and create it inside the function",
+                            "bugs",
+                        )
+                    )
+            for arg in node.args.args + node.args.kwonlyargs:
+                if arg.arg in SHADOWED_BUILTINS:
+                    findings.append(
+                        Finding(
+                            arg.lineno,
+                            "shadowed-builtin",
+                            f"Parameter `{arg.arg}` shadows a builtin",
+                            "maintainability",
+                        )
+                    )
+
+        elif isinstance(node, ast.Compare):
+            for op, comparator in zip(node.ops, node.comparators):
+                if (
+                    isinstance(op, (ast.Eq, ast.NotEq))
+                    and isinstance(comparator, ast.Constant)
+                    and comparator.value is None
+                ):
+                    findings.append(
+                        Finding(
+                            node.lineno,
+                            "none-comparison",
+                            "Compare to None with `is` / `is not`",
+                            "style",
+                        )
+                    )
+                elif (
+                    isinstance(op, (ast.Is, ast.IsNot))
+                    and isinstance(comparator, ast.Constant)
+                    and isinstance(comparator.value, (str, bytes, int, float))
+                    and not isinstance(comparator.value, bool)
+                ):
+                    findings.append(
+                        Finding(
+                            node.lineno,
+                            "literal-identity",
+                            "`is` with a literal compares identity, not value; "
+                            "use `==`",
+                            "bugs",
+                        )
+                    )
+
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            if node.func.id in ("eval", "exec"):
+                findings.append(
+                    Finding(
+                        node.lineno,
+                        "eval",
+                        f"`{node.func.id}` executes arbitrary code; avoid it on "
+                        "untrusted input",
+                        "security",
+                    )
+                )
+
+        elif isinstance(node, ast.Assert) and isinstance(node.test, ast.Tuple):
+            findings.append(
+                Finding(
+                    node.lineno,
+                    "assert-tuple",
+                    "Assert on a tuple is always true",
+                    "bugs",
+                )
+            )
+
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name != "*":
+                    name = alias.asname or alias.name.split(".")[0]
+                    imported.setdefault(name, node.lineno)
+
+        elif isinstance(node, ast.Name):
+            used.add(node.id)
+
+    exported = _dunder_all(tree)
+    for name, line in imported.items():
+        if name not in used and name not in exported:
+            findings.append(
+                Finding(
+                    line,
+                    "unused-import",
+                    f"`{name}` is imported but unused",
+                    "maintainability",
+                )
+            )
+
+    return findings
+
+
+def _dunder_all(tree: ast.AST) -> set:
+    """Names listed in a module-level __all__."""
+    for node in getattr(tree, "body", []):
+        if (
+            isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id == "__all__" for t in node.targets)
+            and isinstance(node.value, (ast.List, ast.Tuple))
+        ):
+            return {
+                element.value
+                for element in node.value.elts
+                if isinstance(element, ast.Constant) and isinstance(element.value, str)
+            }
+    return set()
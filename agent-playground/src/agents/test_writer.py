@@ -2,14 +2,18 @@
 Test Writer Agent for the multi-agent developer system.
 """
 
+import ast
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
 from .base_agent import BaseAgent
+from .cancellation import CancellationToken
+from .section_parsers import MarkdownSectionParser
+from .verification import TestVerifier
 
 
 class TestWriter(BaseAgent):
@@ -33,6 +37,7 @@ class TestWriter(BaseAgent):
             "model": self.model,
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
+            "stream_usage": True,
             "openai_api_key": self.api_key,
         }
 
@@ -41,6 +46,9 @@ class TestWriter(BaseAgent):
 
         self.llm = ChatOpenAI(**llm_kwargs)
 
+        # Optional sandboxed execution of generated Python tests
+        self.verifier = TestVerifier.from_env()
+
         # Get custom prompt from environment or use default
         self.system_prompt = os.getenv(
             "TEST_WRITER_PROMPT",
@@ -67,7 +75,12 @@ class TestWriter(BaseAgent):
         return self.system_prompt
 
     def process(
-        self, input_data: Any, context: Optional[Dict[str, Any]] = None
+        self,
+        input_data: Any,
+        context: Optional[Dict[str, Any]] = None,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> Dict[str, Any]:
         """
         Write tests for the provided code.
@@ -75,6 +88,10 @@ class TestWriter(BaseAgent):
         Args:
             input_data: Code to test (string)
             context: Optional context (e.g., language, framework, testing library)
+            on_section: Optional callback receiving test code sections as they complete
+            deadline_at: Optional time.monotonic() value by which the response
+                must be complete (may shorten or truncate it)
+            cancel_token: Optional token aborting the request when cancelled
 
         Returns:
             Dictionary with test generation results
@@ -85,6 +102,8 @@ class TestWriter(BaseAgent):
         # Extract language/framework from context or infer from code
         language = self._detect_language(input_data, context)
         test_framework = self._get_test_framework(language, context)
+        code, compacted = self._compact_input(input_data, {"language": language})
+        max_tokens = self._output_budget(input_data, {"language": language})
 
         # Prepare the prompt with language-specific instructions
         prompt = ChatPromptTemplate.from_messages(
@@ -92,7 +111,7 @@ class TestWriter(BaseAgent):
                 SystemMessage(content=self.system_prompt),
                 HumanMessage(
                     content=f"Please write comprehensive tests for the following {language} code:\n\n"
-                    f"Code:\n{input_data}\n\n"
+                    f"Code:\n{code}\n\n"
                     f"Testing Framework: {test_framework}\n"
                     f"Additional Context: {context or 'No additional context provided'}\n\n"
                     f"Requirements:\n"
@@ -108,14 +127,29 @@ class TestWriter(BaseAgent):
 
         # Generate tests
         messages = prompt.format_messages()
-        response = self.llm.invoke(messages)
+        if on_section:
+            response = self._invoke_llm_with_sections(
+                messages,
+                MarkdownSectionParser(),
+                on_section,
+                deadline_at,
+                max_tokens,
+                cancel_token,
+            )
+        else:
+            response = self._invoke_llm(
+                messages,
+                deadline_at=deadline_at,
+                max_tokens=max_tokens,
+                cancel_token=cancel_token,
+            )
 
         test_code = response.content
 
         # Analyze test coverage
         coverage_analysis = self._analyze_test_coverage(input_data, test_code)
 
-        return {
+        result = {
             "agent": self.name,
             "input_type": "code",
             "language": language,
@@ -126,6 +160,28 @@ class TestWriter(BaseAgent):
             "setup_instructions": self._extract_setup_instructions(test_code),
         }
 
+        # Partial tests of a cancelled request are not worth running
+        cancelled = response.response_metadata.get("degraded") == "cancelled"
+        if self.verifier and not cancelled and self._is_python(input_data, context):
+            verification = self.verifier.verify(input_data, test_code)
+            result["verification"] = verification
+            if verification["tests"]:
+                result["test_count"] = verification["tests"]
+            if verification["line_coverage"] is not None:
+                # Measured coverage replaces the keyword heuristic
+                measured = verification["line_coverage"]
+                coverage_analysis["line_coverage"] = measured
+                if measured >= 0.8:
+                    coverage_analysis["estimated_coverage"] = "high"
+                elif measured >= 0.5:
+                    coverage_analysis["estimated_coverage"] = "medium"
+                else:
+                    coverage_analysis["estimated_coverage"] = "low"
+
+        self._annotate_result(result, response, compacted)
+
+        return result
+
     def _detect_language(
         self, code: str, context: Optional[Dict[str, Any]] = None
     ) -> str:
@@ -173,6 +229,34 @@ class TestWriter(BaseAgent):
             # Default to Python if can't detect
             return "Python"
 
+    @staticmethod
+    def _is_python(code: str, context: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Whether the input is known to be Python, not just assumed to be.
+
+        _detect_language falls back to Python for unrecognized input, so
+        verification requires the language from the context or Python source
+        that parses and defines something to test.
+
+        Args:
+            code: The source code
+            context: Optional context information
+
+        Returns:
+            True if generated tests for the input can be run
+        """
+        if context and context.get("language"):
+            return str(context["language"]).lower() == "python"
+
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return False
+        return any(
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+            for node in ast.walk(tree)
+        )
+
     def _get_test_framework(
         self, language: str, context: Optional[Dict[str, Any]] = None
     ) -> str:
@@ -381,6 +465,35 @@ class TestWriter(BaseAgent):
             f"  Performance tests: {'✓' if analysis['performance_tests'] else '✗'}\n"
         )
 
+        # Add results of running the tests
+        verification = result.get("verification")
+        if verification:
+            output += f"\n🧪 Verification: {verification['status'].upper()}\n"
+            output += (
+                f"  Passed: {verification['passed']}, "
+                f"failed: {verification['failed']}, "
+                f"errors: {verification['errors']}\n"
+            )
+            if verification["line_coverage"] is not None:
+                output += f"  Line coverage: {verification['line_coverage']:.0%}"
+                if verification["missing_lines"]:
+                    missing = ", ".join(
+                        str(line) for line in verification["missing_lines"][:10]
+                    )
+                    output += f" (missing lines: {missing})"
+                output += "\n"
+            for failure in verification["failures"][:3]:
+                output += f"  ✗ {failure['test']}\n"
+                # pytest prefixes the assertion explanation with "E"
+                lines = failure["message"].strip().splitlines()
+                explanation = [line for line in lines if line.startswith("E ")]
+                if explanation:
+                    output += f"    {explanation[0][1:].strip()}\n"
+                elif lines:
+                    output += f"    {lines[-1].strip()}\n"
+            if not verification["tests"] and verification["output"]:
+                output += f"  {verification['output'].strip().splitlines()[-1]}\n"
+
         # Add setup instructions
         if result["setup_instructions"]:
             output += f"\n🔧 Setup Instructions:\n{result['setup_instructions']}\n"
@@ -0,0 +1,147 @@
+"""
+Output token budgets for agent requests.
+
+Instead of one global MAX_TOKENS for every request, a per-agent policy sizes the
+completion budget from the input size and the symbols found in it: test
+generation scales with the number of functions, documentation with the public
+API surface, reviews with the amount of code.
+"""
+
+import ast
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .compaction import estimate_tokens
+
+# Fallback symbol patterns for languages other than Python
+FUNCTION_PATTERN = re.compile(
+    r"^\s*(?:export\s+)?(?:async\s+)?(?:function|def|func|fn)\s+(\w+)"
+    r"|^\s*(?:(?:public|private|protected|static|final|virtual|override)\s+)+"
+    r"[\w<>\[\],]+\s+(\w+)\s*\([^;]*$",
+    re.MULTILINE,
+)
+CLASS_PATTERN = re.compile(
+    r"^\s*(?:export\s+)?(?:(?:public|abstract|final)\s+)*"
+    r"(?:class|struct|interface|trait)\s+(\w+)",
+    re.MULTILINE,
+)
+
+
+def count_symbols(code: str, language: Optional[str] = None) -> Dict[str, int]:
+    """
+    Count the functions, classes and public symbols in source code.
+
+    Args:
+        code: Source code
+        language: Optional language hint (Python is parsed, others use patterns)
+
+    Returns:
+        Dictionary with "functions", "classes" and "public" counts
+    """
+    if (language or "python").lower() == "python":
+        try:
+            return _count_python_symbols(ast.parse(code))
+        except SyntaxError:
+            pass
+
+    functions = [m.group(1) or m.group(2) for m in FUNCTION_PATTERN.finditer(code)]
+    classes = [m.group(1) for m in CLASS_PATTERN.finditer(code)]
+    public = [name for name in functions + classes if not name.startswith("_")]
+    return {
+        "functions": len(functions),
+        "classes": len(classes),
+        "public": len(public),
+    }
+
+
+def _count_python_symbols(tree: ast.AST) -> Dict[str, int]:
+    """Count symbols in a parsed Python module."""
+    functions = classes = public = 0
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions += 1
+        elif isinstance(node, ast.ClassDef):
+            classes += 1
+
+    # Public API: top-level names and methods of public classes
+    for node in getattr(tree, "body", []):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        if node.name.startswith("_"):
+            continue
+        public += 1
+        if isinstance(node, ast.ClassDef):
+            public += sum(
+                1
+                for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and not item.name.startswith("_")
+            )
+
+    return {"functions": functions, "classes": classes, "public": public}
+
+
+@dataclass
+class TokenBudgetPolicy:
+    """Linear output budget model, clamped to a range."""
+
+    base: int
+    per_input_token: float = 0.0
+    per_function: int = 0
+    per_class: int = 0
+    per_public_symbol: int = 0
+    min_tokens: int = 256
+    max_tokens: int = 4000
+
+    def budget(self, input_data: str, language: Optional[str] = None) -> int:
+        """
+        Compute the output budget for an input.
+
+        Args:
+            input_data: Input sent to the agent
+            language: Optional language hint
+
+        Returns:
+            max_tokens for the request
+        """
+        symbols = count_symbols(input_data, language)
+        tokens = (
+            self.base
+            + self.per_input_token * estimate_tokens(input_data)
+            + self.per_function * symbols["functions"]
+            + self.per_class * symbols["classes"]
+            + self.per_public_symbol * symbols["public"]
+        )
+        return int(min(max(tokens, self.min_tokens), self.max_tokens))
+
+
+# Policies by agent key (agent name in snake case)
+DEFAULT_POLICIES = {
+    "code_reviewer": TokenBudgetPolicy(
+        base=400, per_input_token=0.3, per_function=40, min_tokens=300, max_tokens=3000
+    ),
+    "test_writer": TokenBudgetPolicy(
+        base=300, per_function=250, per_class=150, min_tokens=400, max_tokens=4000
+    ),
+    "documentation_agent": TokenBudgetPolicy(
+        base=300, per_class=100, per_public_symbol=150, min_tokens=300, max_tokens=3000
+    ),
+    "architecture_advisor": TokenBudgetPolicy(
+        base=800, per_input_token=0.1, per_class=50, min_tokens=600, max_tokens=2500
+    ),
+}
+
+
+def policy_for(agent_name: str) -> Optional[TokenBudgetPolicy]:
+    """
+    Look up the budget policy of an agent.
+
+    Args:
+        agent_name: Agent name (e.g., "Test Writer")
+
+    Returns:
+        TokenBudgetPolicy, or None if the agent has no policy
+    """
+    return DEFAULT_POLICIES.get(agent_name.lower().replace(" ", "_"))
@@ -0,0 +1,780 @@
+"""
+Sandboxed execution of generated tests.
+
+Generated Python tests are run against the code under test in a pool of warm
+worker processes. Each worker imports pytest once at startup; every job is
+then run in a child forked from the worker, so it starts with pytest already
+loaded, cannot leak state into later jobs, and runs under resource limits
+(CPU time, memory, file size, open files) and a wall-clock timeout. Line
+coverage of the code under test is collected with sys.settrace.
+
+Jobs run in an empty working directory that is also their HOME and TMPDIR,
+with a scrubbed environment (no API keys or other secrets of the host
+process). Network access is removed with a new network namespace where the
+system allows it, and otherwise blocked in the socket module. This contains
+careless tests; it is not a security boundary (tests still run with the
+user's file permissions, and the socket guard can be bypassed).
+
+This module only uses the standard library because it also runs as the worker
+script (``python verification.py --worker``).
+"""
+
+import ast
+import atexit
+import ctypes
+import dis
+import importlib
+import importlib.util
+import json
+import os
+import queue
+import re
+import select
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Module name the code under test is written to
+SOURCE_MODULE = "code_under_test"
+TEST_MODULE = "test_generated"
+
+FENCED_BLOCK = re.compile(r"```[ \t]*(?:python|py)?[^\n]*\n(.*?)```", re.DOTALL)
+
+# Characters of test output and failure messages kept in the result
+MAX_OUTPUT_CHARS = 2000
+MAX_FAILURE_CHARS = 500
+
+# Host environment variables passed on to the workers; everything else
+# (API keys, tokens, proxies, PYTHONPATH) is dropped
+INHERITED_ENV_VARS = ("PATH", "LANG", "LC_ALL", "LC_CTYPE", "TZ")
+
+# unshare(2) flags
+CLONE_NEWNET = 0x40000000
+CLONE_NEWUSER = 0x10000000
+
+
+def extract_test_code(text: str) -> str:
+    """
+    Extract runnable test code from an LLM response.
+
+    Args:
+        text: Response text (Markdown with fenced code blocks, or plain code)
+
+    Returns:
+        Concatenated Python code blocks, or the text itself if it has none
+    """
+    blocks = [block for block in FENCED_BLOCK.findall(text) if block.strip()]
+    return "\n\n".join(blocks) if blocks else text
+
+
+class TestVerifier:
+    """Pool of warm worker processes running generated tests."""
+
+    # Not a test class, despite the name
+    __test__ = False
+
+    def __init__(
+        self,
+        workers: int = 4,
+        timeout: float = 30.0,
+        cpu_seconds: int = 20,
+        memory_mb: int = 1024,
+    ):
+        """
+        Initialize the verifier (workers are started on first use).
+
+        Args:
+            workers: Number of warm worker processes (parallel jobs)
+            timeout: Wall-clock seconds a job may run
+            cpu_seconds: CPU seconds a job may use (RLIMIT_CPU)
+            memory_mb: Address space a job may use in MB (RLIMIT_AS)
+        """
+        if not hasattr(os, "fork"):
+            raise ValueError("Test verification requires a POSIX system (os.fork)")
+
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+
+        self.stats = {
+            "jobs": 0,
+            "passed": 0,
+            "failed": 0,
+            "skipped": 0,
+            "errors": 0,
+            "time": 0.0,
+        }
+        self._idle: "queue.Queue[subprocess.Popen]" = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._processes: List[subprocess.Popen] = []
+        atexit.register(self.shutdown)
+
+    @classmethod
+    def from_env(cls) -> Optional["TestVerifier"]:
+        """
+        Create a verifier from environment variables.
+
+        Returns:
+            TestVerifier instance, or None if VERIFY_TESTS is not enabled
+        """
+        if os.getenv("VERIFY_TESTS", "False").lower() != "true":
+            return None
+
+        return cls(
+            workers=int(os.getenv("VERIFY_TESTS_WORKERS", "4")),
+            timeout=float(os.getenv("VERIFY_TESTS_TIMEOUT", "30")),
+            cpu_seconds=int(os.getenv("VERIFY_TESTS_CPU_SECONDS", "20")),
+            memory_mb=int(os.getenv("VERIFY_TESTS_MEMORY_MB", "1024")),
+        )
+
+    def verify(self, source_code: str, test_response: str) -> Dict[str, Any]:
+        """
+        Run generated tests against the code under test.
+
+        Blocks until a worker is free; safe to call from several threads.
+
+        Args:
+            source_code: Python code under test
+            test_response: Generated tests (code blocks are extracted)
+
+        Returns:
+            Dictionary with status ("passed", "failed", "error", "timeout",
+            "crashed", or "skipped" if the tests need modules that are not
+            installed), test counts, failures and line coverage
+        """
+        job = {
+            "source": source_code,
+            "tests": extract_test_code(test_response),
+            "timeout": self.timeout,
+            "cpu_seconds": self.cpu_seconds,
+            "memory_mb": self.memory_mb,
+        }
+
+        worker = self._acquire()
+        try:
+            worker.stdin.write(json.dumps(job) + "\n")
+            worker.stdin.flush()
+            # The worker enforces the timeout; allow for its own overhead
+            ready, _, _ = select.select([worker.stdout], [], [], self.timeout + 10)
+            line = worker.stdout.readline() if ready else ""
+            result = json.loads(line)
+        except (OSError, ValueError):
+            # The worker itself died or hung: replace it
+            self._discard(worker)
+            worker = None
+            result = _empty_result("crashed", "Verification worker failed")
+        finally:
+            if worker is not None:
+                self._idle.put(worker)
+
+        with self._lock:
+            self.stats["jobs"] += 1
+            self.stats["time"] += result["duration"]
+            if result["status"] == "passed":
+                self.stats["passed"] += 1
+            elif result["status"] == "failed":
+                self.stats["failed"] += 1
+            elif result["status"] == "skipped":
+                self.stats["skipped"] += 1
+            else:
+                self.stats["errors"] += 1
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get verification statistics.
+
+        Returns:
+            Dictionary with job counts by outcome, worker count and average time
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["workers"] = self._started
+        stats["avg_time"] = stats.pop("time") / stats["jobs"] if stats["jobs"] else 0.0
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop all worker processes."""
+        with self._lock:
+            processes, self._processes = self._processes, []
+            self._started = 0
+        for process in processes:
+            try:
+                process.stdin.close()
+                process.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+
+    def _acquire(self) -> subprocess.Popen:
+        """Take an idle worker, starting one if the pool is not full."""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                start = self._started < self.workers
+                if start:
+                    self._started += 1
+            if start:
+                try:
+                    return self._start_worker()
+                except OSError:
+                    with self._lock:
+                        self._started -= 1
+                    raise
+
+            try:
+                # Re-check the pool now and then, in case a replacement failed
+                return self._idle.get(timeout=1.0)
+            except queue.Empty:
+                pass
+
+    def _start_worker(self) -> subprocess.Popen:
+        """Start a warm worker process."""
+        environment = {
+            name: os.environ[name] for name in INHERITED_ENV_VARS if name in os.environ
+        }
+        process = subprocess.Popen(
+            [sys.executable, "-u", os.path.abspath(__file__), "--worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            env=environment,
+        )
+        with self._lock:
+            self._processes.append(process)
+        return process
+
+    def _discard(self, worker: subprocess.Popen) -> None:
+        """Kill a broken worker and start its replacement."""
+        worker.kill()
+        with self._lock:
+            if worker not in self._processes:
+                # Already stopped by shutdown()
+                return
+            self._processes.remove(worker)
+
+        # Other callers may be blocked on the idle queue waiting for a worker
+        try:
+            self._idle.put(self._start_worker())
+        except OSError:
+            with self._lock:
+                self._started -= 1
+
+
+def _empty_result(status: str, message: str = "") -> Dict[str, Any]:
+    """Result of a job that did not report test outcomes."""
+    return {
+        "status": status,
+        "tests": 0,
+        "passed": 0,
+        "failed": 0,
+        "errors": 0,
+        "skipped": 0,
+        "failures": [],
+        "line_coverage": None,
+        "covered_lines": 0,
+        "executable_lines": 0,
+        "missing_lines": [],
+        "duration": 0.0,
+        "output": message,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+
+def _serve() -> None:
+    """Worker loop: run jobs read from stdin, write results to stdout."""
+    # Tests must not import the agent modules next to this script
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:] = [path for path in sys.path if os.path.abspath(path or ".") != here]
+
+    _warm_up()
+
+    for line in sys.stdin:
+        started = time.monotonic()
+        result = _run_job(json.loads(line))
+        result["duration"] = time.monotonic() - started
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+def _warm_up() -> None:
+    """Import pytest and load its plugins once; forked jobs inherit them."""
+    try:
+        import pytest
+    except ImportError:
+        return
+
+    # The first session loads the entry point plugins, which is the slow part
+    directory = tempfile.mkdtemp(prefix="verify-warmup-")
+    stdout = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        with open(os.path.join(directory, f"{TEST_MODULE}.py"), "w") as f:
+            f.write("def test_warm_up():\n    pass\n")
+        os.dup2(devnull, 1)
+        pytest.main([directory, "-q", "-p", "no:cacheprovider", "--rootdir", directory])
+    finally:
+        sys.stdout.flush()
+        os.dup2(stdout, 1)
+        os.close(stdout)
+        os.close(devnull)
+        shutil.rmtree(directory, ignore_errors=True)
+        sys.modules.pop(TEST_MODULE, None)
+
+
+def _run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one job in a forked child with resource limits and a timeout."""
+    directory = tempfile.mkdtemp(prefix="verify-")
+    try:
+        with open(os.path.join(directory, f"{SOURCE_MODULE}.py"), "w") as f:
+            f.write(job["source"])
+        with open(os.path.join(directory, f"{TEST_MODULE}.py"), "w") as f:
+            f.write(job["tests"])
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            _child(job, directory, write_fd)
+
+        os.close(write_fd)
+        data = b""
+        deadline = time.monotonic() + job["timeout"]
+        timed_out = False
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            ready, _, _ = select.select([read_fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(read_fd, 65536)
+            if not chunk:
+                break
+            data += chunk
+        os.close(read_fd)
+
+        if timed_out:
+            os.kill(pid, signal.SIGKILL)
+        _, status = os.waitpid(pid, 0)
+
+        if timed_out:
+            result = _empty_result("timeout", f"Timed out after {job['timeout']}s")
+        elif data:
+            result = json.loads(data.decode("utf-8"))
+        elif os.WIFSIGNALED(status):
+            name = signal.Signals(os.WTERMSIG(status)).name
+            result = _empty_result("crashed", f"Killed by {name} (resource limit?)")
+        else:
+            result = _empty_result("crashed", "Test process exited without a result")
+
+        if not data:
+            result["output"] += "\n" + _read_output(directory)
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _child(job: Dict[str, Any], directory: str, write_fd: int) -> None:
+    """Job process: isolate, apply limits, run the tests with tracing, exit."""
+    try:
+        _isolate(os.path.join(directory, "work"))
+        _apply_limits(job)
+        log = os.open(
+            os.path.join(directory, "output.log"),
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+            0o600,
+        )
+        os.dup2(log, 1)
+        os.dup2(log, 2)
+        # stdin carries the worker's jobs; tests must not read from it
+        os.dup2(os.open(os.devnull, os.O_RDONLY), 0)
+        sys.path.insert(0, directory)
+
+        source_path = os.path.join(directory, f"{SOURCE_MODULE}.py")
+        result = _run_tests(directory, source_path, job["tests"])
+        result["output"] = result.get("output") or _read_output(directory)
+        payload = json.dumps(result).encode("utf-8")
+    except BaseException as e:
+        payload = json.dumps(_empty_result("error", f"{type(e).__name__}: {e}"))
+        payload = payload.encode("utf-8")
+
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(write_fd, view) :]
+    finally:
+        os._exit(0)
+
+
+def _isolate(work: str) -> None:
+    """Give the job process an empty home, a clean environment and no network."""
+    os.makedirs(work, mode=0o700)
+    os.chdir(work)
+
+    environment = {
+        name: os.environ[name] for name in INHERITED_ENV_VARS if name in os.environ
+    }
+    os.environ.clear()
+    os.environ.update(environment)
+    os.environ.update({"HOME": work, "TMPDIR": work, "PYTHONDONTWRITEBYTECODE": "1"})
+    # tempfile caches the directory it picked in the worker
+    tempfile.tempdir = None
+
+    if not _unshare_network():
+        _block_sockets()
+
+
+def _unshare_network() -> bool:
+    """Move the process into a new network namespace with no interfaces up."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        return False
+
+    # Without privileges a new network namespace needs a new user namespace
+    for flags in (CLONE_NEWNET, CLONE_NEWUSER | CLONE_NEWNET):
+        if libc.unshare(flags) == 0:
+            return True
+    return False
+
+
+def _block_sockets() -> None:
+    """Make connections and name lookups fail in the socket module."""
+
+    def blocked(*args: Any, **kwargs: Any) -> Any:
+        raise OSError("Network access is disabled during test verification")
+
+    socket.socket.connect = blocked
+    socket.socket.connect_ex = blocked
+    socket.socket.sendto = blocked
+    socket.getaddrinfo = blocked
+    socket.create_connection = blocked
+
+
+def _apply_limits(job: Dict[str, Any]) -> None:
+    """Limit CPU time, memory, file size and open files of the job process."""
+    import resource
+
+    megabyte = 1024 * 1024
+    limits = [
+        (resource.RLIMIT_CPU, job["cpu_seconds"]),
+        (resource.RLIMIT_AS, job["memory_mb"] * megabyte),
+        (resource.RLIMIT_FSIZE, 16 * megabyte),
+        (resource.RLIMIT_NOFILE, 256),
+        (resource.RLIMIT_CORE, 0),
+    ]
+    for limit, value in limits:
+        _, hard = resource.getrlimit(limit)
+        if hard != resource.RLIM_INFINITY:
+            value = min(value, hard)
+        try:
+            resource.setrlimit(limit, (value, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def _run_tests(directory: str, source_path: str, tests: str) -> Dict[str, Any]:
+    """Run the tests in this process while tracing the code under test."""
+    executed: Set[int] = set()
+    with open(source_path, "r") as f:
+        code = compile(f.read(), source_path, "exec")
+    executable = _executable_lines(code)
+
+    stop_coverage = _start_coverage(code, source_path, executed)
+    try:
+        # Load from the compiled code so line events map to these code objects
+        spec = importlib.util.spec_from_file_location(SOURCE_MODULE, source_path)
+        source = importlib.util.module_from_spec(spec)
+        sys.modules[SOURCE_MODULE] = source
+        exec(code, source.__dict__)
+
+        # Tests import the code under whatever name the model guessed, but a
+        # missing library (e.g. numpy) cannot be stood in for by it
+        aliases, missing = _unresolved_imports(tests, set(source.__dict__))
+        for name in aliases:
+            sys.modules[name] = source
+
+        if missing:
+            # Nothing ran, so there is no coverage to report either
+            return _empty_result(
+                "skipped",
+                f"Tests need modules that are not installed: {', '.join(missing)}",
+            )
+
+        try:
+            import pytest
+        except ImportError:
+            result = _run_unittest()
+        else:
+            result = _run_pytest(pytest, directory)
+    finally:
+        stop_coverage()
+
+    covered = executed & executable
+    result.update(
+        {
+            "line_coverage": len(covered) / len(executable) if executable else None,
+            "covered_lines": len(covered),
+            "executable_lines": len(executable),
+            "missing_lines": sorted(executable - covered),
+        }
+    )
+    return result
+
+
+def _run_pytest(pytest: Any, directory: str) -> Dict[str, Any]:
+    """Run the test module with pytest and collect outcomes."""
+    outcomes = {"passed": 0, "failed": 0, "errors": 0, "skipped": 0}
+    failures: List[Dict[str, str]] = []
+
+    class Collector:
+        def pytest_runtest_logreport(self, report):
+            if report.passed and report.when == "call":
+                outcomes["passed"] += 1
+            elif report.skipped:
+                outcomes["skipped"] += 1
+            elif report.failed:
+                outcomes["failed" if report.when == "call" else "errors"] += 1
+                failures.append(_failure(report.nodeid, report.longreprtext))
+
+        def pytest_collectreport(self, report):
+            if report.failed:
+                outcomes["errors"] += 1
+                failures.append(_failure(report.nodeid, report.longreprtext))
+
+    pytest.main(
+        [
+            os.path.join(directory, f"{TEST_MODULE}.py"),
+            "-q",
+            "-p",
+            "no:cacheprovider",
+            "--rootdir",
+            directory,
+        ],
+        plugins=[Collector()],
+    )
+    return _outcome(outcomes, failures)
+
+
+def _run_unittest() -> Dict[str, Any]:
+    """Run the test module with unittest (when pytest is not installed)."""
+    import unittest
+
+    try:
+        module = importlib.import_module(TEST_MODULE)
+    except Exception as e:
+        return _outcome(
+            {"passed": 0, "failed": 0, "errors": 1, "skipped": 0},
+            [_failure(TEST_MODULE, f"{type(e).__name__}: {e}")],
+        )
+
+    suite = unittest.defaultTestLoader.loadTestsFromModule(module)
+    result = unittest.TextTestRunner(stream=sys.stderr, verbosity=0).run(suite)
+    failures = [
+        _failure(test.id(), text) for test, text in result.failures + result.errors
+    ]
+    skipped = len(result.skipped)
+    return _outcome(
+        {
+            "passed": result.testsRun
+            - len(result.failures)
+            - len(result.errors)
+            - skipped,
+            "failed": len(result.failures),
+            "errors": len(result.errors),
+            "skipped": skipped,
+        },
+        failures,
+    )
+
+
+def _outcome(
+    outcomes: Dict[str, int], failures: List[Dict[str, str]]
+) -> Dict[str, Any]:
+    """Build a result from test outcome counts."""
+    tests = outcomes["passed"] + outcomes["failed"] + outcomes["skipped"]
+    if outcomes["errors"] and not tests:
+        status = "error"
+    elif outcomes["failed"] or outcomes["errors"]:
+        status = "failed"
+    elif tests:
+        status = "passed"
+    else:
+        status = "error"
+        failures.append(_failure(TEST_MODULE, "No tests were collected"))
+    return {
+        "status": status,
+        "tests": tests,
+        **outcomes,
+        "failures": failures,
+        "duration": 0.0,
+    }
+
+
+def _failure(test: str, text: str) -> Dict[str, str]:
+    """Failure entry with the end of its traceback."""
+    return {"test": test, "message": text[-MAX_FAILURE_CHARS:]}
+
+
+def _unresolved_imports(tests: str, defined: Set[str]) -> Tuple[List[str], List[str]]:
+    """
+    Split the top-level modules imported by the tests that do not exist.
+
+    A missing module is taken for the code under test if the tests use one of
+    its names through it (``from calculator import add`` or ``calculator.add``).
+
+    Args:
+        tests: Test code
+        defined: Names defined by the code under test
+
+    Returns:
+        Tuple of (modules to alias to the code under test, other missing modules)
+    """
+    try:
+        tree = ast.parse(tests)
+    except SyntaxError:
+        return [], []
+
+    # Names each imported module is used for, by top-level module name
+    used: Dict[str, Set[str]] = {}
+    bound: Dict[str, str] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                module = alias.name.split(".")[0]
+                used.setdefault(module, set())
+                bound[alias.asname or module] = module
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            module = node.module.split(".")[0]
+            used.setdefault(module, set()).update(alias.name for alias in node.names)
+
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.value.id in bound
+        ):
+            used[bound[node.value.id]].add(node.attr)
+
+    aliases, missing = [], []
+    for name in sorted(set(used) - {SOURCE_MODULE, TEST_MODULE}):
+        try:
+            found = importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            found = False
+        if found:
+            continue
+        if used[name] & (defined | {"*"}):
+            aliases.append(name)
+        else:
+            missing.append(name)
+    return aliases, missing
+
+
+def _start_coverage(
+    code: types.CodeType, source_path: str, executed: Set[int]
+) -> Callable[[], None]:
+    """Record executed lines of the code under test; returns a stop function.
+
+    On Python 3.12+ ``sys.monitoring`` watches only the code objects of the
+    code under test and disables each line event after it first fires, so
+    covered code runs at full speed. Older versions fall back to
+    ``sys.settrace``, which roughly doubles the run time of a job.
+    """
+    monitoring = getattr(sys, "monitoring", None)
+    if monitoring is not None:
+        tool = monitoring.COVERAGE_ID
+        monitoring.use_tool_id(tool, "test-verification")
+
+        def on_line(code, line):
+            executed.add(line)
+            return monitoring.DISABLE
+
+        monitoring.register_callback(tool, monitoring.events.LINE, on_line)
+        for current in _code_objects(code):
+            monitoring.set_local_events(tool, current, monitoring.events.LINE)
+
+        def stop():
+            for current in _code_objects(code):
+                monitoring.set_local_events(tool, current, monitoring.events.NO_EVENTS)
+            monitoring.register_callback(tool, monitoring.events.LINE, None)
+            monitoring.free_tool_id(tool)
+
+        return stop
+
+    targets = {source_path, os.path.realpath(source_path)}
+
+    def trace_lines(frame, event, arg):
+        if event == "line":
+            executed.add(frame.f_lineno)
+        return trace_lines
+
+    def trace_calls(frame, event, arg):
+        if frame.f_code.co_filename not in targets:
+            return None
+        executed.add(frame.f_lineno)
+        return trace_lines
+
+    threading.settrace(trace_calls)
+    sys.settrace(trace_calls)
+
+    def stop():
+        sys.settrace(None)
+        threading.settrace(None)
+
+    return stop
+
+
+def _code_objects(code: types.CodeType) -> List[types.CodeType]:
+    """A code object and all code objects nested in it."""
+    found = []
+    stack = [code]
+    while stack:
+        current = stack.pop()
+        found.append(current)
+        stack.extend(c for c in current.co_consts if isinstance(c, types.CodeType))
+    return found
+
+
+def _executable_lines(code: types.CodeType) -> Set[int]:
+    """Line numbers that start a statement in a code object and its children."""
+    return {
+        line
+        for current in _code_objects(code)
+        for _, line in dis.findlinestarts(current)
+        if line
+    }
+
+
+def _read_output(directory: str) -> str:
+    """End of the captured output of a job."""
+    try:
+        with open(os.path.join(directory, "output.log"), "r", errors="replace") as f:
+            return f.read()[-MAX_OUTPUT_CHARS:]
+    except OSError:
+        return ""
+
+
+if __name__ == "__main__" and "--worker" in sys.argv:
+    _serve()
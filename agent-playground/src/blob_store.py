@@ -0,0 +1,263 @@
+"""
+Content-addressed blob store for agent outputs.
+
+Outputs are serialized to JSON, compressed, and written once under the SHA-256
+of their content, so identical outputs in the task history and the task cache
+share one file. In memory, results hold a BlobOutput, a read-only mapping that
+loads the output from disk on access. A small LRU cache of decoded outputs keeps
+repeated access cheap without keeping every output resident.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Union
+
+# Compact JSON encoding of outputs
+_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class BlobStore:
+    """Compressed blobs on disk, addressed by the hash of their content."""
+
+    def __init__(
+        self,
+        root: str = ".blobs",
+        min_bytes: int = 256,
+        cache_size: int = 64,
+        compress_level: int = 6,
+    ):
+        """
+        Initialize the blob store.
+
+        Args:
+            root: Directory holding the blobs
+            min_bytes: Outputs smaller than this (as JSON) are kept inline
+            cache_size: Number of decoded outputs kept in memory
+            compress_level: zlib compression level (0-9)
+        """
+        if cache_size < 0:
+            raise ValueError("cache_size must not be negative")
+        if not 0 <= compress_level <= 9:
+            raise ValueError("compress_level must be between 0 and 9")
+
+        self.root = root
+        self.min_bytes = min_bytes
+        self.cache_size = cache_size
+        self.compress_level = compress_level
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._known = set()
+        self._lock = threading.Lock()
+        self.stats = {
+            "writes": 0,
+            "duplicates": 0,
+            "reads": 0,
+            "cache_hits": 0,
+            "raw_bytes": 0,
+            "stored_bytes": 0,
+        }
+
+        os.makedirs(root, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["BlobStore"]:
+        """
+        Create a blob store from environment variables.
+
+        Returns:
+            BlobStore instance, or None if BLOB_STORE is not enabled
+        """
+        if os.getenv("BLOB_STORE", "False").lower() != "true":
+            return None
+
+        return cls(
+            root=os.getenv("BLOB_STORE_DIR", ".blobs"),
+            min_bytes=int(os.getenv("BLOB_STORE_MIN_BYTES", "256")),
+            cache_size=int(os.getenv("BLOB_STORE_CACHE_SIZE", "64")),
+        )
+
+    def put(self, output: Dict[str, Any]) -> str:
+        """
+        Store an output.
+
+        Args:
+            output: Output dictionary (must be JSON-serializable; other values
+                are stored as strings)
+
+        Returns:
+            Digest addressing the blob
+        """
+        return self._put(_ENCODER.encode(output).encode("utf-8"), output)
+
+    def get(self, digest: str) -> Dict[str, Any]:
+        """
+        Load an output.
+
+        The returned dictionary may be shared with other readers and must not
+        be modified.
+
+        Args:
+            digest: Digest returned by put()
+
+        Returns:
+            Output dictionary
+
+        Raises:
+            ValueError: If the blob does not exist or is corrupt
+        """
+        with self._lock:
+            self.stats["reads"] += 1
+            output = self._cache.get(digest)
+            if output is not None:
+                self._cache.move_to_end(digest)
+                self.stats["cache_hits"] += 1
+                return output
+
+        try:
+            with open(self._path(digest), "rb") as f:
+                data = zlib.decompress(f.read())
+            output = json.loads(data.decode("utf-8"))
+        except FileNotFoundError:
+            raise ValueError(f"Blob {digest} not found in {self.root}")
+        except (zlib.error, ValueError) as e:
+            raise ValueError(f"Blob {digest} is corrupt: {e}")
+
+        self._remember(digest, output)
+        return output
+
+    def wrap(
+        self, output: Union[Dict[str, Any], "BlobOutput"]
+    ) -> Union[Dict[str, Any], "BlobOutput"]:
+        """
+        Replace an output by a lazy reference to its blob.
+
+        Args:
+            output: Output dictionary (a BlobOutput is returned as is)
+
+        Returns:
+            BlobOutput, or the output itself if it is smaller than min_bytes
+        """
+        if isinstance(output, BlobOutput):
+            return output
+
+        data = _ENCODER.encode(output).encode("utf-8")
+        if len(data) < self.min_bytes:
+            return output
+        return BlobOutput(self, self._put(data, output))
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._known or os.path.exists(self._path(digest))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get blob store statistics.
+
+        Returns:
+            Dictionary with write, duplicate, read and cache hit counts, bytes
+            before and after compression and the compression ratio
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["cached"] = len(self._cache)
+        stats["root"] = self.root
+        stats["compression_ratio"] = (
+            stats["raw_bytes"] / stats["stored_bytes"] if stats["stored_bytes"] else 0.0
+        )
+        return stats
+
+    def _put(self, data: bytes, output: Dict[str, Any]) -> str:
+        """Write serialized output unless a blob with that content exists."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+
+        if digest in self._known or os.path.exists(path):
+            with self._lock:
+                self._known.add(digest)
+                self.stats["duplicates"] += 1
+        else:
+            compressed = zlib.compress(data, self.compress_level)
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            # Write to a temporary file first so readers never see partial blobs
+            fd, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.replace(temporary, path)
+            with self._lock:
+                self._known.add(digest)
+                self.stats["writes"] += 1
+                self.stats["raw_bytes"] += len(data)
+                self.stats["stored_bytes"] += len(compressed)
+
+        self._remember(digest, output)
+        return digest
+
+    def _remember(self, digest: str, output: Dict[str, Any]) -> None:
+        """Add a decoded output to the LRU cache."""
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[digest] = output
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _path(self, digest: str) -> str:
+        """File path of a blob (fanned out by the first two hex digits)."""
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+
+class BlobOutput(Mapping):
+    """Read-only output mapping that loads its content from a blob store."""
+
+    __slots__ = ("store", "digest")
+
+    def __init__(self, store: BlobStore, digest: str):
+        """
+        Initialize the reference.
+
+        Args:
+            store: Blob store holding the output
+            digest: Digest of the output blob
+        """
+        self.store = store
+        self.digest = digest
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load the referenced output.
+
+        Returns:
+            Output dictionary (shared; must not be modified)
+        """
+        return self.store.get(self.digest)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.load()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.load())
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    def __repr__(self) -> str:
+        return f"BlobOutput({self.digest[:12]})"
+
+
+def materialize(output: Union[Dict[str, Any], BlobOutput]) -> Dict[str, Any]:
+    """
+    Get an output as a plain dictionary.
+
+    Args:
+        output: Output dictionary or BlobOutput
+
+    Returns:
+        Output dictionary
+    """
+    return output.load() if isinstance(output, BlobOutput) else output
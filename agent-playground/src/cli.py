@@ -4,10 +4,14 @@ Very simple CLI for Multi-Agent Developer System.
 """
 
 import argparse
+import contextvars
 import os
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -15,23 +19,42 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 try:
     from colorama import Fore, Style, init
 
-    from .multi_agent_orchestrator import SimpleMultiAgentOrchestrator, TaskType
-
     init(autoreset=True)
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Please install dependencies: pip install -r requirements.txt")
     sys.exit(1)
 
+# The agents (and LangChain) are imported only when a command runs locally, so
+# that forwarding a command to the daemon stays fast
+if TYPE_CHECKING:
+    from .agents.cancellation import CancellationToken
+    from .multi_agent_orchestrator import SimpleMultiAgentOrchestrator, TaskType
+
 
 class SimpleCLI:
     """Simple command-line interface for the multi-agent system."""
 
     def __init__(self):
         self.orchestrator = None
+        self.stream = False
+        self.writer = None
+        self.deadline = None
+        self.context = None
+        self.jobs = None
+        self._prompting = False
+        self._print_lock = threading.Lock()
+
+    def run(self, argv: Optional[List[str]] = None) -> int:
+        """
+        Run the CLI.
+
+        Args:
+            argv: Command-line arguments (defaults to sys.argv[1:])
 
-    def run(self):
-        """Run the CLI."""
+        Returns:
+            Exit code
+        """
         parser = argparse.ArgumentParser(
             description="Multi-Agent Developer Productivity System",
             formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -39,6 +62,9 @@ class SimpleCLI:
 Examples:
   %(prog)s analyze --file examples/example_code.py
 %(prog)s review --code "def add(a, b): return a + b"
+%(prog)s review --diff main..HEAD
+%(prog)s arch --repo .
+%(prog)s review --diff main..HEAD --output-format jsonl --output results.jsonl.gz
 %(prog)s test --file mycode.py
 %(prog)s interactive
 %(prog)s analyze --file mycode.py --api-url http://localhost:11434/v1
@@ -63,18 +89,208 @@ Examples:
 
         parser.add_argument("--code", "-c", type=str, help="Code string")
 
+        parser.add_argument(
+            "--diff",
+            type=str,
+            metavar="REV_RANGE",
+            help="Review only the hunks changed in a git revision range "
+            "(e.g., HEAD~1 or main..feature; review command only)",
+        )
+
+        parser.add_argument(
+            "--repo",
+            type=str,
+            metavar="DIR",
+            help="Get architecture advice for a whole repository from cached "
+            "hierarchical summaries (arch command only)",
+        )
+
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Maximum number of concurrent reviews in --diff mode",
+        )
+
         parser.add_argument(
             "--quiet", "-q", action="store_true", help="Reduce output verbosity"
         )
 
+        parser.add_argument(
+            "--output-format",
+            choices=["text", "jsonl"],
+            default="text",
+            help="'jsonl' writes one JSON record per task result as soon as it "
+            "completes (human-readable output then goes to stderr)",
+        )
+
+        parser.add_argument(
+            "--output",
+            "-o",
+            type=str,
+            metavar="PATH",
+            help="File for --output-format jsonl (default: stdout; .gz is compressed)",
+        )
+
         parser.add_argument(
             "--api-url",
             type=str,
             help="Custom API URL (e.g., http://localhost:11434/v1 for local Ollama)",
         )
 
-        args = parser.parse_args()
+        parser.add_argument(
+            "--record-cassette",
+            type=str,
+            metavar="PATH",
+            help="Record every LLM request/response into a cassette file",
+        )
+
+        parser.add_argument(
+            "--replay-cassette",
+            type=str,
+            metavar="PATH",
+            help="Serve LLM responses from a previously recorded cassette file",
+        )
+
+        parser.add_argument(
+            "--replay-latency",
+            action="store_true",
+            help="Reproduce recorded latencies when replaying a cassette",
+        )
+
+        parser.add_argument(
+            "--deadline",
+            type=float,
+            metavar="SECONDS",
+            help="Time budget; late agents get shorter responses, are cut off "
+            "(keeping partial output) or skipped",
+        )
+
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help="Stream responses and print each section as soon as it is complete",
+        )
+
+        parser.add_argument(
+            "--profile",
+            choices=["cprofile", "sample"],
+            help="Profile every agent task (cProfile or stack sampling) and "
+            "write aggregated reports at the end of the run",
+        )
+
+        parser.add_argument(
+            "--profile-memory",
+            action="store_true",
+            help="With --profile, also attribute allocations to tasks with "
+            "tracemalloc (only tasks that ran alone; slows tasks down)",
+        )
+
+        parser.add_argument(
+            "--profile-dir",
+            type=str,
+            default="profiles",
+            help="Directory for --profile reports",
+        )
+
+        parser.add_argument(
+            "--compact",
+            action="store_true",
+            help="Strip license headers, commented-out code and blank/repeated "
+            "lines from inputs before sending them to agents",
+        )
+
+        parser.add_argument(
+            "--cache-policy",
+            choices=["exact", "normalized"],
+            help="Enable the result cache; 'normalized' also reuses results for "
+            "inputs that differ only in formatting, comments or local names",
+        )
+
+        parser.add_argument(
+            "--cache-dir",
+            type=str,
+            help="Directory to persist cached results in (enables the cache)",
+        )
+
+        parser.add_argument(
+            "--daemon",
+            dest="daemon",
+            action="store_true",
+            default=None,
+            help="Run the command in the background daemon, starting it if needed "
+            "(default: CLI_DAEMON)",
+        )
+
+        parser.add_argument(
+            "--no-daemon",
+            dest="daemon",
+            action="store_false",
+            help="Run the command in this process",
+        )
 
+        args = parser.parse_args(argv)
+
+        if self._use_daemon(args):
+            from .daemon import DaemonClient
+
+            try:
+                return DaemonClient.from_env().run(
+                    sys.argv[1:] if argv is None else argv
+                )
+            except (OSError, ValueError) as e:
+                print(
+                    f"{Fore.YELLOW}⚠️  CLI daemon unavailable ({e}); running locally{Style.RESET_ALL}",
+                    file=sys.stderr,
+                )
+
+        # Machine-readable output: keep stdout for records only
+        stdout = sys.stdout
+        if args.output_format == "jsonl":
+            from .result_writer import JsonLinesWriter
+
+            self.writer = JsonLinesWriter(args.output)
+            if self.writer.to_stdout:
+                sys.stdout = sys.stderr
+        elif args.output:
+            print(
+                f"{Fore.YELLOW}⚠️  --output requires --output-format jsonl{Style.RESET_ALL}"
+            )
+            return 1
+
+        try:
+            return self._run_command(args)
+        finally:
+            if self.orchestrator and self.orchestrator.profiler:
+                paths = self.orchestrator.profiler.write_reports()
+                print(
+                    f"{Fore.CYAN}📈 Profile reports written to {args.profile_dir} "
+                    f"({len(paths)} file(s)){Style.RESET_ALL}"
+                )
+            if self.writer:
+                self.writer.close()
+                sys.stdout = stdout
+                if not self.writer.to_stdout:
+                    print(
+                        f"{Fore.CYAN}📄 Wrote {self.writer.count} result(s) to {self.writer.path}{Style.RESET_ALL}"
+                    )
+
+    def _use_daemon(self, args) -> bool:
+        """Whether to forward the command to the daemon (never interactive mode)."""
+        if args.command == "interactive":
+            return False
+        if args.daemon is not None:
+            return args.daemon
+        return os.getenv("CLI_DAEMON", "False").lower() == "true"
+
+    def _create_orchestrator(self, verbose: bool) -> "SimpleMultiAgentOrchestrator":
+        """Create the orchestrator for a command."""
+        from .multi_agent_orchestrator import SimpleMultiAgentOrchestrator
+
+        return SimpleMultiAgentOrchestrator(verbose=verbose)
+
+    def _run_command(self, args) -> int:
+        """Initialize the orchestrator and execute the requested command."""
         # Initialize orchestrator
         try:
             # Set custom API URL if provided
@@ -84,7 +300,41 @@ Examples:
                     f"{Fore.CYAN}🔧 Using custom API URL: {args.api_url}{Style.RESET_ALL}"
                 )
 
-            self.orchestrator = SimpleMultiAgentOrchestrator(verbose=not args.quiet)
+            # Configure cassette record/replay if requested
+            if args.record_cassette and args.replay_cassette:
+                print(
+                    f"{Fore.RED}❌ Use either --record-cassette or --replay-cassette, not both{Style.RESET_ALL}"
+                )
+                return 1
+            if args.record_cassette or args.replay_cassette:
+                mode = "record" if args.record_cassette else "replay"
+                os.environ["LLM_CASSETTE_MODE"] = mode
+                os.environ["LLM_CASSETTE_PATH"] = (
+                    args.record_cassette or args.replay_cassette
+                )
+                os.environ["LLM_CASSETTE_REPLAY_LATENCY"] = str(args.replay_latency)
+                print(
+                    f"{Fore.CYAN}📼 Cassette {mode}: {os.environ['LLM_CASSETTE_PATH']}{Style.RESET_ALL}"
+                )
+
+            if args.compact:
+                os.environ["INPUT_COMPACTION"] = "True"
+
+            if args.profile:
+                os.environ["TASK_PROFILING"] = args.profile
+                os.environ["TASK_PROFILE_DIR"] = args.profile_dir
+                if args.profile_memory:
+                    os.environ["TASK_PROFILE_MEMORY"] = "True"
+
+            # Configure the result cache if requested
+            if args.cache_policy or args.cache_dir:
+                os.environ["TASK_CACHE"] = "True"
+                if args.cache_policy:
+                    os.environ["TASK_CACHE_POLICY"] = args.cache_policy
+                if args.cache_dir:
+                    os.environ["TASK_CACHE_DIR"] = args.cache_dir
+
+            self.orchestrator = self._create_orchestrator(verbose=not args.quiet)
         except ValueError as e:
             print(f"{Fore.RED}❌ Failed to initialize agents: {e}{Style.RESET_ALL}")
             print(
@@ -92,6 +342,27 @@ Examples:
             )
             return 1
 
+        if args.diff:
+            if args.command != "review":
+                print(
+                    f"{Fore.YELLOW}⚠️  --diff is only supported by the review command{Style.RESET_ALL}"
+                )
+                return 1
+            return self._handle_diff_review(args.diff, args.workers)
+
+        if self.writer:
+            self.orchestrator.add_result_listener(self.writer.write)
+        self.stream = args.stream
+        self.deadline = args.deadline
+
+        if args.repo:
+            if args.command != "arch":
+                print(
+                    f"{Fore.YELLOW}⚠️  --repo is only supported by the arch command{Style.RESET_ALL}"
+                )
+                return 1
+            return self._handle_repo_arch(args.repo)
+
         # Get input
         code = self._read_input(args)
         if not code and args.command not in ["interactive", "status"]:
@@ -122,7 +393,9 @@ Examples:
         elif args.file:
             try:
                 with open(args.file, "r") as f:
-                    return f.read()
+                    code = f.read()
+                self.context = self._file_context(args.file)
+                return code
             except FileNotFoundError:
                 print(f"{Fore.RED}❌ File not found: {args.file}{Style.RESET_ALL}")
                 return None
@@ -138,36 +411,207 @@ Examples:
             )
             return None
 
+    @staticmethod
+    def _file_context(path: str) -> Dict[str, Any]:
+        """Context describing an input file (its path and language)."""
+        from .diff_review import language_for_path
+
+        context = {"file": path}
+        language = language_for_path(path)
+        if language != "Unknown":
+            context["language"] = language
+        return context
+
     def _handle_analyze(self, code: str) -> int:
         """Handle analyze command."""
         print(f"{Fore.CYAN}🔍 Running full analysis...{Style.RESET_ALL}")
-        results = self.orchestrator.execute_full_analysis(code)
+        results = self._run_cancellable(
+            lambda token: self.orchestrator.execute_full_analysis(
+                code, self.context, deadline=self.deadline, cancel_token=token
+            )
+        )
         return 0
 
     def _handle_review(self, code: str) -> int:
         """Handle review command."""
+        from .multi_agent_orchestrator import TaskType
+
         print(f"{Fore.CYAN}🔍 Running code review...{Style.RESET_ALL}")
-        result = self.orchestrator.execute_task(TaskType.CODE_REVIEW, code)
+        result = self._execute(TaskType.CODE_REVIEW, code)
         return 0 if result.success else 1
 
+    def _handle_diff_review(self, rev_range: str, workers: int) -> int:
+        """Handle review --diff command."""
+        from .diff_review import DiffReviewer
+
+        print(f"{Fore.CYAN}🔍 Reviewing changes in {rev_range}...{Style.RESET_ALL}")
+        reviewer = DiffReviewer(self.orchestrator, max_workers=workers)
+
+        try:
+            reviews = self._run_cancellable(
+                lambda token: reviewer.review(
+                    rev_range,
+                    on_result=self._write_region_result if self.writer else None,
+                    cancel_token=token,
+                )
+            )
+        except ValueError as e:
+            print(f"{Fore.RED}❌ {e}{Style.RESET_ALL}")
+            return 1
+
+        for path, reason in reviewer.skipped_files.items():
+            print(f"{Fore.YELLOW}⚠️  Skipped {path}: {reason}{Style.RESET_ALL}")
+
+        if not reviews:
+            print(f"{Fore.YELLOW}No reviewable changes found.{Style.RESET_ALL}")
+            return 0
+
+        agent = self.orchestrator.get_agent("code_reviewer")
+        failures = 0
+        for region, result in reviews:
+            print(f"\n{Fore.GREEN}📍 {region.location}{Style.RESET_ALL}")
+            if result.success:
+                print(agent.format_output(result.output))
+            else:
+                failures += 1
+                print(
+                    f"{Fore.RED}❌ Review failed: {result.error_message}{Style.RESET_ALL}"
+                )
+
+        print(
+            f"{Fore.CYAN}Reviewed {len(reviews)} changed region(s), "
+            f"{failures} failed{Style.RESET_ALL}"
+        )
+        return 0 if failures == 0 else 1
+
+    def _write_region_result(self, region, result) -> None:
+        """Write a diff region review as soon as it completes."""
+        self.writer.write(result)
+
     def _handle_test(self, code: str) -> int:
         """Handle test command."""
+        from .multi_agent_orchestrator import TaskType
+
         print(f"{Fore.CYAN}🧪 Generating tests...{Style.RESET_ALL}")
-        result = self.orchestrator.execute_task(TaskType.TEST_GENERATION, code)
+        result = self._execute(TaskType.TEST_GENERATION, code)
         return 0 if result.success else 1
 
     def _handle_document(self, code: str) -> int:
         """Handle document command."""
+        from .multi_agent_orchestrator import TaskType
+
         print(f"{Fore.CYAN}📝 Generating documentation...{Style.RESET_ALL}")
-        result = self.orchestrator.execute_task(TaskType.DOCUMENTATION, code)
+        result = self._execute(TaskType.DOCUMENTATION, code)
         return 0 if result.success else 1
 
     def _handle_arch(self, code: str) -> int:
         """Handle architecture command."""
+        from .multi_agent_orchestrator import TaskType
+
         print(f"{Fore.CYAN}🏗️  Getting architecture advice...{Style.RESET_ALL}")
-        result = self.orchestrator.execute_task(TaskType.ARCHITECTURE_ADVICE, code)
+        result = self._execute(TaskType.ARCHITECTURE_ADVICE, code)
         return 0 if result.success else 1
 
+    def _handle_repo_arch(self, root: str) -> int:
+        """Handle arch --repo command."""
+        print(
+            f"{Fore.CYAN}🏗️  Getting architecture advice for {root}...{Style.RESET_ALL}"
+        )
+        deadline_at = (
+            time.monotonic() + self.deadline if self.deadline is not None else None
+        )
+        result = self._run_cancellable(
+            lambda token: self.orchestrator.execute_repository_analysis(
+                root,
+                on_section=self._print_section if self.stream else None,
+                deadline_at=deadline_at,
+                cancel_token=token,
+            )
+        )
+        return 0 if result.success else 1
+
+    def _execute(self, task_type: "TaskType", code: str):
+        """Execute a single task, streaming sections if requested."""
+        deadline_at = (
+            time.monotonic() + self.deadline if self.deadline is not None else None
+        )
+        if not self.stream:
+            return self._run_cancellable(
+                lambda token: self.orchestrator.execute_task(
+                    task_type,
+                    code,
+                    self.context,
+                    deadline_at=deadline_at,
+                    cancel_token=token,
+                )
+            )
+
+        result = self._run_cancellable(
+            lambda token: self.orchestrator.execute_task(
+                task_type,
+                code,
+                self.context,
+                verbose=False,
+                on_section=self._print_section,
+                deadline_at=deadline_at,
+                cancel_token=token,
+            )
+        )
+        if result.success:
+            print(
+                f"\n{Fore.GREEN}✅ Completed in {result.execution_time:.2f}s{Style.RESET_ALL}"
+            )
+            if "summary" in result.output:
+                print(f"📊 Summary: {result.output['summary']}")
+        else:
+            print(f"{Fore.RED}❌ Task failed: {result.error_message}{Style.RESET_ALL}")
+        return result
+
+    def _run_cancellable(self, work: Callable[["CancellationToken"], Any]) -> Any:
+        """
+        Run work on a helper thread so that Ctrl+C cancels it cleanly.
+
+        The first Ctrl+C cancels the work's token (aborting its requests) and
+        waits for the cancelled results to be recorded; a second one quits.
+
+        Args:
+            work: Function receiving the cancellation token
+
+        Returns:
+            What the work returned
+        """
+        from .agents.cancellation import CancellationToken
+
+        token = CancellationToken()
+        future: Future = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(work(token))
+            except BaseException as e:
+                future.set_exception(e)
+
+        # In this context, so output routed by context variables follows
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(run,),
+            name="cli-command",
+            daemon=True,
+        ).start()
+        try:
+            return future.result()
+        except KeyboardInterrupt:
+            print(
+                f"\n{Fore.YELLOW}🛑 Cancelling... (Ctrl+C again to quit){Style.RESET_ALL}"
+            )
+            token.cancel("Cancelled by user")
+            return future.result()
+
+    def _print_section(self, name: str, text: str) -> None:
+        """Print a streamed section as soon as it is complete."""
+        title = name.replace("_", " ").upper()
+        print(f"\n{Fore.CYAN}--- {title} ---{Style.RESET_ALL}\n{text}", flush=True)
+
     def _handle_status(self) -> int:
         """Handle status command."""
         self.orchestrator.print_system_status()
@@ -175,23 +619,39 @@ Examples:
 
     def _handle_interactive(self) -> int:
         """Handle interactive mode."""
+        from .jobs import JobManager
+
+        self.jobs = JobManager(on_done=self._announce_job)
+
         print(
             f"{Fore.CYAN}🤖 Multi-Agent Developer System - Interactive Mode{Style.RESET_ALL}"
         )
         print(f"{Fore.CYAN}=" * 60 + Style.RESET_ALL)
         print(f"{Fore.YELLOW}Type 'exit' to quit, 'help' for commands{Style.RESET_ALL}")
+        print(
+            f"{Fore.YELLOW}Commands run in the background; use 'jobs' and 'show <id>'{Style.RESET_ALL}"
+        )
 
         while True:
             try:
-                command = input(f"\n{Fore.GREEN}agent> {Style.RESET_ALL}").strip()
+                self._prompting = True
+                try:
+                    command = input(f"\n{Fore.GREEN}agent> {Style.RESET_ALL}").strip()
+                finally:
+                    self._prompting = False
 
                 if command.lower() in ["exit", "quit", "q"]:
+                    self._cancel_running_jobs()
                     print(f"{Fore.YELLOW}👋 Goodbye!{Style.RESET_ALL}")
                     break
                 elif command.lower() in ["help", "?"]:
                     self._show_interactive_help()
                 elif command.lower() == "status":
                     self.orchestrator.print_system_status()
+                elif command.lower() == "jobs":
+                    self._list_jobs()
+                elif command.lower().startswith(("wait", "show", "cancel")):
+                    self._handle_job_command(command)
                 elif command.lower().startswith("review"):
                     self._handle_interactive_command("review", command)
                 elif command.lower().startswith("test"):
@@ -208,6 +668,7 @@ Examples:
                     )
 
             except KeyboardInterrupt:
+                self._cancel_running_jobs()
                 print(f"\n{Fore.YELLOW}👋 Goodbye!{Style.RESET_ALL}")
                 break
             except Exception as e:
@@ -224,6 +685,10 @@ Examples:
   {Fore.GREEN}doc <code or --file filename>{Style.RESET_ALL}    - Generate documentation
   {Fore.GREEN}arch <code or --file filename>{Style.RESET_ALL}   - Get architecture advice
   {Fore.GREEN}analyze <code or --file filename>{Style.RESET_ALL} - Run full analysis
+  {Fore.GREEN}jobs{Style.RESET_ALL}                            - List background jobs
+  {Fore.GREEN}show <id>{Style.RESET_ALL}                       - Show the result of a finished job
+  {Fore.GREEN}wait <id>{Style.RESET_ALL}                       - Wait for a job and show its result
+  {Fore.GREEN}cancel <id>{Style.RESET_ALL}                     - Cancel a job
   {Fore.GREEN}status{Style.RESET_ALL}                          - Show system status
   {Fore.GREEN}help{Style.RESET_ALL}                            - Show this help
   {Fore.GREEN}exit{Style.RESET_ALL}                            - Exit interactive mode
@@ -232,11 +697,12 @@ Examples:
   review "def add(a, b): return a + b"
   test --file examples/example_code.py
   analyze "class Calculator: ..."
+  wait 1
         """
         print(help_text)
 
     def _handle_interactive_command(self, command_type: str, command: str):
-        """Handle interactive commands."""
+        """Start an interactive command as a background job."""
         parts = command.split(maxsplit=1)
         if len(parts) < 2:
             print(
@@ -245,6 +711,7 @@ Examples:
             return
 
         input_str = parts[1]
+        context = None
         if input_str.startswith("--file "):
             filename = input_str[7:].strip()
             try:
@@ -253,20 +720,194 @@ Examples:
             except Exception as e:
                 print(f"{Fore.RED}❌ Error reading file: {e}{Style.RESET_ALL}")
                 return
+            context = self._file_context(filename)
         else:
             code = input_str
 
-        # Execute the command
-        if command_type == "review":
-            self.orchestrator.execute_task(TaskType.CODE_REVIEW, code)
-        elif command_type == "test":
-            self.orchestrator.execute_task(TaskType.TEST_GENERATION, code)
-        elif command_type == "doc":
-            self.orchestrator.execute_task(TaskType.DOCUMENTATION, code)
-        elif command_type == "arch":
-            self.orchestrator.execute_task(TaskType.ARCHITECTURE_ADVICE, code)
-        elif command_type == "analyze":
-            self.orchestrator.execute_full_analysis(code)
+        from .agents.cancellation import CancellationToken
+        from .multi_agent_orchestrator import TaskType
+
+        # Start the command (ahead of any queued batch work)
+        token = CancellationToken()
+        task_types = {
+            "review": TaskType.CODE_REVIEW,
+            "test": TaskType.TEST_GENERATION,
+            "doc": TaskType.DOCUMENTATION,
+            "arch": TaskType.ARCHITECTURE_ADVICE,
+        }
+        if command_type in task_types:
+            future = self._execute_interactive(
+                task_types[command_type], code, context, token
+            )
+        else:
+            future = None
+
+        if future is not None:
+            job = self.jobs.submit(command, future, token)
+        else:
+            # The analysis coordinates several tasks itself: give it a thread
+            job = self.jobs.start(
+                command,
+                lambda: self.orchestrator.execute_full_analysis(
+                    code, context, verbose=False, cancel_token=token
+                ),
+                token,
+            )
+        print(
+            f"{Fore.CYAN}🚀 [{job.id}] Started {command_type} "
+            f"('wait {job.id}' or 'show {job.id}' when done){Style.RESET_ALL}"
+        )
+
+    def _execute_interactive(
+        self,
+        task_type: "TaskType",
+        code: str,
+        context: Optional[Dict[str, Any]],
+        token: "CancellationToken",
+    ):
+        """Queue a task with interactive priority and return its future."""
+        from .scheduler import Priority
+
+        return self.orchestrator.submit_task(
+            task_type,
+            code,
+            context,
+            priority=Priority.INTERACTIVE,
+            verbose=False,
+            cancel_token=token,
+        )
+
+    def _handle_job_command(self, command: str) -> None:
+        """Handle wait, show and cancel."""
+        parts = command.split()
+        if len(parts) != 2 or not parts[1].isdigit():
+            print(f"{Fore.YELLOW}Usage: {parts[0]} <job id>{Style.RESET_ALL}")
+            return
+
+        action, job = parts[0].lower(), self.jobs.get(int(parts[1]))
+        if action == "cancel":
+            self.jobs.cancel(job.id)
+            print(f"{Fore.YELLOW}🛑 [{job.id}] Cancelled{Style.RESET_ALL}")
+            return
+
+        if action == "wait" and job.status == "running":
+            print(f"{Fore.CYAN}⏳ Waiting for job {job.id}...{Style.RESET_ALL}")
+            try:
+                while job.status == "running":
+                    time.sleep(0.1)
+            except KeyboardInterrupt:
+                print(
+                    f"\n{Fore.YELLOW}Stopped waiting; job {job.id} keeps running{Style.RESET_ALL}"
+                )
+                return
+        self._show_job(job)
+
+    def _list_jobs(self) -> None:
+        """List background jobs."""
+        jobs = self.jobs.jobs()
+        if not jobs:
+            print("No jobs yet.")
+            return
+        for job in jobs:
+            command = (
+                job.command if len(job.command) <= 50 else job.command[:47] + "..."
+            )
+            print(
+                f"  [{job.id}] {self._job_state(job):<12} {job.elapsed:>7.1f}s  {command}"
+            )
+
+    def _show_job(self, job) -> None:
+        """Print the result of a finished job."""
+        status = job.status
+        if status == "running":
+            print(
+                f"{Fore.YELLOW}Job {job.id} is still running ({job.elapsed:.1f}s){Style.RESET_ALL}"
+            )
+            return
+        if status == "cancelled":
+            if job.token is None or job.future.cancelled():
+                print(f"{Fore.YELLOW}Job {job.id} was cancelled{Style.RESET_ALL}")
+                return
+            if not job.future.done():
+                print(f"{Fore.YELLOW}Job {job.id} is being cancelled{Style.RESET_ALL}")
+                return
+        if status == "failed":
+            print(
+                f"{Fore.RED}❌ Job {job.id} failed: {job.future.exception()}{Style.RESET_ALL}"
+            )
+            return
+
+        result = job.result()
+        print(f"{Fore.CYAN}=== [{job.id}] {job.command} ==={Style.RESET_ALL}")
+        if isinstance(result, dict):
+            # Full analysis: one result per agent
+            for task_name, task_result in result.items():
+                print(
+                    f"\n{Fore.GREEN}▶️  {task_name.replace('_', ' ').title()}{Style.RESET_ALL}"
+                )
+                self._print_result(task_result)
+        else:
+            self._print_result(result)
+
+    def _print_result(self, result) -> None:
+        """Print a task result with its agent's formatting."""
+        if result.degraded == "cancelled" and result.output:
+            print(f"{Fore.YELLOW}🛑 Cancelled; partial output:{Style.RESET_ALL}")
+        elif not result.success:
+            print(f"{Fore.RED}❌ Task failed: {result.error_message}{Style.RESET_ALL}")
+            return
+        agent = self.orchestrator.get_agent(result.agent_name.lower().replace(" ", "_"))
+        print(agent.format_output(result.output))
+        if result.success:
+            print(
+                f"\n{Fore.GREEN}✅ Completed in {result.execution_time:.2f}s{Style.RESET_ALL}"
+            )
+
+    def _job_state(self, job) -> str:
+        """Short state of a job, with the outcome of finished ones."""
+        status = job.status
+        if status != "done":
+            return status
+        result = job.result()
+        results = list(result.values()) if isinstance(result, dict) else [result]
+        failed = sum(1 for r in results if not r.success)
+        return f"failed ({failed})" if failed else "done"
+
+    def _announce_job(self, job) -> None:
+        """Announce a finished job without disturbing the prompt."""
+        state = self._job_state(job)
+        color = Fore.GREEN if state == "done" else Fore.RED
+        icon = "✅" if state == "done" else "❌"
+        message = (
+            f"{color}{icon} [{job.id}] {job.command.split()[0]} {state} "
+            f"in {job.elapsed:.1f}s ('show {job.id}'){Style.RESET_ALL}"
+        )
+        with self._print_lock:
+            if not self._prompting:
+                print(message)
+                return
+            # Print above the prompt and redraw it with what was typed so far
+            try:
+                import readline
+
+                typed = readline.get_line_buffer()
+            except ImportError:
+                typed = ""
+            print(
+                f"\r\033[K{message}\n{Fore.GREEN}agent> {Style.RESET_ALL}{typed}",
+                end="",
+                flush=True,
+            )
+
+    def _cancel_running_jobs(self) -> None:
+        """Cancel unfinished jobs when leaving interactive mode."""
+        running = self.jobs.running() if self.jobs else []
+        for job in running:
+            self.jobs.cancel(job.id)
+        if running:
+            print(
+                f"{Fore.YELLOW}🛑 Cancelled {len(running)} unfinished job(s){Style.RESET_ALL}"
+            )
 
 
 def main():
@@ -0,0 +1,216 @@
+"""
+Adaptive concurrency control for agent requests.
+
+The limiter follows an AIMD (additive increase, multiplicative decrease) policy
+driven by provider feedback: it backs off when requests are rate limited, time
+out or exceed a latency target, and slowly raises the limit while requests
+succeed.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import openai
+
+from .agents.cancellation import TaskCancelled
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limiter on the number of in-flight agent requests."""
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        target_latency: Optional[float] = None,
+        backoff_factor: float = 0.5,
+        cooldown: float = 2.0,
+        max_events: int = 50,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Starting concurrency limit
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            target_latency: Latency (seconds) above which a task counts as
+                overload; None disables latency-based backoff. This is the
+                latency of the whole agent task, which may send several
+                requests
+            backoff_factor: Multiplier applied to the limit on overload
+            cooldown: Minimum seconds between two backoffs, so that a burst of
+                failures from the same overload only backs off once
+            max_events: Number of recent backoff events to keep
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.target_latency = target_latency
+        self.backoff_factor = backoff_factor
+        self.cooldown = cooldown
+
+        self.in_flight = 0
+        self.total_backoffs = 0
+        self.backoff_events: deque = deque(maxlen=max_events)
+        self._successes_since_change = 0
+        self._last_backoff = 0.0
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_env(cls) -> Optional["AdaptiveConcurrencyLimiter"]:
+        """
+        Create a limiter from environment variables.
+
+        Returns:
+            AdaptiveConcurrencyLimiter, or None if ADAPTIVE_CONCURRENCY is not
+            enabled
+        """
+        if os.getenv("ADAPTIVE_CONCURRENCY", "False").lower() != "true":
+            return None
+
+        target_latency = os.getenv("CONCURRENCY_TARGET_LATENCY")
+        return cls(
+            initial_limit=int(os.getenv("CONCURRENCY_INITIAL", "4")),
+            min_limit=int(os.getenv("CONCURRENCY_MIN", "1")),
+            max_limit=int(os.getenv("CONCURRENCY_MAX", "32")),
+            target_latency=float(target_latency) if target_latency else None,
+        )
+
+    def acquire(self) -> None:
+        """Block until a request slot is available."""
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self) -> None:
+        """Release a request slot."""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Hold a request slot and feed the outcome back into the limiter.
+
+        Overload errors are recorded and re-raised.
+        """
+        self.acquire()
+        start_time = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            reason = self.classify_error(e)
+            if reason:
+                self.record_overload(reason)
+            raise
+        else:
+            self.record_success(time.perf_counter() - start_time)
+        finally:
+            self.release()
+
+    def record_success(self, latency: float) -> None:
+        """
+        Record a successful request.
+
+        Args:
+            latency: Request latency in seconds
+        """
+        if self.target_latency is not None and latency > self.target_latency:
+            self.record_overload("latency", latency=latency)
+            return
+
+        with self._condition:
+            self._successes_since_change += 1
+            # Additive increase: +1 after a full window of successes
+            if (
+                self._successes_since_change >= self.limit
+                and self.limit < self.max_limit
+            ):
+                self.limit += 1
+                self._successes_since_change = 0
+                self._condition.notify_all()
+
+    def record_overload(self, reason: str, latency: Optional[float] = None) -> None:
+        """
+        Record an overload signal and back off multiplicatively.
+
+        Args:
+            reason: Why the request counts as overload (rate_limit, timeout, latency)
+            latency: Observed latency, if relevant
+        """
+        with self._condition:
+            now = time.time()
+            if now - self._last_backoff < self.cooldown:
+                return
+
+            previous = self.limit
+            self.limit = max(
+                self.min_limit, math.floor(self.limit * self.backoff_factor)
+            )
+            self._successes_since_change = 0
+            self._last_backoff = now
+            self.total_backoffs += 1
+
+            event = {
+                "timestamp": now,
+                "reason": reason,
+                "from": previous,
+                "to": self.limit,
+            }
+            if latency is not None:
+                event["latency"] = round(latency, 3)
+            self.backoff_events.append(event)
+
+    @staticmethod
+    def classify_error(error: Exception) -> Optional[str]:
+        """
+        Decide whether an exception signals provider overload.
+
+        Only provider errors count: local deadlines (TimeoutError) and
+        cancellations say nothing about the provider's load.
+
+        Args:
+            error: Exception raised by an agent request
+
+        Returns:
+            "rate_limit", "timeout", or None for unrelated errors
+        """
+        if isinstance(error, (TaskCancelled, TimeoutError)):
+            return None
+
+        status = getattr(error, "status_code", None)
+        if status is None:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+
+        if isinstance(error, openai.RateLimitError) or status == 429:
+            return "rate_limit"
+        if isinstance(error, openai.APITimeoutError) or status in (503, 504):
+            return "timeout"
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the current limiter state.
+
+        Returns:
+            Dictionary with the limit, bounds, in-flight count and backoff events
+        """
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self.in_flight,
+                "target_latency": self.target_latency,
+                "total_backoffs": self.total_backoffs,
+                "recent_backoffs": list(self.backoff_events),
+            }
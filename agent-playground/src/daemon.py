@@ -0,0 +1,620 @@
+"""
+Background daemon serving CLI commands over a Unix domain socket.
+
+Starting the CLI imports LangChain and builds the agents' clients, which takes
+seconds before any work is done. The daemon keeps warm orchestrators and runs
+commands forwarded by a thin client (``SimpleCLI`` with --daemon or
+CLI_DAEMON=true), streaming their output back as it is printed. The client
+starts the daemon on first use, and the daemon exits after
+CLI_DAEMON_IDLE_TIMEOUT seconds without requests.
+
+Protocol: one request per connection, as newline-delimited JSON. A command
+request is {"argv": [...], "cwd": ..., "env": {...}}; the daemon answers with
+{"stream": "stdout" | "stderr", "data": ...} frames and a final {"exit": code}.
+{"command": "ping"} and {"command": "stop"} control the daemon itself.
+
+Commands run one at a time, in the client's working directory and with its
+environment, so they behave like local runs. Their output is routed to their
+own client through a context variable, which the scheduler carries over to the
+threads running their tasks; output of anything else goes to the daemon log.
+Orchestrators are reused across commands that agree on the environment
+variables the orchestrator is configured by.
+
+Only the standard library is imported at module level, so the client side
+stays fast to import.
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+PROTOCOL_VERSION = 1
+
+# Checkout the daemon serves (one daemon per checkout and user)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Environment variables configuring the orchestrator and its agents: settings
+# by prefix, custom agent prompts by suffix, and the HTTP client's network setup
+ORCHESTRATOR_VARIABLE_PREFIXES = (
+    "OPENAI_",
+    "MAX_TOKENS",
+    "DYNAMIC_MAX_TOKENS",
+    "DEADLINE_TOKENS_PER_SECOND",
+    "INPUT_COMPACTION",
+    "TASK_CACHE",
+    "TASK_PROFIL",
+    "BLOB_STORE",
+    "ADAPTIVE_CONCURRENCY",
+    "CONCURRENCY_",
+    "SCHEDULER_",
+    "RETRIEVAL_",
+    "STATIC_FAST_PATH",
+    "MICRO_BATCH",
+    "LLM_CASSETTE",
+    "VERIFY_TESTS",
+    "DOC_INCREMENTAL",
+    "DOC_INDEX_",
+    "REPO_SUMMARY_",
+)
+ORCHESTRATOR_VARIABLE_SUFFIXES = ("_PROMPT",)
+HTTP_CLIENT_VARIABLES = {
+    "HTTP_PROXY",
+    "HTTPS_PROXY",
+    "ALL_PROXY",
+    "NO_PROXY",
+    "SSL_CERT_FILE",
+    "SSL_CERT_DIR",
+}
+
+# Warm orchestrators kept for different configurations
+MAX_ORCHESTRATORS = 4
+
+
+def default_socket_path() -> str:
+    """
+    Socket path of the daemon for this checkout.
+
+    Returns:
+        CLI_DAEMON_SOCKET if set, else a per-user, per-checkout path in the
+        runtime (or temporary) directory
+    """
+    configured = os.getenv("CLI_DAEMON_SOCKET")
+    if configured:
+        return configured
+
+    directory = os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    checkout = hashlib.sha1(PROJECT_ROOT.encode("utf-8")).hexdigest()[:10]
+    return os.path.join(directory, f"agent-playground-{os.getuid()}-{checkout}.sock")
+
+
+class DaemonClient:
+    """Forwards CLI commands to the daemon, starting it if needed."""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        autostart: bool = True,
+        start_timeout: float = 30.0,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Daemon socket (defaults to default_socket_path())
+            autostart: Start the daemon if it is not running
+            start_timeout: Seconds to wait for a started daemon to accept
+                connections
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.autostart = autostart
+        self.start_timeout = start_timeout
+
+    @classmethod
+    def from_env(cls) -> "DaemonClient":
+        """
+        Create a client from environment variables.
+
+        Returns:
+            DaemonClient for CLI_DAEMON_SOCKET (or the default socket)
+        """
+        return cls(start_timeout=float(os.getenv("CLI_DAEMON_START_TIMEOUT", "30")))
+
+    def run(self, argv: List[str]) -> int:
+        """
+        Run a CLI command in the daemon, writing its output as it arrives.
+
+        Args:
+            argv: CLI arguments (without the program name)
+
+        Returns:
+            Exit code of the command
+
+        Raises:
+            ValueError: If the daemon cannot be reached or started
+        """
+        request = {
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+        }
+        for frame in self._request(request):
+            if "stream" in frame:
+                stream = sys.stderr if frame["stream"] == "stderr" else sys.stdout
+                stream.write(frame["data"])
+                stream.flush()
+            elif "exit" in frame:
+                return frame["exit"]
+            elif "error" in frame:
+                raise ValueError(frame["error"])
+
+        print("Connection to the CLI daemon was lost", file=sys.stderr)
+        return 1
+
+    def ping(self) -> Optional[Dict[str, Any]]:
+        """
+        Check whether the daemon is running (never starts it).
+
+        Returns:
+            Daemon information (pid, uptime, commands served), or None
+        """
+        try:
+            return next(self._request({"command": "ping"}, autostart=False), None)
+        except ValueError:
+            return None
+
+    def stop(self) -> bool:
+        """
+        Ask the daemon to exit.
+
+        Returns:
+            True if a running daemon was stopped
+        """
+        try:
+            return (
+                next(self._request({"command": "stop"}, autostart=False), None)
+                is not None
+            )
+        except ValueError:
+            return False
+
+    def _request(
+        self, message: Dict[str, Any], autostart: Optional[bool] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Send a request and yield the response frames."""
+        connection = self._connect(self.autostart if autostart is None else autostart)
+        with connection, connection.makefile("rb") as responses:
+            message["version"] = PROTOCOL_VERSION
+            connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            for line in responses:
+                yield json.loads(line)
+
+    def _connect(self, autostart: bool) -> socket.socket:
+        """Connect to the daemon, starting it first if allowed."""
+        try:
+            return self._try_connect()
+        except (FileNotFoundError, ConnectionRefusedError):
+            if not autostart:
+                raise ValueError(f"CLI daemon is not running ({self.socket_path})")
+
+        process = self._start_daemon()
+        deadline = time.monotonic() + self.start_timeout
+        while time.monotonic() < deadline:
+            try:
+                return self._try_connect()
+            except (FileNotFoundError, ConnectionRefusedError):
+                if process.poll() not in (None, 0):
+                    break
+                time.sleep(0.05)
+
+        raise ValueError(
+            f"CLI daemon did not start; see {self.socket_path}.log for details"
+        )
+
+    def _try_connect(self) -> socket.socket:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(self.socket_path)
+        except OSError:
+            connection.close()
+            raise
+        return connection
+
+    def _start_daemon(self) -> subprocess.Popen:
+        """Start a detached daemon process logging next to its socket."""
+        with open(f"{self.socket_path}.log", "ab") as log:
+            return subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "src.daemon",
+                    "serve",
+                    "--socket",
+                    self.socket_path,
+                ],
+                cwd=PROJECT_ROOT,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+
+
+def orchestrator_key(environment: Dict[str, str]) -> tuple:
+    """
+    Key of the orchestrator configuration an environment selects.
+
+    Args:
+        environment: Environment variables
+
+    Returns:
+        Sorted (name, value) pairs of the variables the orchestrator reads
+    """
+    return tuple(
+        sorted(
+            (name, value)
+            for name, value in environment.items()
+            if name.startswith(ORCHESTRATOR_VARIABLE_PREFIXES)
+            or name.endswith(ORCHESTRATOR_VARIABLE_SUFFIXES)
+            or name.upper() in HTTP_CLIENT_VARIABLES
+        )
+    )
+
+
+class _FrameWriter:
+    """File-like object sending everything written as frames to the client."""
+
+    def __init__(self, connection: socket.socket, lock: threading.Lock, name: str):
+        self._connection = connection
+        self._lock = lock
+        self._name = name
+        self.closed = False
+
+    def write(self, text: str) -> int:
+        if text and not self.closed:
+            frame = json.dumps({"stream": self._name, "data": text}) + "\n"
+            with self._lock:
+                try:
+                    self._connection.sendall(frame.encode("utf-8"))
+                except OSError:
+                    # The client went away; keep running, drop the output
+                    self.closed = True
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+# Output streams of the command running in the current context (None outside
+# commands); the scheduler runs tasks in the context of their submitter
+_command_output: "ContextVar[Optional[Dict[str, _FrameWriter]]]" = ContextVar(
+    "command_output", default=None
+)
+
+
+class _RoutedStream:
+    """sys.stdout / sys.stderr stand-in writing to the current command's client."""
+
+    def __init__(self, name: str, fallback: Any):
+        self._name = name
+        self._fallback = fallback
+
+    def _target(self) -> Any:
+        streams = _command_output.get()
+        return streams[self._name] if streams else self._fallback
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return self._target().isatty()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fallback, name)
+
+
+class CLIDaemon:
+    """Serves CLI commands with warm orchestrators."""
+
+    def __init__(self, socket_path: Optional[str] = None, idle_timeout: float = 1800):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: Socket to listen on (defaults to default_socket_path())
+            idle_timeout: Seconds without requests after which the daemon exits
+                (0 to run until stopped)
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.idle_timeout = idle_timeout
+        self.started_at = time.time()
+        self.commands = 0
+        self._orchestrators: "OrderedDict[Any, Any]" = OrderedDict()
+        self._command_lock = threading.Lock()
+        self._last_activity = time.monotonic()
+        self._server: Optional[socketserver.BaseServer] = None
+
+    @classmethod
+    def from_env(cls, socket_path: Optional[str] = None) -> "CLIDaemon":
+        """
+        Create a daemon from environment variables.
+
+        Args:
+            socket_path: Socket to listen on (defaults to default_socket_path())
+
+        Returns:
+            CLIDaemon instance
+        """
+        return cls(
+            socket_path=socket_path,
+            idle_timeout=float(os.getenv("CLI_DAEMON_IDLE_TIMEOUT", "1800")),
+        )
+
+    def serve(self) -> int:
+        """
+        Listen for commands until stopped or idle.
+
+        Returns:
+            Exit code (1 if another daemon already serves the socket)
+        """
+        # One daemon per socket: hold a lock for the daemon's lifetime
+        lock_file = open(f"{self.socket_path}.lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            print(f"Another daemon is serving {self.socket_path}")
+            return 1
+
+        # Import everything the commands need before accepting connections
+        from .cli import SimpleCLI  # noqa: F401
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                daemon._handle(self.connection, self.rfile)
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        old_umask = os.umask(0o077)
+        try:
+            self._server = Server(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+
+        if self.idle_timeout:
+            threading.Thread(target=self._stop_when_idle, daemon=True).start()
+
+        # Installed once: each command's output is routed by context, so other
+        # threads (and commands) never write to its client
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout = _RoutedStream("stdout", stdout)
+        sys.stderr = _RoutedStream("stderr", stderr)
+
+        print(f"CLI daemon {os.getpid()} listening on {self.socket_path}", flush=True)
+        try:
+            self._server.serve_forever()
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            lock_file.close()
+        print(f"CLI daemon {os.getpid()} stopped", flush=True)
+        return 0
+
+    def stop(self) -> None:
+        """Stop serving (from any thread but the serving one)."""
+        if self._server:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def orchestrator(self, verbose: bool) -> Any:
+        """
+        Get a warm orchestrator for the current environment.
+
+        Args:
+            verbose: Verbosity for this command
+
+        Returns:
+            SimpleMultiAgentOrchestrator, created if no command used this
+            configuration yet
+        """
+        from .multi_agent_orchestrator import SimpleMultiAgentOrchestrator
+
+        key = orchestrator_key(dict(os.environ))
+        orchestrator = self._orchestrators.get(key)
+        if orchestrator is None:
+            orchestrator = SimpleMultiAgentOrchestrator(verbose=verbose)
+            self._orchestrators[key] = orchestrator
+            while len(self._orchestrators) > MAX_ORCHESTRATORS:
+                _, evicted = self._orchestrators.popitem(last=False)
+                self._release(evicted)
+        self._orchestrators.move_to_end(key)
+        orchestrator.verbose = verbose
+        return orchestrator
+
+    @staticmethod
+    def _release(orchestrator: Any) -> None:
+        """Stop the worker threads and processes of an evicted orchestrator."""
+        if orchestrator.scheduler:
+            # Queued tasks still finish; the idle workers then exit
+            orchestrator.scheduler.shutdown(wait=False)
+        verifier = getattr(orchestrator.agents.get("test_writer"), "verifier", None)
+        if verifier:
+            verifier.shutdown()
+
+    def _handle(self, connection: socket.socket, requests: Any) -> None:
+        """Serve one connection."""
+        self._last_activity = time.monotonic()
+        send_lock = threading.Lock()
+
+        def send(frame: Dict[str, Any]) -> None:
+            with send_lock:
+                connection.sendall(json.dumps(frame).encode("utf-8") + b"\n")
+
+        try:
+            request = json.loads(requests.readline())
+        except ValueError:
+            return
+
+        try:
+            if request.get("version") != PROTOCOL_VERSION:
+                send({"error": "Protocol version mismatch; restart the CLI daemon"})
+            elif request.get("command") == "ping":
+                send(
+                    {
+                        "pid": os.getpid(),
+                        "uptime": time.time() - self.started_at,
+                        "commands": self.commands,
+                        "orchestrators": len(self._orchestrators),
+                    }
+                )
+            elif request.get("command") == "stop":
+                send({"stopping": os.getpid()})
+                self.stop()
+            elif "argv" in request:
+                code = self._run(request, connection, send_lock)
+                send({"exit": code})
+            else:
+                send({"error": "Unknown request"})
+        except OSError:
+            # Client disconnected
+            pass
+        finally:
+            self._last_activity = time.monotonic()
+
+    def _run(
+        self, request: Dict[str, Any], connection: socket.socket, lock: threading.Lock
+    ) -> int:
+        """Run a CLI command as the client would have locally."""
+        from dotenv import load_dotenv
+
+        with self._command_lock:
+            self.commands += 1
+            environment = dict(os.environ)
+            directory = os.getcwd()
+            output = _command_output.set(
+                {
+                    "stdout": _FrameWriter(connection, lock, "stdout"),
+                    "stderr": _FrameWriter(connection, lock, "stderr"),
+                }
+            )
+            try:
+                os.environ.clear()
+                os.environ.update(request["env"])
+                # Same precedence as a local run: exported variables win
+                load_dotenv(os.path.join(PROJECT_ROOT, ".env"), override=False)
+                os.chdir(request["cwd"])
+
+                try:
+                    return _cli_class()(self).run(request["argv"])
+                except SystemExit as e:
+                    # argparse errors and --help
+                    return e.code if isinstance(e.code, int) else 1
+                except Exception as e:
+                    print(f"❌ Unexpected error: {e}")
+                    return 1
+            finally:
+                _command_output.reset(output)
+                os.chdir(directory)
+                os.environ.clear()
+                os.environ.update(environment)
+
+    def _stop_when_idle(self) -> None:
+        """Stop the daemon after idle_timeout seconds without requests."""
+        while True:
+            time.sleep(min(self.idle_timeout, 5))
+            idle = time.monotonic() - self._last_activity
+            if idle >= self.idle_timeout and not self._command_lock.locked():
+                print(f"CLI daemon idle for {idle:.0f}s, exiting", flush=True)
+                self.stop()
+                return
+
+
+def _cli_class():
+    """SimpleCLI subclass using the daemon's warm orchestrators (built lazily)."""
+    from .cli import SimpleCLI
+
+    class DaemonCLI(SimpleCLI):
+        def __init__(self, daemon: CLIDaemon):
+            super().__init__()
+            self._daemon = daemon
+            self._listeners: List[Any] = []
+
+        def run(self, argv: Optional[List[str]] = None) -> int:
+            try:
+                return super().run(argv)
+            finally:
+                # Result listeners (e.g. a JSONL writer) belong to this command
+                if self.orchestrator:
+                    self.orchestrator.result_listeners[:] = self._listeners
+
+        def _use_daemon(self, args: Any) -> bool:
+            return False
+
+        def _create_orchestrator(self, verbose: bool) -> Any:
+            orchestrator = self._daemon.orchestrator(verbose)
+            self._listeners = list(orchestrator.result_listeners)
+            return orchestrator
+
+    return DaemonCLI
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Manage the CLI daemon: serve, start, stop or status."""
+    parser = argparse.ArgumentParser(description="CLI daemon for faster commands")
+    parser.add_argument("action", choices=["serve", "start", "stop", "status"])
+    parser.add_argument("--socket", type=str, help="Socket path")
+    args = parser.parse_args(argv)
+
+    if args.action == "serve":
+        return CLIDaemon.from_env(args.socket).serve()
+
+    client = DaemonClient(socket_path=args.socket)
+    if args.action == "start":
+        info = client.ping()
+        if info is None:
+            client._connect(autostart=True).close()
+            info = client.ping()
+        print(f"✅ CLI daemon running (pid {info['pid']}) on {client.socket_path}")
+    elif args.action == "stop":
+        if client.stop():
+            print("🛑 CLI daemon stopped")
+        else:
+            print("CLI daemon is not running")
+    else:
+        info = client.ping()
+        if info is None:
+            print(f"CLI daemon is not running ({client.socket_path})")
+            return 1
+        print(
+            f"✅ CLI daemon running (pid {info['pid']}) on {client.socket_path}\n"
+            f"  Uptime: {info['uptime']:.0f}s, commands served: {info['commands']}, "
+            f"warm configurations: {info['orchestrators']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
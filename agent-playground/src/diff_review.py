@@ -0,0 +1,510 @@
+"""
+Diff-scoped code review for the multi-agent developer system.
+
+Instead of reviewing whole files, the changed hunks of a `git diff` are
+extracted, widened to their enclosing function (or a few lines of context), and
+only those regions are sent to the Code Reviewer. Hunks can also be computed
+between two versions of a file held in memory (see diff_hunks), e.g. by the
+file watcher.
+"""
+
+import ast
+import difflib
+import os
+import re
+import subprocess
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .agents.cancellation import CancellationToken
+from .agents.compaction import LINE_REFERENCE
+from .multi_agent_orchestrator import TaskResult, TaskType
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# Context added around a hunk when no enclosing function is found
+CONTEXT_LINES = 5
+
+# Enclosing functions longer than this fall back to the context window
+MAX_ENCLOSING_LINES = 80
+
+LANGUAGE_BY_EXTENSION = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".jsx": "JavaScript",
+    ".ts": "TypeScript",
+    ".tsx": "TypeScript",
+    ".java": "Java",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".c": "C++",
+    ".h": "C++",
+    ".cc": "C++",
+    ".cpp": "C++",
+    ".hpp": "C++",
+    ".rb": "Ruby",
+    ".sh": "Shell",
+}
+
+
+@dataclass
+class DiffHunk:
+    """A changed region of a file in a unified diff."""
+
+    path: str
+    start: int
+    length: int
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def end(self) -> int:
+        """Last changed line in the new file (start for pure deletions)."""
+        return self.start + max(self.length, 1) - 1
+
+
+@dataclass
+class ReviewRegion:
+    """A region of a file sent to the reviewer, covering one or more hunks."""
+
+    path: str
+    start: int
+    end: int
+    source: str
+    hunks: List[DiffHunk]
+
+    @property
+    def location(self) -> str:
+        """file:line annotation for the region."""
+        return f"{self.path}:{self.start}-{self.end}"
+
+
+def read_git_diff(rev_range: str, repo_dir: str = ".") -> str:
+    """
+    Run `git diff` with zero context lines for a revision range.
+
+    Args:
+        rev_range: Revision or range (e.g., "HEAD~1", "main..feature")
+        repo_dir: Repository directory
+
+    Returns:
+        Unified diff text
+    """
+    completed = subprocess.run(
+        [
+            "git",
+            "diff",
+            "--unified=0",
+            "--no-color",
+            "--no-ext-diff",
+            # Fixed prefixes, whatever diff.noprefix or diff.mnemonicPrefix say
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+            rev_range,
+        ],
+        cwd=repo_dir,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise ValueError(f"git diff failed: {completed.stderr.strip()}")
+    return completed.stdout
+
+
+def repository_root(repo_dir: str = ".") -> str:
+    """
+    Find the top-level directory of the work tree containing a directory.
+
+    Args:
+        repo_dir: Any directory inside the work tree
+
+    Returns:
+        Absolute path of the work tree root (git diff paths are relative to it)
+
+    Raises:
+        ValueError: If the directory is not inside a git work tree
+    """
+    completed = subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"],
+        cwd=repo_dir,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise ValueError(f"git rev-parse failed: {completed.stderr.strip()}")
+    return completed.stdout.strip()
+
+
+def parse_unified_diff(diff_text: str) -> List[DiffHunk]:
+    """
+    Parse a unified diff into hunks.
+
+    File headers ("--- " followed by "+++ ") are only recognized between
+    hunks: the line counts of the hunk header tell where a hunk ends, so an
+    added line "++ x" (shown as "+++ x") is not taken for a header.
+
+    Args:
+        diff_text: Output of `git diff` (with "b/" destination prefixes)
+
+    Returns:
+        List of hunks (deleted and binary files are skipped)
+    """
+    hunks = []
+    path = None
+    current = None
+    old_remaining = new_remaining = 0
+    previous = ""
+
+    for line in diff_text.split("\n"):
+        if old_remaining > 0 or new_remaining > 0:
+            # Inside a hunk: every line is content
+            if line.startswith("+"):
+                new_remaining -= 1
+                if current is not None:
+                    current.added.append(line[1:])
+            elif line.startswith("-"):
+                old_remaining -= 1
+                if current is not None:
+                    current.removed.append(line[1:])
+            elif line.startswith(" "):
+                old_remaining -= 1
+                new_remaining -= 1
+            elif not line.startswith("\\"):
+                # Truncated hunk: resynchronize on the next header
+                old_remaining = new_remaining = 0
+        elif line.startswith("diff --git "):
+            path = None
+        elif line.startswith("+++ ") and previous.startswith("--- "):
+            target = line[4:].strip()
+            path = None if target == "/dev/null" else re.sub(r"^b/", "", target)
+        elif line.startswith("@@"):
+            match = HUNK_HEADER.match(line)
+            if not match:
+                continue
+            old_remaining = int(match.group(2)) if match.group(2) is not None else 1
+            length = int(match.group(4)) if match.group(4) is not None else 1
+            new_remaining = length
+            current = None
+            if path:
+                start = int(match.group(3))
+                # Pure deletions report the line before the removed block
+                if length == 0:
+                    start += 1
+                current = DiffHunk(path=path, start=max(start, 1), length=length)
+                hunks.append(current)
+        previous = line
+
+    return hunks
+
+
+def diff_hunks(path: str, old: str, new: str) -> List[DiffHunk]:
+    """
+    Compute the hunks between two versions of a file.
+
+    Hunks have the same shape as those of parse_unified_diff with zero context
+    lines: a pure deletion has length 0 and starts at the line before it.
+
+    Args:
+        path: Path of the file (copied into the hunks)
+        old: Previous content ("" for a new file)
+        new: Current content
+
+    Returns:
+        List of hunks in file order
+    """
+    # A trailing newline ends the last line rather than starting another
+    old_lines = old.split("\n")[:-1] if old.endswith("\n") else old.split("\n")
+    new_lines = new.split("\n")[:-1] if new.endswith("\n") else new.split("\n")
+    if not old:
+        old_lines = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+
+    hunks = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        hunks.append(
+            DiffHunk(
+                path=path,
+                start=j1 + 1 if j2 > j1 else j1,
+                length=j2 - j1,
+                added=new_lines[j1:j2],
+                removed=old_lines[i1:i2],
+            )
+        )
+    return hunks
+
+
+def load_new_source(path: str, rev_range: str, repo_dir: str = ".") -> str:
+    """
+    Read the post-change version of a file.
+
+    Args:
+        path: Path relative to the repository root
+        rev_range: Revision range that was diffed
+        repo_dir: Repository root (see repository_root)
+
+    Returns:
+        File content on the right-hand side of the range (working tree if the
+        range names a single revision)
+    """
+    if ".." in rev_range:
+        right = rev_range.split("..")[-1].lstrip(".") or "HEAD"
+        completed = subprocess.run(
+            ["git", "show", f"{right}:{path}"],
+            cwd=repo_dir,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise ValueError(f"git show failed: {completed.stderr.strip()}")
+        return completed.stdout
+
+    with open(os.path.join(repo_dir, path), "r") as f:
+        return f.read()
+
+
+def enclosing_range(
+    source: str, language: str, start: int, end: int
+) -> Tuple[int, int]:
+    """
+    Find the line range to send for a changed region.
+
+    For Python the innermost enclosing function (or method) is used if it is not
+    too long; otherwise a window of CONTEXT_LINES around the change.
+
+    Args:
+        source: Full file content
+        language: Language of the file
+        start: First changed line
+        end: Last changed line
+
+    Returns:
+        Tuple of (first line, last line), 1-based and inclusive
+    """
+    total_lines = max(len(source.split("\n")), 1)
+    window = (max(start - CONTEXT_LINES, 1), min(end + CONTEXT_LINES, total_lines))
+
+    if language != "Python":
+        return window
+
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return window
+
+    best = None
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        node_start = min(
+            [node.lineno] + [decorator.lineno for decorator in node.decorator_list]
+        )
+        node_end = getattr(node, "end_lineno", None) or node.lineno
+        if node_start <= start and end <= node_end:
+            if best is None or node_end - node_start < best[1] - best[0]:
+                best = (node_start, node_end)
+
+    if best and best[1] - best[0] < MAX_ENCLOSING_LINES:
+        return best
+    return window
+
+
+def build_regions(hunks: List[DiffHunk], sources: Dict[str, str]) -> List[ReviewRegion]:
+    """
+    Widen hunks to their review regions, merging hunks that overlap.
+
+    Args:
+        hunks: Parsed diff hunks
+        sources: Post-change file contents by path
+
+    Returns:
+        Review regions ordered by file and line
+    """
+    regions: List[ReviewRegion] = []
+
+    for hunk in sorted(hunks, key=lambda h: (h.path, h.start)):
+        source = sources.get(hunk.path)
+        if source is None:
+            continue
+
+        language = language_for_path(hunk.path)
+        start, end = enclosing_range(source, language, hunk.start, hunk.end)
+
+        previous = regions[-1] if regions else None
+        if previous and previous.path == hunk.path and start <= previous.end + 1:
+            previous.start = min(previous.start, start)
+            previous.end = max(previous.end, end)
+            previous.hunks.append(hunk)
+        else:
+            regions.append(
+                ReviewRegion(
+                    path=hunk.path, start=start, end=end, source="", hunks=[hunk]
+                )
+            )
+
+    for region in regions:
+        lines = sources[region.path].split("\n")
+        region.source = "\n".join(lines[region.start - 1 : region.end])
+
+    return regions
+
+
+def language_for_path(path: str) -> str:
+    """Guess the language of a file from its extension."""
+    return LANGUAGE_BY_EXTENSION.get(os.path.splitext(path)[1].lower(), "Unknown")
+
+
+class DiffReviewer:
+    """Review only the changed regions of a git diff."""
+
+    def __init__(self, orchestrator: Any, max_workers: int = 4, repo_dir: str = "."):
+        """
+        Initialize the diff reviewer.
+
+        Args:
+            orchestrator: SimpleMultiAgentOrchestrator used to run reviews
+            max_workers: Maximum number of concurrent region reviews
+            repo_dir: Repository directory
+        """
+        self.orchestrator = orchestrator
+        self.max_workers = max_workers
+        self.repo_dir = repo_dir
+        # Changed files of the last collect_regions that could not be read
+        self.skipped_files: Dict[str, str] = {}
+
+    def collect_regions(self, rev_range: str) -> List[ReviewRegion]:
+        """
+        Extract the review regions for a revision range.
+
+        Args:
+            rev_range: Revision or range to diff
+
+        Returns:
+            Review regions (files that cannot be read are left out and listed
+            in skipped_files with the reason)
+
+        Raises:
+            ValueError: If repo_dir is not in a git work tree or git diff fails
+        """
+        root = repository_root(self.repo_dir)
+        hunks = parse_unified_diff(read_git_diff(rev_range, root))
+
+        sources = {}
+        self.skipped_files = {}
+        for path in sorted({hunk.path for hunk in hunks}):
+            try:
+                sources[path] = load_new_source(path, rev_range, root)
+            except (OSError, UnicodeDecodeError, ValueError) as e:
+                self.skipped_files[path] = str(e)
+
+        return build_regions(hunks, sources)
+
+    def review(
+        self,
+        rev_range: str,
+        on_result: Optional[Callable[[ReviewRegion, TaskResult], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> List[Tuple[ReviewRegion, TaskResult]]:
+        """
+        Review the changes in a revision range.
+
+        Regions are reviewed concurrently; line references in each review are
+        rewritten from region-relative to file line numbers.
+
+        Args:
+            rev_range: Revision or range to diff
+            on_result: Optional callback receiving (region, result) as soon as
+                each region's review completes
+            cancel_token: Optional token cancelling the remaining reviews
+
+        Returns:
+            List of (region, task result) pairs
+        """
+        return self.review_regions(
+            self.collect_regions(rev_range), on_result, cancel_token
+        )
+
+    def review_regions(
+        self,
+        regions: List[ReviewRegion],
+        on_result: Optional[Callable[[ReviewRegion, TaskResult], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> List[Tuple[ReviewRegion, TaskResult]]:
+        """
+        Review prepared regions concurrently.
+
+        Args:
+            regions: Regions to review (e.g. from build_regions)
+            on_result: Optional callback receiving (region, result) as soon as
+                each region's review completes
+            cancel_token: Optional token cancelling the remaining reviews
+
+        Returns:
+            List of (region, task result) pairs
+        """
+        tasks = [
+            {
+                "task_type": TaskType.CODE_REVIEW,
+                "input_data": region.source,
+                "context": self._region_context(region),
+            }
+            for region in regions
+        ]
+
+        def finish(index: int, result: TaskResult) -> None:
+            region = regions[index]
+            if result.success and "review" in result.output:
+                output = dict(result.output)
+                output["review"] = self._to_file_lines(output["review"], region)
+                if "sections" in output:
+                    output["sections"] = {
+                        name: self._to_file_lines(text, region)
+                        for name, text in output["sections"].items()
+                    }
+                output["location"] = region.location
+                result.output = output
+            if on_result:
+                on_result(region, result)
+
+        results = self.orchestrator.execute_batch(
+            tasks,
+            max_workers=self.max_workers,
+            on_result=finish,
+            cancel_token=cancel_token,
+        )
+        return list(zip(regions, results))
+
+    def _region_context(self, region: ReviewRegion) -> Dict[str, Any]:
+        """Describe the change inside a region for the reviewer."""
+        changed = []
+        removed = []
+        for hunk in region.hunks:
+            relative_start = hunk.start - region.start + 1
+            if hunk.length:
+                changed.append(f"{relative_start}-{relative_start + hunk.length - 1}")
+            removed.extend(hunk.removed)
+
+        context = {
+            "language": language_for_path(region.path),
+            "file": region.path,
+            "mode": "diff review: focus on the changed lines, the rest is context",
+            "changed_lines": ", ".join(changed) or "none (deletion only)",
+        }
+        if removed:
+            context["removed_lines"] = "\n".join(removed)
+        return context
+
+    @staticmethod
+    def _to_file_lines(review: str, region: ReviewRegion) -> str:
+        """Shift region-relative line references to file line numbers."""
+        offset = region.start - 1
+
+        def replace(match: re.Match) -> str:
+            keyword, start, separator, end = match.groups()
+            mapped = f"{keyword}{int(start) + offset}"
+            if end:
+                mapped += f"{separator}{int(end) + offset}"
+            return mapped
+
+        return LINE_REFERENCE.sub(replace, review)
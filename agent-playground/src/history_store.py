@@ -0,0 +1,300 @@
+"""
+Compact binary format for task history.
+
+A history file starts with a magic number and a format version, followed by
+length-prefixed records. Each record carries a flags byte marking whether its
+payload is zlib-compressed. A payload stores the TaskResult fields at fixed
+positions (slots) rather than as a keyed document: a fixed-size block with the
+execution time and a presence bitmap, then each string field as a length and
+its UTF-8 bytes. Only ``output``, which is free-form, is encoded as compact JSON,
+or, since version 2, as the digest of its blob when it lives in a BlobStore.
+
+Records can be appended to an existing file, and a truncated last record (e.g.
+from a crash during a write) is ignored when reading.
+"""
+
+import json
+import os
+import struct
+import zlib
+from typing import IO, Any, Dict, Iterable, Iterator, Optional
+
+from .blob_store import BlobOutput, BlobStore
+
+MAGIC = b"MAHS"
+FORMAT_VERSION = 2
+
+# Record flags
+FLAG_COMPRESSED = 0x01
+
+# Payloads smaller than this are never compressed
+COMPRESS_THRESHOLD = 512
+
+_HEADER = struct.Struct(">4sH")  # magic, format version
+_RECORD = struct.Struct(">IB")  # payload length, flags
+_FIXED = struct.Struct(">dB")  # execution_time, presence bits
+_LENGTH = struct.Struct(">I")
+
+# Presence bits of the fixed block
+_SUCCESS = 0x01
+_ERROR_MESSAGE = 0x02
+_CACHE_HIT = 0x04
+_DEGRADED = 0x08
+_OUTPUT_BLOB = 0x10  # the output slot holds a blob digest (version 2)
+
+# Shared codecs for the output slot (skips per-call argument handling)
+_OUTPUT_ENCODER = json.JSONEncoder(
+    separators=(",", ":"), ensure_ascii=False, default=str
+)
+_OUTPUT_DECODER = json.JSONDecoder()
+
+# Optional string slots following the required ones, with their presence bit
+_OPTIONAL_SLOTS = (
+    ("error_message", _ERROR_MESSAGE),
+    ("cache_hit", _CACHE_HIT),
+    ("degraded", _DEGRADED),
+)
+
+
+def encode_result(result: Any) -> bytes:
+    """
+    Encode a TaskResult as a record payload.
+
+    The output dict is serialized directly; nothing is copied first. Outputs
+    held in a blob store are written as a reference to their blob.
+
+    Args:
+        result: TaskResult to encode
+
+    Returns:
+        Payload bytes
+    """
+    bits = _SUCCESS if result.success else 0
+    if isinstance(result.output, BlobOutput):
+        bits |= _OUTPUT_BLOB
+        output = result.output.digest
+    else:
+        output = _OUTPUT_ENCODER.encode(result.output)
+    strings = [
+        result.agent_name.encode("utf-8"),
+        result.task_type.value.encode("utf-8"),
+        result.timestamp.isoformat().encode("utf-8"),
+        result.input_data.encode("utf-8"),
+        output.encode("utf-8"),
+    ]
+    for name, bit in _OPTIONAL_SLOTS:
+        value = getattr(result, name)
+        if value is not None:
+            bits |= bit
+            strings.append(value.encode("utf-8"))
+
+    parts = [_FIXED.pack(result.execution_time, bits)]
+    for data in strings:
+        parts.append(_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def decode_result(
+    payload: bytes, blob_store: Optional[BlobStore] = None
+) -> Dict[str, Any]:
+    """
+    Decode a record payload.
+
+    Args:
+        payload: Payload bytes (uncompressed)
+        blob_store: Blob store resolving outputs written as blob references
+
+    Returns:
+        Dictionary in the format of TaskResult.to_dict
+
+    Raises:
+        ValueError: If the payload is malformed, or references a blob and no
+            blob store was given
+    """
+    # Decode the strings from a view to avoid copying each slice first
+    view = memoryview(payload)
+    try:
+        execution_time, bits = _FIXED.unpack_from(view, 0)
+        offset = _FIXED.size
+        strings = []
+        count = 5 + sum(1 for _, bit in _OPTIONAL_SLOTS if bits & bit)
+        for _ in range(count):
+            (length,) = _LENGTH.unpack_from(view, offset)
+            offset += _LENGTH.size
+            strings.append(str(view[offset : offset + length], "utf-8"))
+            offset += length
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed history record: {e}") from e
+
+    if bits & _OUTPUT_BLOB:
+        if blob_store is None:
+            raise ValueError("History record references a blob; no blob store given")
+        output = BlobOutput(blob_store, strings[4])
+    else:
+        output = _OUTPUT_DECODER.decode(strings[4])
+
+    record = {
+        "agent_name": strings[0],
+        "task_type": strings[1],
+        "input_data": strings[3],
+        "output": output,
+        "timestamp": strings[2],
+        "execution_time": execution_time,
+        "success": bool(bits & _SUCCESS),
+    }
+    index = 5
+    for name, bit in _OPTIONAL_SLOTS:
+        if bits & bit:
+            record[name] = strings[index]
+            index += 1
+        else:
+            record[name] = None
+    return record
+
+
+def is_history_file(path: str) -> bool:
+    """
+    Check whether a file is in the binary history format.
+
+    Args:
+        path: File path
+
+    Returns:
+        True if the file starts with the history magic number
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class HistoryWriter:
+    """Appends TaskResult records to a binary history file."""
+
+    def __init__(
+        self,
+        path: str,
+        compress: bool = False,
+        append: bool = True,
+        compress_threshold: int = COMPRESS_THRESHOLD,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            path: History file path
+            compress: Whether to zlib-compress records (only those of at least
+                compress_threshold bytes, and only when that makes them smaller)
+            append: Append to an existing file instead of replacing it
+            compress_threshold: Minimum payload size worth compressing
+
+        Raises:
+            ValueError: If an existing file to append to is not a history file
+        """
+        self.path = path
+        self.compress = compress
+        self.compress_threshold = compress_threshold
+        self.count = 0
+
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                _read_header(f)
+            self._stream: IO[bytes] = open(path, "ab")
+        else:
+            self._stream = open(path, "wb")
+            self._stream.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+
+    def write(self, result: Any) -> None:
+        """
+        Append a task result.
+
+        Args:
+            result: TaskResult to write
+        """
+        payload = encode_result(result)
+        flags = 0
+        if self.compress and len(payload) >= self.compress_threshold:
+            compressed = zlib.compress(payload, 6)
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags |= FLAG_COMPRESSED
+
+        self._stream.write(_RECORD.pack(len(payload), flags))
+        self._stream.write(payload)
+        self.count += 1
+
+    def write_all(self, results: Iterable[Any]) -> int:
+        """
+        Append several task results.
+
+        Args:
+            results: TaskResults to write
+
+        Returns:
+            Number of records written
+        """
+        written = 0
+        for result in results:
+            self.write(result)
+            written += 1
+        return written
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if not self._stream.closed:
+            self._stream.close()
+
+    def __enter__(self) -> "HistoryWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def read_history(
+    path: str, blob_store: Optional[BlobStore] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Read the records of a binary history file.
+
+    Args:
+        path: History file path
+        blob_store: Blob store resolving outputs written as blob references
+
+    Yields:
+        Dictionaries in the format of TaskResult.to_dict
+
+    Raises:
+        ValueError: If the file is not a history file, has an unsupported
+            version or contains a malformed record
+    """
+    with open(path, "rb") as f:
+        _read_header(f)
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            length, flags = _RECORD.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                # Truncated by an interrupted write
+                return
+            if flags & FLAG_COMPRESSED:
+                try:
+                    payload = zlib.decompress(payload)
+                except zlib.error as e:
+                    raise ValueError(f"Malformed history record: {e}") from e
+            yield decode_result(payload, blob_store)
+
+
+def _read_header(stream: IO[bytes]) -> int:
+    """Validate the file header and return the format version."""
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size or header[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not a task history file")
+    _, version = _HEADER.unpack(header)
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported history format version: {version}")
+    return version
@@ -0,0 +1,190 @@
+"""
+Background jobs for interactive mode.
+
+Interactive commands run as numbered jobs so the prompt stays responsive. A job
+wraps the Future of its work and the CancellationToken passed to it; completion
+callbacks announce finished jobs while the user keeps typing.
+"""
+
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .agents.cancellation import CancellationToken
+
+
+@dataclass
+class Job:
+    """A command running in the background."""
+
+    id: int
+    command: str
+    future: Future
+    token: Optional[CancellationToken] = None
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    cancelled: bool = False
+
+    @property
+    def status(self) -> str:
+        """One of "running", "done", "failed" or "cancelled"."""
+        if self.cancelled or self.future.cancelled():
+            return "cancelled"
+        if not self.future.done():
+            return "running"
+        if self.future.exception() is not None:
+            return "failed"
+        return "done"
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds the job has been running (or ran)."""
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for the job's result.
+
+        Args:
+            timeout: Seconds to wait (None waits until the job finishes)
+
+        Returns:
+            Result of the job's work
+
+        Raises:
+            CancelledError: If the job was cancelled before it produced a
+                result (jobs with a token return their cancelled result)
+            TimeoutError: If the job did not finish in time
+        """
+        if self.future.cancelled() or (self.cancelled and self.token is None):
+            raise CancelledError()
+        return self.future.result(timeout)
+
+
+class JobManager:
+    """Numbered background jobs with completion notifications."""
+
+    def __init__(self, on_done: Optional[Callable[[Job], None]] = None):
+        """
+        Initialize the job manager.
+
+        Args:
+            on_done: Optional callback receiving each job when it finishes
+                (called from the thread that completed it; not called for
+                cancelled jobs)
+        """
+        self.on_done = on_done
+        self._jobs: Dict[int, Job] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        command: str,
+        future: Future,
+        token: Optional[CancellationToken] = None,
+    ) -> Job:
+        """
+        Track work that is already running (e.g. a scheduled task).
+
+        Args:
+            command: Command line shown in job listings
+            future: Future of the work
+            token: Cancellation token passed to the work, if any
+
+        Returns:
+            The new job
+        """
+        with self._lock:
+            job = Job(id=self._next_id, command=command, future=future, token=token)
+            self._jobs[job.id] = job
+            self._next_id += 1
+        future.add_done_callback(lambda _: self._finished(job))
+        return job
+
+    def start(
+        self,
+        command: str,
+        function: Callable[[], Any],
+        token: Optional[CancellationToken] = None,
+    ) -> Job:
+        """
+        Run a function on its own thread as a job.
+
+        Args:
+            command: Command line shown in job listings
+            function: Work to run
+            token: Cancellation token passed to the work, if any
+
+        Returns:
+            The new job
+        """
+        future: Future = Future()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(function())
+            except BaseException as e:
+                future.set_exception(e)
+
+        job = self.submit(command, future, token)
+        threading.Thread(target=run, name=f"job-{job.id}", daemon=True).start()
+        return job
+
+    def get(self, job_id: int) -> Job:
+        """
+        Look up a job.
+
+        Raises:
+            ValueError: If there is no job with that ID
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise ValueError(f"No job {job_id}")
+        return job
+
+    def jobs(self) -> List[Job]:
+        """All jobs in submission order."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def running(self) -> List[Job]:
+        """Jobs that have not finished yet."""
+        return [job for job in self.jobs() if job.status == "running"]
+
+    def cancel(self, job_id: int) -> Job:
+        """
+        Cancel a job.
+
+        A job that has not started yet is removed from the queue. Running work
+        is aborted through the job's token and its (partial) result is kept;
+        without a token, it is left to finish and its result is discarded.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            The cancelled job
+
+        Raises:
+            ValueError: If there is no job with that ID or it already finished
+        """
+        job = self.get(job_id)
+        if job.future.done():
+            raise ValueError(f"Job {job_id} already finished")
+        job.cancelled = True
+        if not job.future.cancel() and job.token:
+            job.token.cancel("Cancelled by user")
+        return job
+
+    def _finished(self, job: Job) -> None:
+        """Record completion and notify."""
+        job.finished_at = time.monotonic()
+        if self.on_done and not job.cancelled:
+            self.on_done(job)
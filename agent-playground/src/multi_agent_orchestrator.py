@@ -5,16 +5,36 @@ Compatible with LangChain 1.x.
 
 import json
 import os
-from dataclasses import asdict, dataclass
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import ExitStack
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from .agents.architecture_advisor import ArchitectureAdvisor
 from .agents.base_agent import BaseAgent
+from .agents.cancellation import CancellationToken, DeadlineExceeded, TaskCancelled
 from .agents.code_reviewer import CodeReviewer
 from .agents.documentation_agent import DocumentationAgent
 from .agents.test_writer import TestWriter
+from .blob_store import BlobStore, materialize
+from .concurrency import AdaptiveConcurrencyLimiter
+from .history_store import HistoryWriter, is_history_file, read_history
+from .profiling import TaskProfiler
+from .retrieval import RetrievalIndex
+from .scheduler import Priority, PriorityScheduler
+from .task_cache import TaskCache
+
+# Descriptions of TaskResult.degraded values
+DEGRADATION_LABELS = {
+    "reduced": "shortened (smaller max_tokens to meet the deadline)",
+    "partial": "partial output (cut off at the deadline)",
+    "skipped": "skipped (deadline exceeded before start)",
+    "cancelled": "cancelled (output generated until then is kept)",
+}
 
 
 class TaskType(Enum):
@@ -39,13 +59,45 @@ class TaskResult:
     execution_time: float
     success: bool
     error_message: Optional[str] = None
+    cache_hit: Optional[str] = None
+    degraded: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        result = asdict(self)
-        result["task_type"] = self.task_type.value
-        result["timestamp"] = self.timestamp.isoformat()
-        return result
+        """
+        Convert to dictionary for serialization.
+
+        Fields are copied by hand rather than with dataclasses.asdict, which
+        deep-copies the output dict; the returned dict shares it. Outputs held
+        in a blob store are loaded.
+        """
+        return {
+            "agent_name": self.agent_name,
+            "task_type": self.task_type.value,
+            "input_data": self.input_data,
+            "output": materialize(self.output),
+            "timestamp": self.timestamp.isoformat(),
+            "execution_time": self.execution_time,
+            "success": self.success,
+            "error_message": self.error_message,
+            "cache_hit": self.cache_hit,
+            "degraded": self.degraded,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskResult":
+        """Create a TaskResult from a dictionary produced by to_dict."""
+        return cls(
+            agent_name=data["agent_name"],
+            task_type=TaskType(data["task_type"]),
+            input_data=data["input_data"],
+            output=data["output"],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            execution_time=data["execution_time"],
+            success=data["success"],
+            error_message=data.get("error_message"),
+            cache_hit=data.get("cache_hit"),
+            degraded=data.get("degraded"),
+        )
 
 
 class SimpleMultiAgentOrchestrator:
@@ -64,6 +116,16 @@ class SimpleMultiAgentOrchestrator:
         self.verbose = verbose
         self.agents: Dict[str, BaseAgent] = {}
         self.task_history: List[TaskResult] = []
+        self.result_listeners: List[Callable[[TaskResult], None]] = []
+        self.blob_store = BlobStore.from_env()
+        self.task_cache = TaskCache.from_env()
+        if self.task_cache:
+            self.task_cache.blob_store = self.blob_store
+        self.concurrency = AdaptiveConcurrencyLimiter.from_env()
+        self.profiler = TaskProfiler.from_env()
+        self.retrieval = RetrievalIndex.from_env()
+        self.scheduler: Optional[PriorityScheduler] = None
+        self._scheduler_lock = threading.Lock()
         self._initialize_agents()
 
         if self.verbose:
@@ -99,12 +161,34 @@ class SimpleMultiAgentOrchestrator:
             )
         return self.agents[agent_name]
 
+    def add_result_listener(self, listener: Callable[[TaskResult], None]) -> None:
+        """
+        Register a callback invoked with every task result as soon as it completes.
+
+        Args:
+            listener: Callable receiving the TaskResult (successful or failed)
+        """
+        self.result_listeners.append(listener)
+
+    def _record_result(self, result: TaskResult) -> None:
+        """Add a result to the history and notify result listeners."""
+        if self.blob_store:
+            # Keep only a reference to the output in the history
+            result.output = self.blob_store.wrap(result.output)
+        self.task_history.append(result)
+        for listener in self.result_listeners:
+            listener(result)
+
     def execute_task(
         self,
         task_type: Union[TaskType, str],
         input_data: str,
         context: Optional[Dict[str, Any]] = None,
         agent_name: Optional[str] = None,
+        verbose: Optional[bool] = None,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> TaskResult:
         """
         Execute a task using the appropriate agent.
@@ -114,6 +198,15 @@ class SimpleMultiAgentOrchestrator:
             input_data: Input data for the task (e.g., code to review)
             context: Optional context information
             agent_name: Specific agent to use (if None, auto-selects based on task)
+            verbose: Override the orchestrator's verbosity for this task
+            on_section: Optional callback receiving (section name, text) as soon
+                as each section of the agent's streamed response is complete
+            deadline_at: Optional time.monotonic() value by which the task must
+                finish; tasks starting after it are skipped and late responses
+                are shortened or truncated (see TaskResult.degraded)
+            cancel_token: Optional token; cancelling it aborts the agent's
+                request and the task fails as "cancelled", keeping any partial
+                output (degraded results are never cached)
 
         Returns:
             TaskResult with execution details
@@ -127,6 +220,9 @@ class SimpleMultiAgentOrchestrator:
                     f"Invalid task type: {task_type}. Valid types: {[t.value for t in TaskType]}"
                 )
 
+        if verbose is None:
+            verbose = self.verbose
+
         start_time = datetime.now()
 
         try:
@@ -136,12 +232,63 @@ class SimpleMultiAgentOrchestrator:
             else:
                 agent = self._select_agent_for_task(task_type)
 
-            if self.verbose:
-                print(f"🤖 Executing task with {agent.name}...")
+            # Serve from cache when an equivalent input was already processed
+            # (keyed on the caller's context, not on retrieved definitions)
+            cached = (
+                self.task_cache.get(
+                    task_type.value, input_data, context, agent.cache_scope()
+                )
+                if self.task_cache
+                else None
+            )
+
+            if cached:
+                output, cache_hit = cached
+                if verbose:
+                    print(f"♻️  Using cached {cache_hit} result for {agent.name}...")
+                if on_section:
+                    for name, text in output.get("sections", {}).items():
+                        on_section(name, text)
+            else:
+                cache_hit = None
+                if deadline_at is not None and time.monotonic() >= deadline_at:
+                    raise DeadlineExceeded("Skipped: deadline exceeded before start")
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                if verbose:
+                    print(f"🤖 Executing task with {agent.name}...")
+
+                # Add definitions from the rest of the repository the input refers to
+                agent_context = (
+                    self.retrieval.enrich(input_data, context)
+                    if self.retrieval
+                    else context
+                )
+
+                # Execute task (within the adaptive concurrency limit)
+                with ExitStack() as stack:
+                    if self.concurrency:
+                        stack.enter_context(self.concurrency.slot())
+                    if self.profiler:
+                        stack.enter_context(self.profiler.profile(agent.name))
+                    output = agent.process(
+                        input_data, agent_context, on_section, deadline_at, cancel_token
+                    )
+                    if self.blob_store:
+                        # Stored once, shared by the cache and the history
+                        output = self.blob_store.wrap(output)
+                    # Shortened, partial and cancelled outputs are not reusable
+                    if self.task_cache and not output.get("degraded"):
+                        self.task_cache.put(
+                            task_type.value,
+                            input_data,
+                            output,
+                            context,
+                            agent.cache_scope(),
+                        )
 
-            # Execute task
-            output = agent.process(input_data, context)
             execution_time = (datetime.now() - start_time).total_seconds()
+            cancelled = output.get("degraded") == "cancelled"
 
             # Create result
             result = TaskResult(
@@ -153,19 +300,32 @@ class SimpleMultiAgentOrchestrator:
                 output=output,
                 timestamp=datetime.now(),
                 execution_time=execution_time,
-                success=True,
+                success=not cancelled,
+                error_message=cancel_token.reason if cancelled else None,
+                cache_hit=cache_hit,
+                degraded=output.get("degraded"),
             )
 
             # Add to history
-            self.task_history.append(result)
+            self._record_result(result)
 
-            if self.verbose:
-                self._print_task_result(result)
+            if verbose:
+                if cancelled:
+                    print(f"🛑 Task cancelled after {execution_time:.2f}s")
+                else:
+                    self._print_task_result(result)
 
             return result
 
         except Exception as e:
             execution_time = (datetime.now() - start_time).total_seconds()
+            if isinstance(e, TaskCancelled):
+                degraded = "cancelled"
+            elif isinstance(e, DeadlineExceeded):
+                # Never started; other errors after the deadline stay failures
+                degraded = "skipped"
+            else:
+                degraded = None
             result = TaskResult(
                 agent_name=agent_name or "unknown",
                 task_type=task_type,
@@ -177,14 +337,128 @@ class SimpleMultiAgentOrchestrator:
                 execution_time=execution_time,
                 success=False,
                 error_message=str(e),
+                degraded=degraded,
             )
-            self.task_history.append(result)
+            self._record_result(result)
 
-            if self.verbose:
-                print(f"❌ Task failed: {e}")
+            if verbose:
+                if isinstance(e, TaskCancelled):
+                    print(f"🛑 Task cancelled")
+                else:
+                    print(f"❌ Task failed: {e}")
 
             return result
 
+    def submit_task(
+        self,
+        task_type: Union[TaskType, str],
+        input_data: str,
+        context: Optional[Dict[str, Any]] = None,
+        agent_name: Optional[str] = None,
+        priority: Priority = Priority.NORMAL,
+        verbose: Optional[bool] = False,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Future:
+        """
+        Queue a task on the shared priority scheduler.
+
+        Interactive tasks are served before normal and batch tasks and may use
+        concurrency reserved for them; long-waiting tasks are promoted.
+
+        Args:
+            task_type: Type of task to perform
+            input_data: Input data for the task
+            context: Optional context information
+            agent_name: Optional specific agent to use
+            priority: Priority class of the task
+            verbose: Verbosity for this task (None uses the orchestrator's)
+            deadline_at: Optional time.monotonic() deadline (see execute_task)
+            cancel_token: Optional cancellation token (see execute_task)
+
+        Returns:
+            Future resolving to the TaskResult
+        """
+        return self._get_scheduler().submit(
+            lambda: self.execute_task(
+                task_type,
+                input_data,
+                context,
+                agent_name,
+                verbose=verbose,
+                deadline_at=deadline_at,
+                cancel_token=cancel_token,
+            ),
+            priority,
+        )
+
+    def _get_scheduler(self) -> PriorityScheduler:
+        """Create the priority scheduler on first use."""
+        with self._scheduler_lock:
+            if self.scheduler is None:
+                self.scheduler = PriorityScheduler.from_env(limiter=self.concurrency)
+            return self.scheduler
+
+    def execute_batch(
+        self,
+        tasks: List[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        on_result: Optional[Callable[[int, TaskResult], None]] = None,
+        priority: Priority = Priority.BATCH,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> List[TaskResult]:
+        """
+        Execute several tasks concurrently.
+
+        Per-task output is not printed; callers report the returned results.
+        Tasks run on the shared priority scheduler, so interactive requests are
+        served ahead of them. When adaptive concurrency is enabled, the number
+        of requests actually in flight follows the limiter and max_workers only
+        caps it.
+
+        Args:
+            tasks: Task specifications with "task_type", "input_data" and
+                optional "context" / "agent_name" keys
+            max_workers: Maximum number of tasks running at the same time
+                (defaults to the limiter's upper bound, or 4)
+            on_result: Optional callback receiving (task index, result) as soon
+                as each task completes
+            priority: Priority class of the batch's tasks
+            cancel_token: Optional token; cancelling it aborts running tasks and
+                makes the remaining ones return cancelled results at once
+
+        Returns:
+            List of task results in the same order as the tasks
+        """
+        if max_workers is None:
+            max_workers = self.concurrency.max_limit if self.concurrency else 4
+
+        def run(index: int, task: Dict[str, Any]) -> TaskResult:
+            result = self.execute_task(
+                task["task_type"],
+                task["input_data"],
+                task.get("context"),
+                task.get("agent_name"),
+                verbose=False,
+                cancel_token=cancel_token,
+            )
+            if on_result:
+                on_result(index, result)
+            return result
+
+        # Keep at most max_workers tasks of this batch queued or running
+        scheduler = self._get_scheduler()
+        window = threading.Semaphore(max(1, max_workers))
+        futures = []
+        for index, task in enumerate(tasks):
+            window.acquire()
+            future = scheduler.submit(
+                lambda index=index, task=task: run(index, task), priority
+            )
+            future.add_done_callback(lambda _: window.release())
+            futures.append(future)
+        return [future.result() for future in futures]
+
     def _select_agent_for_task(self, task_type: TaskType) -> BaseAgent:
         """
         Select the appropriate agent for a given task type.
@@ -211,7 +485,12 @@ class SimpleMultiAgentOrchestrator:
             raise ValueError(f"No agent configured for task type: {task_type}")
 
     def execute_full_analysis(
-        self, code: str, context: Optional[Dict[str, Any]] = None
+        self,
+        code: str,
+        context: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+        verbose: Optional[bool] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> Dict[str, TaskResult]:
         """
         Execute a full analysis using all agents.
@@ -219,43 +498,197 @@ class SimpleMultiAgentOrchestrator:
         Args:
             code: Code to analyze
             context: Optional context information
+            deadline: Optional time budget in seconds; agents that start late get
+                a smaller max_tokens, responses still streaming when it expires
+                are returned partially, and agents that cannot start are skipped
+            verbose: Override the orchestrator's verbosity for this analysis
+            cancel_token: Optional token cancelling all of the analysis' tasks
 
         Returns:
             Dictionary of task results by agent name
         """
-        if self.verbose:
+        if verbose is None:
+            verbose = self.verbose
+
+        if verbose:
             print(f"🔍 Starting full analysis of code...")
             print(f"Code length: {len(code)} characters")
+            print(f"Pipeline: code review → tests, architecture advice → docs")
+
+        print_lock = threading.Lock()
+
+        def report(task_name: str, result: TaskResult) -> None:
+            if not verbose:
+                return
+            with print_lock:
+                print(f"\n▶️  {task_name.replace('_', ' ').title()}")
+                if result.success:
+                    self._print_task_result(result)
+                elif result.degraded == "skipped":
+                    print(f"⏭️  Skipped: deadline exceeded")
+                elif result.degraded == "cancelled":
+                    print(f"🛑 Cancelled")
+                else:
+                    print(f"❌ Task failed: {result.error_message}")
+
+        deadline_at = time.monotonic() + deadline if deadline is not None else None
+        run = self.execute_pipeline(
+            code,
+            context,
+            on_node_complete=report,
+            deadline_at=deadline_at,
+            cancel_token=cancel_token,
+        )
 
-        results = {}
+        if verbose:
+            self._print_full_analysis_summary(run.results, run)
 
-        # Execute code review (only real agent for now)
-        if self.verbose:
-            print(f"\n1. Running Code Review...")
-        results["code_review"] = self.execute_task(TaskType.CODE_REVIEW, code, context)
+        return run.results
+
+    def execute_pipeline(
+        self,
+        input_data: str,
+        context: Optional[Dict[str, Any]] = None,
+        nodes: Optional[List[Any]] = None,
+        on_node_complete: Optional[Callable[[str, TaskResult], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Any:
+        """
+        Execute a dependency-aware pipeline of agent tasks.
 
-        # Execute other analyses (dummy agents)
-        tasks = [
-            ("test_generation", "2. Generating Tests..."),
-            ("documentation", "3. Creating Documentation..."),
-            ("architecture_advice", "4. Providing Architecture Advice..."),
-        ]
+        Each node starts as soon as the nodes it depends on have completed,
+        and independent nodes run in parallel.
 
-        for task_name, message in tasks:
-            if self.verbose:
-                print(f"\n{message}")
-            results[task_name] = self.execute_task(TaskType(task_name), code, context)
+        Args:
+            input_data: Input shared by all nodes
+            context: Optional context shared by all nodes
+            nodes: PipelineNode list (defaults to the full analysis pipeline)
+            on_node_complete: Optional callback receiving (node name, result)
+            deadline_at: Optional time.monotonic() deadline for all nodes
+            cancel_token: Optional cancellation token for all nodes
+
+        Returns:
+            PipelineRun with results, per-node timings and the critical path
+        """
+        from .pipeline import AgentPipeline, full_analysis_nodes
+
+        pipeline = AgentPipeline(self, nodes or full_analysis_nodes())
+        return pipeline.run(
+            input_data,
+            context,
+            on_node_complete=on_node_complete,
+            deadline_at=deadline_at,
+            cancel_token=cancel_token,
+        )
+
+    def execute_repository_analysis(
+        self,
+        root: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> TaskResult:
+        """
+        Get architecture advice for a whole repository.
+
+        Files are summarized in parallel and reduced into package and repository
+        summaries; summaries are cached by content hash across runs.
+
+        Args:
+            root: Repository root directory
+            context: Optional context information
+            on_section: Optional callback receiving advice sections
+            deadline_at: Optional time.monotonic() deadline for the summaries and
+                the advice request
+            cancel_token: Optional token aborting the requests
 
+        Returns:
+            TaskResult with the advice and the repository summary
+        """
+        agent = self.get_agent("architecture_advisor")
         if self.verbose:
-            self._print_full_analysis_summary(results)
+            print(f"🗂️  Summarizing repository {root}...")
 
-        return results
+        start_time = datetime.now()
+        try:
+            with ExitStack() as stack:
+                if self.profiler:
+                    stack.enter_context(self.profiler.profile(agent.name))
+                output = agent.process_repository(
+                    root,
+                    context,
+                    on_section,
+                    deadline_at,
+                    cancel_token,
+                    limiter=self.concurrency,
+                )
+            cancelled = output.get("degraded") == "cancelled"
+            result = TaskResult(
+                agent_name=agent.name,
+                task_type=TaskType.ARCHITECTURE_ADVICE,
+                input_data=root,
+                output=output,
+                timestamp=datetime.now(),
+                execution_time=(datetime.now() - start_time).total_seconds(),
+                success=not cancelled,
+                error_message=cancel_token.reason if cancelled else None,
+                degraded=output.get("degraded"),
+            )
+        except Exception as e:
+            if isinstance(e, TaskCancelled):
+                degraded = "cancelled"
+            elif isinstance(e, DeadlineExceeded):
+                # Never started; other errors after the deadline stay failures
+                degraded = "skipped"
+            else:
+                degraded = None
+            result = TaskResult(
+                agent_name=agent.name,
+                task_type=TaskType.ARCHITECTURE_ADVICE,
+                input_data=root,
+                output={},
+                timestamp=datetime.now(),
+                execution_time=(datetime.now() - start_time).total_seconds(),
+                success=False,
+                error_message=str(e),
+                degraded=degraded,
+            )
+        self._record_result(result)
+
+        if self.verbose:
+            if result.success:
+                stats = result.output["repository"]["stats"]
+                print(
+                    f"📚 {stats['files']} files: {stats['summarized']} summaries "
+                    f"generated, {stats['cached']} reused from cache"
+                )
+                self._print_task_result(result)
+            else:
+                print(f"❌ Task failed: {result.error_message}")
+
+        return result
 
     def _print_task_result(self, result: TaskResult) -> None:
         """Print the result of a task."""
         print(f"\n✅ Task completed successfully!")
         print(f"Agent: {result.agent_name}")
         print(f"Execution Time: {result.execution_time:.2f}s")
+        if result.cache_hit:
+            print(f"Cache: {result.cache_hit} hit")
+        if result.output.get("local"):
+            print(f"⚡ Answered locally (static analysis, no LLM call)")
+        if result.degraded:
+            label = DEGRADATION_LABELS.get(result.degraded, result.degraded)
+            print(f"⚠️  Degraded: {label}")
+
+        compaction = result.output.get("compaction")
+        if compaction:
+            print(
+                f"Input Compaction: saved {compaction['bytes_saved']} bytes "
+                f"(~{compaction['tokens_saved']} tokens)"
+            )
 
         # Format and print agent output
         if hasattr(
@@ -269,7 +702,9 @@ class SimpleMultiAgentOrchestrator:
                 # If formatting fails, just print the raw output
                 print(f"\nOutput: {result.output}")
 
-    def _print_full_analysis_summary(self, results: Dict[str, TaskResult]) -> None:
+    def _print_full_analysis_summary(
+        self, results: Dict[str, TaskResult], run: Optional[Any] = None
+    ) -> None:
         """Print a summary of full analysis results."""
         print(f"\n🎉 Full Analysis Complete!")
         print(f"=" * 60)
@@ -282,13 +717,27 @@ class SimpleMultiAgentOrchestrator:
         print(f"  Tasks Completed: {successful_tasks}/{total_tasks}")
         print(f"  Total Execution Time: {total_time:.2f}s")
         print(f"  Average Time per Task: {total_time / total_tasks:.2f}s")
+        degraded_tasks = sum(1 for r in results.values() if r.degraded)
+        if degraded_tasks:
+            print(f"  Degraded Sections: {degraded_tasks}/{total_tasks}")
+        if run:
+            print(f"  Wall Time: {run.wall_time:.2f}s")
+            print(
+                f"  Critical Path: {' → '.join(run.critical_path)} "
+                f"({run.critical_path_time:.2f}s)"
+            )
 
         print(f"\nDetailed Results:")
         for task_name, result in results.items():
             status = "✅" if result.success else "❌"
-            print(
-                f"  {status} {task_name.replace('_', ' ').title()}: {result.execution_time:.2f}s"
-            )
+            line = f"  {status} {task_name.replace('_', ' ').title()}: {result.execution_time:.2f}s"
+            if run and task_name in run.timings:
+                timing = run.timings[task_name]
+                line += f" (start {timing['start']:.2f}s, end {timing['end']:.2f}s)"
+            if result.degraded:
+                status = DEGRADATION_LABELS.get(result.degraded, result.degraded)
+                line += f" ⚠️  degraded: {status}"
+            print(line)
 
         # Check if we have real results from code review
         if results.get("code_review") and results["code_review"].success:
@@ -320,46 +769,49 @@ class SimpleMultiAgentOrchestrator:
         if self.verbose:
             print(f"🗑️  Task history cleared")
 
-    def save_history(self, filepath: str) -> None:
+    def save_history(
+        self, filepath: str, binary: Optional[bool] = None, compress: bool = False
+    ) -> None:
         """
-        Save task history to a JSON file.
+        Save task history to a JSON or binary history file.
 
         Args:
             filepath: Path to save the history file
+            binary: Use the compact binary format (defaults to True for paths
+                ending in ".hist")
+            compress: zlib-compress large records (binary format only)
         """
-        history_data = [result.to_dict() for result in self.task_history]
+        if binary is None:
+            binary = filepath.endswith(".hist")
+
+        if binary:
+            with HistoryWriter(filepath, compress=compress, append=False) as writer:
+                writer.write_all(self.task_history)
+        else:
+            history_data = [result.to_dict() for result in self.task_history]
 
-        with open(filepath, "w") as f:
-            json.dump(history_data, f, indent=2)
+            with open(filepath, "w") as f:
+                json.dump(history_data, f, indent=2)
 
         if self.verbose:
             print(f"💾 History saved to {filepath}")
 
     def load_history(self, filepath: str) -> None:
         """
-        Load task history from a JSON file.
+        Load task history from a JSON or binary history file.
 
         Args:
             filepath: Path to load the history file from
         """
         try:
-            with open(filepath, "r") as f:
-                history_data = json.load(f)
+            if is_history_file(filepath):
+                history_data = read_history(filepath, self.blob_store)
+            else:
+                with open(filepath, "r") as f:
+                    history_data = json.load(f)
 
             # Convert back to TaskResult objects
-            self.task_history = []
-            for item in history_data:
-                result = TaskResult(
-                    agent_name=item["agent_name"],
-                    task_type=TaskType(item["task_type"]),
-                    input_data=item["input_data"],
-                    output=item["output"],
-                    timestamp=datetime.fromisoformat(item["timestamp"]),
-                    execution_time=item["execution_time"],
-                    success=item["success"],
-                    error_message=item.get("error_message"),
-                )
-                self.task_history.append(result)
+            self.task_history = [TaskResult.from_dict(item) for item in history_data]
 
             if self.verbose:
                 print(f"📂 History loaded from {filepath}")
@@ -379,7 +831,7 @@ class SimpleMultiAgentOrchestrator:
         Returns:
             Dictionary with system status information
         """
-        return {
+        status = {
             "total_agents": len(self.agents),
             "agents_available": list(self.agents.keys()),
             "total_tasks_executed": len(self.task_history),
@@ -398,6 +850,50 @@ class SimpleMultiAgentOrchestrator:
             ),
         }
 
+        if self.task_cache:
+            status["cache"] = self.task_cache.get_stats()
+
+        if self.concurrency:
+            status["concurrency"] = self.concurrency.get_stats()
+
+        if self.scheduler:
+            status["scheduler"] = self.scheduler.get_stats()
+
+        if self.profiler:
+            status["profiling"] = self.profiler.get_stats()
+
+        token_budgets = {
+            name: agent.get_token_stats()
+            for name, agent in self.agents.items()
+            if agent.token_stats["requests"]
+        }
+        if token_budgets:
+            status["token_budgets"] = token_budgets
+
+        micro_batching = {
+            name: agent.batcher.get_stats()
+            for name, agent in self.agents.items()
+            if agent.batcher
+        }
+        if micro_batching:
+            status["micro_batching"] = micro_batching
+
+        if self.retrieval:
+            status["retrieval"] = self.retrieval.get_stats()
+
+        verifier = self.agents["test_writer"].verifier
+        if verifier:
+            status["test_verification"] = verifier.get_stats()
+
+        doc_index = self.agents["documentation_agent"].doc_index
+        if doc_index:
+            status["doc_index"] = doc_index.get_stats()
+
+        if self.blob_store:
+            status["blob_store"] = self.blob_store.get_stats()
+
+        return status
+
     def print_system_status(self) -> None:
         """Print the current system status."""
         status = self.get_system_status()
@@ -417,6 +913,108 @@ class SimpleMultiAgentOrchestrator:
         )
         print(f"  Avg. Execution Time: {status['average_execution_time']:.2f}s")
 
+        if status.get("concurrency"):
+            concurrency = status["concurrency"]
+            print(f"\nConcurrency:")
+            print(
+                f"  Limit: {concurrency['limit']} "
+                f"(range {concurrency['min_limit']}-{concurrency['max_limit']})"
+            )
+            print(f"  In Flight: {concurrency['in_flight']}")
+            print(f"  Backoffs: {concurrency['total_backoffs']}")
+            for event in concurrency["recent_backoffs"][-3:]:
+                print(f"    • {event['reason']}: {event['from']} → {event['to']}")
+
+        if status.get("token_budgets"):
+            print(f"\nOutput Tokens (requested → used):")
+            for name, stats in status["token_budgets"].items():
+                print(
+                    f"  • {name}: {stats['requested']} → {stats['used']} "
+                    f"({stats['utilization']:.0%} used, "
+                    f"{stats['truncated']}/{stats['requests']} hit the limit)"
+                )
+
+        if status.get("micro_batching"):
+            print(f"\nMicro-Batching:")
+            for name, stats in status["micro_batching"].items():
+                print(
+                    f"  • {name}: {stats['requests']} requests in {stats['batches']} "
+                    f"batches (avg occupancy {stats['avg_occupancy']:.1f}"
+                    f"/{stats['max_batch_size']})"
+                )
+
+        if status.get("retrieval"):
+            retrieval = status["retrieval"]
+            print(f"\nRetrieval Index ({retrieval['root']}):")
+            print(
+                f"  {retrieval['definitions']} definitions in {retrieval['files']} "
+                f"files, {retrieval['terms']} terms"
+            )
+            print(
+                f"  Queries: {retrieval['queries']} "
+                f"(avg {retrieval['avg_query_ms']:.2f} ms), "
+                f"last update {retrieval['last_update_time'] * 1000:.0f} ms"
+            )
+
+        if status.get("test_verification"):
+            verification = status["test_verification"]
+            print(f"\nTest Verification:")
+            print(
+                f"  Jobs: {verification['jobs']} ({verification['passed']} passed, "
+                f"{verification['failed']} failed, {verification['skipped']} skipped, "
+                f"{verification['errors']} errors)"
+            )
+            print(
+                f"  Workers: {verification['workers']}, "
+                f"avg {verification['avg_time']:.2f}s per job"
+            )
+
+        if status.get("doc_index"):
+            doc_index = status["doc_index"]
+            print(f"\nDocumentation Index:")
+            print(
+                f"  {doc_index['entries']} sections, "
+                f"{doc_index['hits']}/{doc_index['lookups']} reused "
+                f"({doc_index['hit_rate']:.0%}), {doc_index['stored']} regenerated"
+            )
+
+        if status.get("blob_store"):
+            blob_store = status["blob_store"]
+            print(f"\nBlob Store ({blob_store['root']}):")
+            print(
+                f"  {blob_store['writes']} blobs written, "
+                f"{blob_store['duplicates']} duplicates, "
+                f"{blob_store['compression_ratio']:.1f}x compression"
+            )
+            print(
+                f"  Reads: {blob_store['reads']} "
+                f"({blob_store['cache_hits']} from memory, "
+                f"{blob_store['cached']} outputs cached)"
+            )
+
+        if status.get("scheduler"):
+            scheduler = status["scheduler"]
+            print(f"\nScheduler:")
+            print(
+                f"  Capacity: {scheduler['capacity']} "
+                f"({scheduler['reserved_interactive']} reserved for interactive)"
+            )
+            for name, stats in scheduler["classes"].items():
+                if not stats["submitted"]:
+                    continue
+                print(
+                    f"  • {name}: {stats['queued']} queued, {stats['running']} running, "
+                    f"wait p50 {stats['p50_wait']:.2f}s / p95 {stats['p95_wait']:.2f}s"
+                )
+
+        if status.get("cache"):
+            cache = status["cache"]
+            print(f"\nCache ({cache['policy']}):")
+            print(f"  Entries: {cache['entries']}")
+            print(f"  Exact Hits: {cache['exact_hits']}")
+            print(f"  Normalized Hits: {cache['normalized_hits']}")
+            print(f"  Misses: {cache['misses']}")
+
         if status["last_execution"]:
             print(f"\nLast Execution:")
             print(f"  {status['last_execution']}")
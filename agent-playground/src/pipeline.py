@@ -0,0 +1,310 @@
+"""
+Dependency-aware agent pipeline.
+
+Pipeline nodes are agent tasks that may declare other nodes as inputs. A node is
+submitted the moment all of its inputs have completed, so independent branches
+run in parallel and outputs of earlier agents (e.g., the review's bug list)
+enrich the context of later ones (e.g., test generation).
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .agents.cancellation import CancellationToken
+from .multi_agent_orchestrator import TaskResult, TaskType
+from .scheduler import Priority
+
+# Maximum characters of an upstream output passed on to a dependent node
+MAX_UPSTREAM_CHARS = 2000
+
+
+@dataclass
+class PipelineNode:
+    """An agent task in a pipeline."""
+
+    name: str
+    task_type: TaskType
+    depends_on: List[str] = field(default_factory=list)
+    build_context: Optional[Callable[[Dict[str, TaskResult]], Dict[str, Any]]] = None
+
+
+@dataclass
+class PipelineRun:
+    """Results and timings of a pipeline execution."""
+
+    results: Dict[str, TaskResult]
+    timings: Dict[str, Dict[str, float]]
+    critical_path: List[str]
+    wall_time: float
+
+    @property
+    def critical_path_time(self) -> float:
+        """Time from pipeline start until the last critical path node finished."""
+        if not self.critical_path:
+            return 0.0
+        return self.timings[self.critical_path[-1]]["end"]
+
+
+def review_findings(upstream: Dict[str, TaskResult]) -> Dict[str, Any]:
+    """Pass the code review's bug findings on as known issues."""
+    review = upstream.get("code_review")
+    if not review or not review.success:
+        return {}
+
+    sections = review.output.get("sections") or {}
+    findings = sections.get("bugs") or review.output.get("review", "")
+    if not findings.strip():
+        return {}
+    return {"known_issues": findings[:MAX_UPSTREAM_CHARS]}
+
+
+def architecture_summary(upstream: Dict[str, TaskResult]) -> Dict[str, Any]:
+    """Pass a summary of the architecture advice on to the documentation."""
+    advice = upstream.get("architecture_advice")
+    if not advice or not advice.success:
+        return {}
+
+    output = advice.output
+    summary = []
+    approach = output.get("analysis", {}).get("recommended_approach")
+    if approach:
+        summary.append(f"Recommended approach: {approach}")
+    if output.get("recommended_patterns"):
+        summary.append(f"Patterns: {', '.join(output['recommended_patterns'])}")
+    summary.append(output.get("architectural_advice", "")[:MAX_UPSTREAM_CHARS])
+    return {"architecture_summary": "\n".join(summary)}
+
+
+def full_analysis_nodes() -> List[PipelineNode]:
+    """
+    Build the default full analysis pipeline.
+
+    Review and architecture advice run first and in parallel; test generation
+    consumes the review's findings and documentation the architecture summary.
+
+    Returns:
+        List of pipeline nodes
+    """
+    return [
+        PipelineNode("code_review", TaskType.CODE_REVIEW),
+        PipelineNode("architecture_advice", TaskType.ARCHITECTURE_ADVICE),
+        PipelineNode(
+            "test_generation",
+            TaskType.TEST_GENERATION,
+            depends_on=["code_review"],
+            build_context=review_findings,
+        ),
+        PipelineNode(
+            "documentation",
+            TaskType.DOCUMENTATION,
+            depends_on=["architecture_advice"],
+            build_context=architecture_summary,
+        ),
+    ]
+
+
+class AgentPipeline:
+    """Run a DAG of agent tasks on the orchestrator's scheduler."""
+
+    def __init__(
+        self,
+        orchestrator: Any,
+        nodes: List[PipelineNode],
+        priority: Priority = Priority.NORMAL,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            orchestrator: SimpleMultiAgentOrchestrator used to run the tasks
+            nodes: Pipeline nodes
+            priority: Priority class of the pipeline's tasks
+
+        Raises:
+            ValueError: If a dependency is unknown or the graph has a cycle
+        """
+        self.orchestrator = orchestrator
+        self.nodes = {node.name: node for node in nodes}
+        self.priority = priority
+
+        if len(self.nodes) != len(nodes):
+            raise ValueError("Pipeline node names must be unique")
+        self.order = self._topological_order()
+
+    def run(
+        self,
+        input_data: str,
+        context: Optional[Dict[str, Any]] = None,
+        on_node_complete: Optional[Callable[[str, TaskResult], None]] = None,
+        deadline_at: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> PipelineRun:
+        """
+        Execute the pipeline.
+
+        Args:
+            input_data: Input shared by all nodes
+            context: Optional context shared by all nodes
+            on_node_complete: Optional callback receiving (node name, result) as
+                soon as each node completes
+            deadline_at: Optional time.monotonic() deadline passed to every node
+            cancel_token: Optional cancellation token passed to every node
+
+        Returns:
+            PipelineRun with results, per-node timings and the critical path
+            (a node that could not be run has a failed result)
+
+        Raises:
+            Exception: The first error raised by on_node_complete, once every
+                node has completed
+        """
+        started = time.monotonic()
+        results: Dict[str, TaskResult] = {}
+        timings: Dict[str, Dict[str, float]] = {}
+        waiting = {name: set(node.depends_on) for name, node in self.nodes.items()}
+        callback_errors: List[BaseException] = []
+        completed = [0]
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def failed(node: PipelineNode, error: BaseException) -> TaskResult:
+            return TaskResult(
+                agent_name="unknown",
+                task_type=node.task_type,
+                input_data=(
+                    input_data[:500] + "..." if len(input_data) > 500 else input_data
+                ),
+                output={},
+                timestamp=datetime.now(),
+                execution_time=0.0,
+                success=False,
+                error_message=str(error) or type(error).__name__,
+            )
+
+        def launch(node: PipelineNode) -> None:
+            ready = time.monotonic()
+            try:
+                node_context = dict(context or {})
+                if node.build_context:
+                    upstream = {name: results[name] for name in node.depends_on}
+                    try:
+                        node_context.update(node.build_context(upstream))
+                    except Exception:
+                        # Upstream output is an enrichment; run without it
+                        pass
+
+                future = self.orchestrator.submit_task(
+                    node.task_type,
+                    input_data,
+                    node_context or None,
+                    priority=self.priority,
+                    deadline_at=deadline_at,
+                    cancel_token=cancel_token,
+                )
+            except Exception as e:
+                # The node could not be scheduled: it fails, its dependents run
+                finish(node, ready, failed(node, e))
+                return
+            future.add_done_callback(lambda f: finish(node, ready, outcome(node, f)))
+
+        def outcome(node: PipelineNode, future: Future) -> TaskResult:
+            try:
+                return future.result()
+            except Exception as e:
+                return failed(node, e)
+
+        def finish(node: PipelineNode, ready: float, result: TaskResult) -> None:
+            try:
+                end = time.monotonic()
+                start = max(end - result.execution_time, ready)
+
+                with lock:
+                    results[node.name] = result
+                    timings[node.name] = {
+                        "ready": ready - started,
+                        "start": start - started,
+                        "end": end - started,
+                        "duration": result.execution_time,
+                        "wait": start - ready,
+                    }
+                    unblocked = []
+                    for name, dependencies in list(waiting.items()):
+                        dependencies.discard(node.name)
+                        if not dependencies:
+                            unblocked.append(self.nodes[name])
+                            del waiting[name]
+
+                # Start dependents before reporting so they are not delayed
+                for dependent in unblocked:
+                    launch(dependent)
+                if on_node_complete:
+                    on_node_complete(node.name, result)
+            except Exception as e:
+                with lock:
+                    callback_errors.append(e)
+            finally:
+                # Count the node even if reporting it failed, so run() returns
+                with lock:
+                    completed[0] += 1
+                    if completed[0] == len(self.nodes):
+                        done.set()
+
+        if not self.nodes:
+            return PipelineRun(results={}, timings={}, critical_path=[], wall_time=0.0)
+
+        with lock:
+            roots = [self.nodes[name] for name, deps in waiting.items() if not deps]
+            for node in roots:
+                del waiting[node.name]
+        for node in roots:
+            launch(node)
+        done.wait()
+
+        if callback_errors:
+            raise callback_errors[0]
+
+        return PipelineRun(
+            results={name: results[name] for name in self.order},
+            timings={name: timings[name] for name in self.order},
+            critical_path=self._critical_path(timings),
+            wall_time=time.monotonic() - started,
+        )
+
+    def _topological_order(self) -> List[str]:
+        """Order nodes so that dependencies come first, validating the graph."""
+        for node in self.nodes.values():
+            for dependency in node.depends_on:
+                if dependency not in self.nodes:
+                    raise ValueError(
+                        f"Node '{node.name}' depends on unknown node '{dependency}'"
+                    )
+
+        order: List[str] = []
+        remaining = {name: set(node.depends_on) for name, node in self.nodes.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(
+                    f"Pipeline has a dependency cycle among: {sorted(remaining)}"
+                )
+            for name in ready:
+                del remaining[name]
+                order.append(name)
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def _critical_path(self, timings: Dict[str, Dict[str, float]]) -> List[str]:
+        """Follow the latest-finishing dependency back from the last node."""
+        if not timings:
+            return []
+
+        path = [max(timings, key=lambda name: timings[name]["end"])]
+        while self.nodes[path[-1]].depends_on:
+            dependencies = self.nodes[path[-1]].depends_on
+            path.append(max(dependencies, key=lambda name: timings[name]["end"]))
+        return list(reversed(path))
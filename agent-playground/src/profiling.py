@@ -0,0 +1,313 @@
+"""
+Opt-in per-task profiling for the multi-agent orchestrator.
+
+Each agent task can be profiled with cProfile or with a statistical sampler that
+periodically captures the stack of the thread running the task. Optionally,
+tracemalloc snapshots taken before and after each task attribute allocations
+to the code that made them; snapshots cover the whole process, so only tasks
+that ran while no other task was profiled are attributed. Results are aggregated per agent across a run and written as
+collapsed-stack files (flamegraph-ready), pstats dumps and a top-N allocation
+table.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Allocations made by the profiler itself are left out of the tables
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+]
+
+
+class TaskProfiler:
+    """Aggregate CPU and memory profiles of agent tasks per agent."""
+
+    MODES = ("cprofile", "sample")
+
+    def __init__(
+        self,
+        mode: str = "sample",
+        output_dir: str = "profiles",
+        interval: float = 0.005,
+        top_n: int = 20,
+        trace_memory: bool = False,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            mode: "cprofile" for deterministic profiling or "sample" for
+                statistical stack sampling
+            output_dir: Directory the reports are written to
+            interval: Sampling interval in seconds (sample mode)
+            top_n: Number of rows in the allocation and function tables
+            trace_memory: Whether to take tracemalloc snapshots around tasks
+                (each snapshot costs time proportional to the live allocations)
+        """
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Invalid profiling mode: {mode}. Valid modes: {list(self.MODES)}"
+            )
+
+        self.mode = mode
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top_n = top_n
+        self.trace_memory = trace_memory
+
+        self.tasks: Counter = Counter()
+        self.skipped = 0
+        # Tasks whose allocations were not attributed as they overlapped others
+        self.memory_skipped = 0
+        self.stacks: Dict[str, Counter] = defaultdict(Counter)
+        self.stats: Dict[str, pstats.Stats] = {}
+        self.allocations: Dict[str, Dict[str, List[int]]] = defaultdict(
+            lambda: defaultdict(lambda: [0, 0])
+        )
+        self._active: Dict[int, str] = {}
+        self._running = 0
+        self._started = 0
+        self._lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def from_env(cls) -> Optional["TaskProfiler"]:
+        """
+        Create a profiler from environment variables.
+
+        Returns:
+            TaskProfiler instance, or None if TASK_PROFILING is off
+        """
+        mode = os.getenv("TASK_PROFILING", "off").lower()
+        if mode in ("", "off", "false"):
+            return None
+
+        return cls(
+            mode=mode,
+            output_dir=os.getenv("TASK_PROFILE_DIR", "profiles"),
+            interval=float(os.getenv("TASK_PROFILE_INTERVAL", "0.005")),
+            top_n=int(os.getenv("TASK_PROFILE_TOP", "20")),
+            trace_memory=os.getenv("TASK_PROFILE_MEMORY", "False").lower() == "true",
+        )
+
+    @contextmanager
+    def profile(self, agent_name: str) -> Iterator[None]:
+        """
+        Profile the code executed in the block on behalf of an agent.
+
+        Args:
+            agent_name: Agent the measurements are attributed to
+        """
+        with self._lock:
+            self._running += 1
+            self._started += 1
+            alone = self._running == 1
+            started = self._started
+        # Snapshots cover every thread: only a task running alone is measured
+        before = self._snapshot() if self.trace_memory and alone else None
+
+        profiler = None
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Only one profiler may be active at a time on newer Pythons
+                profiler = None
+                with self._lock:
+                    self.skipped += 1
+        else:
+            self._start_sampling(agent_name)
+
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+                self._add_stats(agent_name, profiler)
+            elif self.mode == "sample":
+                with self._lock:
+                    self._active.pop(threading.get_ident(), None)
+
+            if before is not None:
+                after = self._snapshot()
+                with self._lock:
+                    alone = self._started == started
+                if alone:
+                    differences = after.compare_to(before, "lineno")
+                    self._add_allocations(agent_name, differences)
+
+            with self._lock:
+                self._running -= 1
+                self.tasks[agent_name] += 1
+                if self.trace_memory and not alone:
+                    self.memory_skipped += 1
+
+    def write_reports(self) -> List[str]:
+        """
+        Write the aggregated reports to the output directory.
+
+        Returns:
+            Paths of the written files
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = []
+
+        with self._lock:
+            for agent_name, stacks in self.stacks.items():
+                path = os.path.join(self.output_dir, f"{_slug(agent_name)}.collapsed")
+                with open(path, "w") as f:
+                    for stack, count in stacks.most_common():
+                        f.write(f"{stack} {count}\n")
+                paths.append(path)
+
+            for agent_name, stats in self.stats.items():
+                path = os.path.join(self.output_dir, f"{_slug(agent_name)}.prof")
+                stats.dump_stats(path)
+                paths.append(path)
+
+            report = self._format_report()
+
+        path = os.path.join(self.output_dir, "report.txt")
+        with open(path, "w") as f:
+            f.write(report)
+        paths.append(path)
+
+        return paths
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get profiling statistics.
+
+        Returns:
+            Dictionary with the mode, profiled task counts and sample counts
+        """
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "tasks": dict(self.tasks),
+                "skipped": self.skipped,
+                "memory_skipped": self.memory_skipped,
+                "samples": {
+                    agent: sum(stacks.values()) for agent, stacks in self.stacks.items()
+                },
+            }
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        """Take a tracemalloc snapshot without the profiler's own allocations."""
+        return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+    def _start_sampling(self, agent_name: str) -> None:
+        """Register the current thread with the shared sampler thread."""
+        with self._lock:
+            self._active[threading.get_ident()] = agent_name
+            if self._sampler is None:
+                self._sampler = threading.Thread(
+                    target=self._sample, name="task-profiler", daemon=True
+                )
+                self._sampler.start()
+
+    def _sample(self) -> None:
+        """Sampler loop capturing the stacks of threads running tasks."""
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                active = dict(self._active)
+            if not active:
+                continue
+
+            frames = sys._current_frames()
+            for thread_id, agent_name in active.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    filename = os.path.basename(code.co_filename)
+                    stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                with self._lock:
+                    self.stacks[agent_name][";".join(reversed(stack))] += 1
+
+    def _add_stats(self, agent_name: str, profiler: cProfile.Profile) -> None:
+        """Merge a task's cProfile data into the agent's aggregate."""
+        with self._lock:
+            if agent_name in self.stats:
+                self.stats[agent_name].add(profiler)
+            else:
+                self.stats[agent_name] = pstats.Stats(profiler, stream=io.StringIO())
+
+    def _add_allocations(self, agent_name: str, differences: List[Any]) -> None:
+        """Accumulate tracemalloc snapshot differences per source line."""
+        with self._lock:
+            allocations = self.allocations[agent_name]
+            for difference in differences:
+                if not difference.size_diff:
+                    continue
+                frame = difference.traceback[0]
+                location = f"{frame.filename}:{frame.lineno}"
+                allocations[location][0] += difference.size_diff
+                allocations[location][1] += difference.count_diff
+
+    def _format_report(self) -> str:
+        """Format the per-agent function and allocation tables (lock held)."""
+        lines = [f"Task profile ({self.mode} mode)", "=" * 60]
+
+        for agent_name in sorted(self.tasks):
+            lines.append(f"\n{agent_name}: {self.tasks[agent_name]} task(s)")
+
+            if agent_name in self.stats:
+                stream = io.StringIO()
+                stats = self.stats[agent_name]
+                stats.stream = stream
+                stats.sort_stats("cumulative").print_stats(self.top_n)
+                lines.append(stream.getvalue().strip())
+
+            if agent_name in self.stacks:
+                stacks = self.stacks[agent_name]
+                total = sum(stacks.values())
+                leaves = Counter()
+                for stack, count in stacks.items():
+                    leaves[stack.rsplit(";", 1)[-1]] += count
+                lines.append(f"\n  Top functions by samples ({total} samples):")
+                for function, count in leaves.most_common(self.top_n):
+                    lines.append(f"  {count / total:6.1%}  {function}")
+
+            allocations = self.allocations.get(agent_name)
+            if allocations:
+                lines.append(f"\n  Top allocations (net bytes, blocks):")
+                top = sorted(allocations.items(), key=lambda item: -abs(item[1][0]))
+                for location, (size, count) in top[: self.top_n]:
+                    lines.append(f"  {size:>12,}  {count:>8,}  {location}")
+
+        if self.skipped:
+            lines.append(
+                f"\n{self.skipped} task(s) not profiled: another profiler was active"
+            )
+        if self.memory_skipped:
+            lines.append(
+                f"\n{self.memory_skipped} task(s) left out of the allocation tables: "
+                "they overlapped other tasks, whose allocations a process-wide "
+                "snapshot cannot tell apart"
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _slug(name: str) -> str:
+    """File name for an agent name."""
+    return name.lower().replace(" ", "_")
@@ -0,0 +1,69 @@
+"""
+JSON Lines output for task results.
+
+Each completed task is written as one compact JSON record per line and flushed
+immediately, so downstream tools can consume results of large batches as a
+stream instead of waiting for a single JSON document at the end.
+"""
+
+import gzip
+import json
+import sys
+import threading
+from typing import IO, Any, Optional
+
+
+class JsonLinesWriter:
+    """Thread-safe writer emitting one TaskResult record per line."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Output file path; None or "-" writes to stdout. Paths ending in
+                ".gz" are gzip-compressed.
+        """
+        self.path = None if path in (None, "-") else path
+        self.count = 0
+        self._lock = threading.Lock()
+
+        self._stream: IO[str]
+        if self.path is None:
+            self._stream = sys.stdout
+        elif self.path.endswith(".gz"):
+            self._stream = gzip.open(self.path, "wt", encoding="utf-8")
+        else:
+            self._stream = open(self.path, "w", encoding="utf-8")
+
+    @property
+    def to_stdout(self) -> bool:
+        """Whether records are written to stdout."""
+        return self.path is None
+
+    def write(self, result: Any) -> None:
+        """
+        Write a task result as a single JSON line and flush it.
+
+        Args:
+            result: TaskResult (or any object with a to_dict method, or a dict)
+        """
+        record = result.to_dict() if hasattr(result, "to_dict") else result
+        line = json.dumps(record, separators=(",", ":"), default=str)
+
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+            self.count += 1
+
+    def close(self) -> None:
+        """Close the output file (stdout is left open)."""
+        with self._lock:
+            if not self.to_stdout and not self._stream.closed:
+                self._stream.close()
+
+    def __enter__(self) -> "JsonLinesWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,605 @@
+"""
+Local retrieval of repository definitions for agent context.
+
+An inverted index over the definitions of a repository (names, signatures and
+docstrings of functions and classes) is ranked with BM25. Before a task runs,
+the identifiers of its input are used as the query and the best-matching
+definitions are added to the context within a token budget, so agents can see
+helpers that live in other modules. The index is updated incrementally: only
+files whose size or modification time changed are re-indexed.
+"""
+
+import ast
+import heapq
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .agents.compaction import estimate_tokens
+from .agents.repo_summarizer import SKIPPED_DIRECTORIES, SOURCE_EXTENSIONS
+from .agents.token_budget import CLASS_PATTERN, FUNCTION_PATTERN
+
+IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+WORD_PARTS = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+# Words too common in code to be useful query terms
+STOP_WORDS = {
+    "self",
+    "cls",
+    "def",
+    "class",
+    "return",
+    "import",
+    "from",
+    "if",
+    "else",
+    "for",
+    "in",
+    "is",
+    "not",
+    "and",
+    "or",
+    "none",
+    "true",
+    "false",
+    "the",
+    "a",
+    "an",
+    "of",
+    "to",
+    "with",
+}
+
+# Name terms count this many times as much as signature and docstring terms
+NAME_WEIGHT = 3
+
+# Query terms with the highest IDF that are scored; the rest are ignored
+MAX_QUERY_TERMS = 32
+
+# Definitions longer than this are shown as signature and docstring only
+MAX_SNIPPET_LINES = 40
+
+# Lines of a non-Python definition shown in its snippet
+PATTERN_SNIPPET_LINES = 15
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase identifier terms.
+
+    Identifiers are kept whole and also split into their snake_case and
+    camelCase parts (e.g., "parseHTTPResponse" -> parsehttpresponse, parse,
+    http, response).
+
+    Args:
+        text: Source code or prose
+
+    Returns:
+        List of terms
+    """
+    terms = []
+    for identifier in IDENTIFIER.findall(text):
+        lowered = identifier.lower()
+        if len(lowered) > 1 and lowered not in STOP_WORDS:
+            terms.append(lowered)
+        parts = [
+            part.lower()
+            for chunk in identifier.split("_")
+            for part in WORD_PARTS.findall(chunk)
+        ]
+        if len(parts) > 1:
+            terms.extend(
+                part for part in parts if len(part) > 1 and part not in STOP_WORDS
+            )
+    return terms
+
+
+class RetrievalIndex:
+    """Incrementally updated BM25 index over the definitions of a repository."""
+
+    def __init__(
+        self,
+        root: str,
+        index_path: Optional[str] = None,
+        top_k: int = 5,
+        token_budget: int = 1500,
+        refresh_interval: float = 30.0,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            root: Repository root directory
+            index_path: JSON file persisting the index across runs (optional)
+            top_k: Maximum number of definitions added to a context
+            token_budget: Maximum tokens of definitions added to a context
+            refresh_interval: Seconds between checks for changed files
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        if not os.path.isdir(root):
+            raise ValueError(f"Retrieval root is not a directory: {root}")
+
+        self.root = root
+        self.index_path = index_path
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self.refresh_interval = refresh_interval
+        self.k1 = k1
+        self.b = b
+
+        # Definitions: id -> {"path", "name", "kind", "line", "snippet", "terms"}
+        self.documents: Dict[int, Dict[str, Any]] = {}
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.total_length = 0
+        self._next_id = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        # Serializes updates, so concurrent callers do not each rescan the root
+        self._update_lock = threading.RLock()
+
+        self.stats = {
+            "queries": 0,
+            "query_time": 0.0,
+            "updates": 0,
+            "reindexed_files": 0,
+            "last_update_time": 0.0,
+        }
+
+        if index_path and os.path.exists(index_path):
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> Optional["RetrievalIndex"]:
+        """
+        Create an index from environment variables.
+
+        Returns:
+            RetrievalIndex instance, or None if RETRIEVAL_ROOT is not set
+        """
+        root = os.getenv("RETRIEVAL_ROOT")
+        if not root:
+            return None
+
+        return cls(
+            root,
+            index_path=os.getenv("RETRIEVAL_INDEX_PATH") or None,
+            top_k=int(os.getenv("RETRIEVAL_TOP_K", "5")),
+            token_budget=int(os.getenv("RETRIEVAL_TOKEN_BUDGET", "1500")),
+            refresh_interval=float(os.getenv("RETRIEVAL_REFRESH_SECONDS", "30")),
+        )
+
+    def update(self) -> int:
+        """
+        Re-index files that were added, changed or removed since the last update.
+
+        Returns:
+            Number of files (re-)indexed or removed
+        """
+        with self._update_lock:
+            return self._update()
+
+    def _update(self) -> int:
+        """Body of update(), run under the update lock."""
+        started = time.perf_counter()
+        current = _scan(self.root)
+
+        with self._lock:
+            changed = [
+                path
+                for path, signature in current.items()
+                if self.files.get(path, {}).get("signature") != signature
+            ]
+            removed = [path for path in self.files if path not in current]
+            for path in removed:
+                self._remove_file(path)
+
+        for path in changed:
+            self.reindex_file(path, current[path])
+
+        with self._lock:
+            self._checked_at = time.monotonic()
+            self.stats["updates"] += 1
+            self.stats["reindexed_files"] += len(changed) + len(removed)
+            self.stats["last_update_time"] = time.perf_counter() - started
+
+        if (changed or removed) and self.index_path:
+            self.save()
+        return len(changed) + len(removed)
+
+    def reindex_file(self, path: str, signature: Optional[List[float]] = None) -> int:
+        """
+        Replace the definitions of one file.
+
+        Args:
+            path: File path relative to the root
+            signature: Optional [size, mtime] of the file (read if None)
+
+        Returns:
+            Number of definitions indexed
+        """
+        full_path = os.path.join(self.root, path)
+        try:
+            if signature is None:
+                stat = os.stat(full_path)
+                signature = [stat.st_size, stat.st_mtime]
+            with open(full_path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            text = ""
+
+        definitions = extract_definitions(path, text)
+
+        with self._lock:
+            self._remove_file(path)
+            ids = []
+            for definition in definitions:
+                ids.append(self._add_document(definition))
+            self.files[path] = {"signature": signature, "documents": ids}
+        return len(ids)
+
+    def search(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        exclude: Optional[Set[str]] = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Rank definitions against a query with BM25.
+
+        Args:
+            query: Query text (code or prose)
+            top_k: Number of results (defaults to the configured top_k)
+            exclude: Definition names to leave out
+
+        Returns:
+            List of (score, definition) pairs, best first
+        """
+        started = time.perf_counter()
+        terms = Counter(tokenize(query))
+
+        with self._lock:
+            count = len(self.documents)
+            if not count or not terms:
+                return []
+            average_length = self.total_length / count
+
+            # Only the most selective terms; common ones barely change the ranking
+            weighted = []
+            for term, query_frequency in terms.items():
+                postings = self.postings.get(term)
+                if postings:
+                    idf = math.log(
+                        1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)
+                    )
+                    weighted.append((idf * (1 + math.log(query_frequency)), postings))
+            weighted = heapq.nlargest(
+                MAX_QUERY_TERMS, weighted, key=lambda item: item[0]
+            )
+
+            scores: Dict[int, float] = defaultdict(float)
+            for weight, postings in weighted:
+                for document_id, frequency in postings.items():
+                    length = self.documents[document_id]["length"]
+                    scores[document_id] += (
+                        weight
+                        * frequency
+                        * (self.k1 + 1)
+                        / (
+                            frequency
+                            + self.k1 * (1 - self.b + self.b * length / average_length)
+                        )
+                    )
+
+            limit = (top_k or self.top_k) + len(exclude or ())
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            results = []
+            for document_id, score in ranked:
+                document = self.documents[document_id]
+                if exclude and document["name"] in exclude:
+                    continue
+                results.append((score, document))
+                if len(results) == (top_k or self.top_k):
+                    break
+
+            self.stats["queries"] += 1
+            self.stats["query_time"] += time.perf_counter() - started
+        return results
+
+    def enrich(
+        self, input_data: str, context: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Add the definitions most relevant to an input to its context.
+
+        Definitions with names defined in the input itself are skipped, and
+        definitions are added best first until the token budget is used.
+
+        Args:
+            input_data: Task input
+            context: Optional context information
+
+        Returns:
+            Context with "related_definitions" added, or the original context if
+            nothing relevant was found
+        """
+        if self._refresh_due():
+            with self._update_lock:
+                # Another caller may have refreshed the index while we waited
+                if self._refresh_due():
+                    self.update()
+
+        defined = {
+            definition["name"]
+            for definition in extract_definitions("input.py", input_data)
+        }
+        snippets = []
+        used = 0
+        for _, definition in self.search(input_data, exclude=defined):
+            snippet = (
+                f"# {definition['path']}:{definition['line']}\n{definition['snippet']}"
+            )
+            tokens = estimate_tokens(snippet)
+            if used + tokens > self.token_budget:
+                continue
+            snippets.append(snippet)
+            used += tokens
+
+        if not snippets:
+            return context
+        return {**(context or {}), "related_definitions": "\n\n".join(snippets)}
+
+    def _refresh_due(self) -> bool:
+        """Whether the files should be checked for changes again."""
+        with self._lock:
+            return time.monotonic() - self._checked_at >= self.refresh_interval
+
+    def save(self) -> None:
+        """Persist the index to index_path."""
+        if not self.index_path:
+            return
+
+        with self._lock:
+            data = {
+                "root": os.path.abspath(self.root),
+                "files": {
+                    path: {
+                        "signature": entry["signature"],
+                        "documents": [
+                            {
+                                key: value
+                                for key, value in self.documents[i].items()
+                                if key != "length"
+                            }
+                            for i in entry["documents"]
+                        ],
+                    }
+                    for path, entry in self.files.items()
+                },
+            }
+
+        directory = os.path.dirname(os.path.abspath(self.index_path))
+        os.makedirs(directory, exist_ok=True)
+        # A unique temporary file per save, so concurrent processes never share one
+        fd, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(temporary, self.index_path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with index size, update counts and average query latency
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update(
+                {
+                    "root": self.root,
+                    "files": len(self.files),
+                    "definitions": len(self.documents),
+                    "terms": len(self.postings),
+                }
+            )
+        stats["avg_query_ms"] = (
+            stats["query_time"] / stats["queries"] * 1000 if stats["queries"] else 0.0
+        )
+        return stats
+
+    def _add_document(self, definition: Dict[str, Any]) -> int:
+        """Add a definition to the postings (lock held)."""
+        document_id = self._next_id
+        self._next_id += 1
+
+        terms = definition["terms"]
+        definition["length"] = sum(terms.values())
+        self.documents[document_id] = definition
+        self.total_length += definition["length"]
+        for term, frequency in terms.items():
+            self.postings[term][document_id] = frequency
+        return document_id
+
+    def _remove_file(self, path: str) -> None:
+        """Remove the definitions of a file from the postings (lock held)."""
+        entry = self.files.pop(path, None)
+        if not entry:
+            return
+
+        for document_id in entry["documents"]:
+            document = self.documents.pop(document_id)
+            self.total_length -= document["length"]
+            for term in document["terms"]:
+                postings = self.postings[term]
+                postings.pop(document_id, None)
+                if not postings:
+                    del self.postings[term]
+
+    def _load(self) -> None:
+        """Load a persisted index (stale entries are fixed by the next update)."""
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("root") != os.path.abspath(self.root):
+            return
+
+        for path, entry in data.get("files", {}).items():
+            ids = []
+            for document in entry["documents"]:
+                document["terms"] = Counter(document["terms"])
+                ids.append(self._add_document(document))
+            self.files[path] = {"signature": entry["signature"], "documents": ids}
+
+
+def extract_definitions(path: str, text: str) -> List[Dict[str, Any]]:
+    """
+    Extract the function and class definitions of a source file.
+
+    Python is parsed with ast; other languages use line patterns.
+
+    Args:
+        path: File path (the extension selects the parser)
+        text: File content
+
+    Returns:
+        List of definitions with path, name, kind, line, snippet and terms
+    """
+    if path.endswith(".py"):
+        try:
+            return _python_definitions(path, text)
+        except (SyntaxError, ValueError):
+            pass
+    return _pattern_definitions(path, text)
+
+
+def _python_definitions(path: str, text: str) -> List[Dict[str, Any]]:
+    """Definitions of a Python module, including methods."""
+    tree = ast.parse(text)
+    lines = text.split("\n")
+    definitions = []
+
+    def visit(node: ast.AST, owner: Optional[str]) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                definitions.append(_python_definition(path, lines, child, owner))
+                if isinstance(child, ast.ClassDef):
+                    visit(child, child.name)
+
+    visit(tree, None)
+    return definitions
+
+
+def _python_definition(
+    path: str, lines: List[str], node: ast.AST, owner: Optional[str]
+) -> Dict[str, Any]:
+    """Build the indexed record of one Python definition."""
+    is_class = isinstance(node, ast.ClassDef)
+    # Header text up to the body (taken from the source to also work on 3.8)
+    body = node.body[0]
+    if body.lineno == node.lineno:
+        header = lines[node.lineno - 1][: body.col_offset]
+    else:
+        header = " ".join(
+            line.strip() for line in lines[node.lineno - 1 : body.lineno - 1]
+        )
+    signature = header.strip().rstrip(":").strip()
+    docstring = ast.get_docstring(node) or ""
+
+    start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+    end = node.end_lineno or node.lineno
+    if end - start + 1 <= MAX_SNIPPET_LINES:
+        snippet = "\n".join(lines[start - 1 : end])
+    else:
+        indent = " " * (node.col_offset + 4)
+        snippet = f"{signature}:"
+        if docstring:
+            snippet += f'\n{indent}"""{docstring.splitlines()[0]}"""'
+        snippet += f"\n{indent}..."
+
+    name = f"{owner}.{node.name}" if owner else node.name
+    terms = Counter(tokenize(name) * NAME_WEIGHT)
+    terms.update(tokenize(signature))
+    terms.update(tokenize(docstring))
+    return {
+        "path": path,
+        "name": node.name,
+        "qualified_name": name,
+        "kind": "class" if is_class else "function",
+        "line": start,
+        "snippet": snippet,
+        "terms": terms,
+    }
+
+
+def _pattern_definitions(path: str, text: str) -> List[Dict[str, Any]]:
+    """Definitions found with the language-agnostic line patterns."""
+    lines = text.split("\n")
+    definitions = []
+    for kind, pattern in (("function", FUNCTION_PATTERN), ("class", CLASS_PATTERN)):
+        for match in pattern.finditer(text):
+            name = next(group for group in match.groups() if group)
+            line = text.count("\n", 0, match.start()) + 1
+            snippet = "\n".join(lines[line - 1 : line - 1 + PATTERN_SNIPPET_LINES])
+
+            # Leading comment block acts as the docstring
+            comments = []
+            index = line - 2
+            while index >= 0 and lines[index].strip().startswith(
+                ("//", "#", "*", "/*")
+            ):
+                comments.append(lines[index])
+                index -= 1
+
+            terms = Counter(tokenize(name) * NAME_WEIGHT)
+            terms.update(tokenize(lines[line - 1]))
+            terms.update(tokenize("\n".join(comments)))
+            definitions.append(
+                {
+                    "path": path,
+                    "name": name,
+                    "qualified_name": name,
+                    "kind": kind,
+                    "line": line,
+                    "snippet": snippet,
+                    "terms": terms,
+                }
+            )
+    return definitions
+
+
+def _scan(root: str) -> Dict[str, List[float]]:
+    """Size and modification time of each source file under root."""
+    files = {}
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories[:] = [
+            name
+            for name in subdirectories
+            if not name.startswith(".") and name not in SKIPPED_DIRECTORIES
+        ]
+        for filename in filenames:
+            if os.path.splitext(filename)[1] not in SOURCE_EXTENSIONS:
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            relative = os.path.relpath(path, root).replace(os.sep, "/")
+            files[relative] = [stat.st_size, stat.st_mtime]
+    return files
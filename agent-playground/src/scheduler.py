@@ -0,0 +1,265 @@
+"""
+Priority scheduling for agent tasks.
+
+Tasks are submitted with a priority class and served highest priority first. A
+slice of the available concurrency is reserved for interactive traffic, and
+waiting tasks are aged (promoted one class per aging interval) so that batch
+work cannot be starved indefinitely.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class Priority(Enum):
+    """Priority classes for submitted tasks, highest first."""
+
+    INTERACTIVE = "interactive"
+    NORMAL = "normal"
+    BATCH = "batch"
+
+
+# Lower rank is served first
+PRIORITY_RANK = {Priority.INTERACTIVE: 0, Priority.NORMAL: 1, Priority.BATCH: 2}
+
+
+class PriorityScheduler:
+    """Run submitted callables on a shared worker pool in priority order."""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        reserved_interactive: int = 1,
+        aging_interval: float = 30.0,
+        limiter: Optional[Any] = None,
+        max_samples: int = 1000,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers: Number of worker threads (upper bound on running tasks)
+            reserved_interactive: Slots that only interactive tasks may use
+            aging_interval: Seconds of waiting after which a task is promoted
+                by one priority class (0 disables aging)
+            limiter: Optional AdaptiveConcurrencyLimiter; when given, the number
+                of running tasks also follows its current limit
+            max_samples: Number of recent queue wait times kept per class
+        """
+        self.max_workers = max(1, max_workers)
+        self.reserved_interactive = max(0, reserved_interactive)
+        self.aging_interval = aging_interval
+        self.limiter = limiter
+
+        # Queued tasks: (submit time, callable, future, submitter's context)
+        self._queues: Dict[
+            Priority,
+            Deque[Tuple[float, Callable[[], Any], Future, contextvars.Context]],
+        ] = {priority: deque() for priority in Priority}
+        self._running: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self._waits: Dict[Priority, Deque[float]] = {
+            priority: deque(maxlen=max_samples) for priority in Priority
+        }
+        self._counts: Dict[Priority, Dict[str, int]] = {
+            priority: {"submitted": 0, "completed": 0, "aged": 0}
+            for priority in Priority
+        }
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+
+    @classmethod
+    def from_env(cls, limiter: Optional[Any] = None) -> "PriorityScheduler":
+        """
+        Create a scheduler from environment variables.
+
+        Args:
+            limiter: Optional AdaptiveConcurrencyLimiter to follow
+
+        Returns:
+            PriorityScheduler instance
+        """
+        default_workers = limiter.max_limit if limiter else 8
+        return cls(
+            max_workers=int(os.getenv("SCHEDULER_WORKERS", str(default_workers))),
+            reserved_interactive=int(os.getenv("SCHEDULER_INTERACTIVE_RESERVED", "1")),
+            aging_interval=float(os.getenv("SCHEDULER_AGING_SECONDS", "30")),
+            limiter=limiter,
+        )
+
+    def submit(
+        self, fn: Callable[[], Any], priority: Priority = Priority.NORMAL
+    ) -> Future:
+        """
+        Queue a callable for execution.
+
+        The callable (and the future's done callbacks) run in a copy of the
+        caller's context, so context variables follow the task to its worker.
+
+        Args:
+            fn: Callable without arguments
+            priority: Priority class of the task
+
+        Returns:
+            Future resolving to the callable's return value
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit tasks after shutdown")
+            self._queues[priority].append(
+                (time.monotonic(), fn, future, contextvars.copy_context())
+            )
+            self._counts[priority]["submitted"] += 1
+            self._start_workers()
+            self._condition.notify_all()
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the workers once the queues are drained.
+
+        Args:
+            wait: Whether to block until all workers have exited
+        """
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-class queue statistics.
+
+        Returns:
+            Dictionary with capacity information and, per priority class, the
+            number of queued/running/completed tasks and queue wait times
+        """
+        with self._condition:
+            classes = {}
+            for priority in Priority:
+                waits = sorted(self._waits[priority])
+                classes[priority.value] = {
+                    "queued": len(self._queues[priority]),
+                    "running": self._running[priority],
+                    **self._counts[priority],
+                    "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+                    "p50_wait": _percentile(waits, 0.50),
+                    "p95_wait": _percentile(waits, 0.95),
+                    "max_wait": waits[-1] if waits else 0.0,
+                }
+
+            return {
+                "workers": self.max_workers,
+                "capacity": self._capacity(),
+                "reserved_interactive": self.reserved_interactive,
+                "aging_interval": self.aging_interval,
+                "classes": classes,
+            }
+
+    def _start_workers(self) -> None:
+        """Start the worker threads on first use (caller holds the lock)."""
+        if self._workers:
+            return
+        for index in range(self.max_workers):
+            worker = threading.Thread(
+                target=self._work, name=f"scheduler-{index}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _capacity(self) -> int:
+        """Number of tasks allowed to run right now."""
+        if self.limiter:
+            return max(1, min(self.max_workers, self.limiter.limit))
+        return self.max_workers
+
+    def _next_task(
+        self,
+    ) -> Optional[
+        Tuple[Priority, float, Callable[[], Any], Future, contextvars.Context]
+    ]:
+        """Pick the next task to run, or None (caller holds the lock)."""
+        capacity = self._capacity()
+        running = sum(self._running.values())
+        if running >= capacity:
+            return None
+
+        # Non-interactive tasks may not use the reserved slots, but always get
+        # at least one slot so that they keep making progress
+        shared_capacity = max(capacity - self.reserved_interactive, 1)
+        shared_running = running - self._running[Priority.INTERACTIVE]
+
+        now = time.monotonic()
+        best = None
+        for priority, queue in self._queues.items():
+            if not queue:
+                continue
+            if priority != Priority.INTERACTIVE and shared_running >= shared_capacity:
+                continue
+            # Queues are FIFO, so the head is the longest waiting task
+            submitted = queue[0][0]
+            rank = PRIORITY_RANK[priority]
+            if self.aging_interval > 0:
+                rank = max(rank - int((now - submitted) / self.aging_interval), 0)
+            key = (rank, submitted)
+            if best is None or key < best[0]:
+                best = (key, priority)
+
+        if best is None:
+            return None
+
+        (rank, _), priority = best
+        if rank < PRIORITY_RANK[priority]:
+            self._counts[priority]["aged"] += 1
+        submitted, fn, future, context = self._queues[priority].popleft()
+        return priority, submitted, fn, future, context
+
+    def _work(self) -> None:
+        """Worker loop."""
+        while True:
+            with self._condition:
+                task = self._next_task()
+                while task is None:
+                    if self._shutdown and not any(self._queues.values()):
+                        return
+                    # Wake up periodically so that aging and limit changes apply
+                    self._condition.wait(timeout=1.0)
+                    task = self._next_task()
+
+                priority, submitted, fn, future, context = task
+                self._running[priority] += 1
+                self._waits[priority].append(time.monotonic() - submitted)
+
+            try:
+                context.run(_run_task, fn, future)
+            finally:
+                with self._condition:
+                    self._running[priority] -= 1
+                    self._counts[priority]["completed"] += 1
+                    self._condition.notify_all()
+
+
+def _run_task(fn: Callable[[], Any], future: Future) -> None:
+    """Run a task, completing its future (unless it was cancelled)."""
+    if future.set_running_or_notify_cancel():
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
@@ -0,0 +1,254 @@
+"""
+Result cache for the multi-agent orchestrator.
+
+Results are stored under an exact key (task type, input, context and the
+settings of the agent, such as its model and prompt) and under
+an alternate key derived from the canonical form of the input, so that inputs
+differing only in formatting, comments or local names can reuse earlier results.
+With a blob store, entries hold references to output blobs instead of outputs.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from .agents.normalization import canonical_hash
+from .blob_store import BlobOutput, BlobStore
+
+
+class TaskCache:
+    """Two-level (exact and normalized) cache of agent outputs."""
+
+    POLICIES = ("exact", "normalized")
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        policy: str = "exact",
+        normalized_tasks: Optional[Iterable[str]] = None,
+        blob_store: Optional[BlobStore] = None,
+        max_entries: int = 1000,
+    ):
+        """
+        Initialize the task cache.
+
+        Args:
+            cache_dir: Directory to persist entries in (in-memory only if None)
+            policy: "exact" to reuse only identical inputs, "normalized" to also
+                reuse results for inputs with the same canonical form
+            normalized_tasks: Task type values for which normalized hits may be
+                reused (all task types if None)
+            blob_store: Blob store holding the outputs (entries then only keep
+                references)
+            max_entries: Number of entries kept in memory (least recently used
+                entries are evicted; the cache directory keeps them all)
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(
+                f"Invalid cache policy: {policy}. Valid policies: {list(self.POLICIES)}"
+            )
+
+        self.cache_dir = cache_dir
+        self.policy = policy
+        self.normalized_tasks = set(normalized_tasks) if normalized_tasks else None
+        self.blob_store = blob_store
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Mapping[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "normalized_hits": 0, "misses": 0}
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["TaskCache"]:
+        """
+        Create a task cache from environment variables.
+
+        Returns:
+            TaskCache instance, or None if TASK_CACHE is not enabled
+        """
+        if os.getenv("TASK_CACHE", "False").lower() != "true":
+            return None
+
+        normalized_tasks = os.getenv("TASK_CACHE_NORMALIZED_TASKS", "")
+        return cls(
+            cache_dir=os.getenv("TASK_CACHE_DIR") or None,
+            policy=os.getenv("TASK_CACHE_POLICY", "exact").lower(),
+            max_entries=int(os.getenv("TASK_CACHE_MAX_ENTRIES", "1000")),
+            normalized_tasks=[
+                t.strip() for t in normalized_tasks.split(",") if t.strip()
+            ],
+        )
+
+    def keys(
+        self,
+        task_type: str,
+        input_data: str,
+        context: Optional[Dict[str, Any]] = None,
+        scope: Tuple[str, ...] = (),
+    ) -> Tuple[str, str]:
+        """
+        Compute the exact and normalized cache keys for a task.
+
+        Args:
+            task_type: Task type value (e.g., "code_review")
+            input_data: Task input
+            context: Optional context information
+            scope: Settings the output depends on (agent, model, prompt), see
+                BaseAgent.cache_scope()
+
+        Returns:
+            Tuple of (exact key, normalized key)
+        """
+        context_json = json.dumps(context or {}, sort_keys=True, default=str)
+        language = (context or {}).get("language")
+
+        exact = _digest(task_type, *scope, context_json, input_data)
+        normalized = _digest(
+            task_type, *scope, context_json, canonical_hash(input_data, language)
+        )
+        return exact, normalized
+
+    def get(
+        self,
+        task_type: str,
+        input_data: str,
+        context: Optional[Dict[str, Any]] = None,
+        scope: Tuple[str, ...] = (),
+    ) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        Look up a cached output for a task.
+
+        Args:
+            task_type: Task type value
+            input_data: Task input
+            context: Optional context information
+            scope: Settings the output depends on
+
+        Returns:
+            Tuple of (output, hit kind "exact" or "normalized"), or None on a
+            miss; the output is a copy the caller may modify
+        """
+        exact, normalized = self.keys(task_type, input_data, context, scope)
+
+        output = self._read(f"x-{exact}")
+        if output is not None:
+            self._count("exact_hits")
+            return _copy(output), "exact"
+
+        if self._normalized_allowed(task_type):
+            output = self._read(f"n-{normalized}")
+            if output is not None:
+                self._count("normalized_hits")
+                return _copy(output), "normalized"
+
+        self._count("misses")
+        return None
+
+    def put(
+        self,
+        task_type: str,
+        input_data: str,
+        output: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None,
+        scope: Tuple[str, ...] = (),
+    ) -> None:
+        """
+        Store the output of a task.
+
+        Args:
+            task_type: Task type value
+            input_data: Task input
+            output: Agent output to cache
+            context: Optional context information
+            scope: Settings the output depends on
+        """
+        exact, normalized = self.keys(task_type, input_data, context, scope)
+        # Keep a private copy, so later changes by the caller do not leak in
+        output = _copy(output)
+        self._write(f"x-{exact}", output)
+        self._write(f"n-{normalized}", output)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with policy, entry count and hit/miss counters
+        """
+        with self._lock:
+            return {"policy": self.policy, "entries": len(self._entries), **self.stats}
+
+    def _normalized_allowed(self, task_type: str) -> bool:
+        """Whether a normalized hit may be reused for this task type."""
+        if self.policy != "normalized":
+            return False
+        return self.normalized_tasks is None or task_type in self.normalized_tasks
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.stats[counter] += 1
+
+    def _read(self, key: str) -> Optional[Mapping[str, Any]]:
+        """Read an entry from memory, falling back to the cache directory."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        if not self.cache_dir:
+            return None
+
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            with open(path, "r") as f:
+                output = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if "$blob" in output:
+            if not self.blob_store or output["$blob"] not in self.blob_store:
+                return None
+            output = BlobOutput(self.blob_store, output["$blob"])
+
+        self._remember(key, output)
+        return output
+
+    def _write(self, key: str, output: Mapping[str, Any]) -> None:
+        """Write an entry to memory and to the cache directory."""
+        if self.blob_store:
+            output = self.blob_store.wrap(output)
+        self._remember(key, output)
+
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"{key}.json")
+            with open(path, "w") as f:
+                if isinstance(output, BlobOutput):
+                    json.dump({"$blob": output.digest}, f)
+                else:
+                    json.dump(output, f, default=str)
+
+    def _remember(self, key: str, output: Mapping[str, Any]) -> None:
+        """Keep an entry in memory, evicting the least recently used ones."""
+        with self._lock:
+            self._entries[key] = output
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _copy(output: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Copy an output (blob outputs are read-only and shared as they are)."""
+    if isinstance(output, BlobOutput):
+        return output
+    return copy.deepcopy(output)
+
+
+def _digest(*parts: str) -> str:
+    """Hash a sequence of strings into a cache key."""
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
@@ -0,0 +1,531 @@
+"""
+Watch mode: review source files as they are edited.
+
+A watcher reports changed source files under a directory, using inotify on
+Linux (through ctypes, no extra dependency) and polling modification times
+elsewhere. Bursts of saves are debounced into one batch; for each changed file
+only the lines that differ from the last seen version, widened to their
+enclosing function, are sent to the Code Reviewer (see diff_review). Reviews of
+a batch run concurrently on a warm orchestrator and are printed as they arrive.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .agents.cancellation import CancellationToken
+from .agents.repo_summarizer import SKIPPED_DIRECTORIES, SOURCE_EXTENSIONS
+
+# inotify constants (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+# Editors write files in several steps (truncate, write, rename); the final
+# close or rename is enough to notice a save
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_MODIFY
+)
+
+_EVENT = struct.Struct("iIII")  # watch descriptor, mask, cookie, name length
+
+
+def is_watched_file(path: str) -> bool:
+    """Whether a path is a source file the watcher reports."""
+    return os.path.splitext(path)[1] in SOURCE_EXTENSIONS
+
+
+def _skipped(name: str) -> bool:
+    """Whether a directory is left out of the watch."""
+    return name.startswith(".") or name in SKIPPED_DIRECTORIES
+
+
+def scan_files(root: str) -> Dict[str, float]:
+    """
+    Find the watched files under a directory.
+
+    Args:
+        root: Directory to scan
+
+    Returns:
+        Modification time of each source file, by path relative to root
+    """
+    files = {}
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories[:] = [name for name in subdirectories if not _skipped(name)]
+        for filename in filenames:
+            if not is_watched_file(filename):
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                files[os.path.relpath(path, root).replace(os.sep, "/")] = os.stat(
+                    path
+                ).st_mtime_ns
+            except OSError:
+                continue
+    return files
+
+
+class PollingWatcher:
+    """Detects changes by rescanning modification times at an interval."""
+
+    backend = "polling"
+
+    def __init__(self, root: str, interval: float = 1.0):
+        """
+        Initialize the watcher.
+
+        Args:
+            root: Directory to watch
+            interval: Seconds between scans
+        """
+        self.root = root
+        self.interval = interval
+        self._files = scan_files(root)
+        self._next_scan = time.monotonic() + interval
+
+    def changes(self, timeout: float) -> Set[str]:
+        """
+        Wait up to timeout seconds for changes.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Paths (relative to root) of files created, modified or deleted
+        """
+        delay = self._next_scan - time.monotonic()
+        if delay > timeout:
+            time.sleep(max(timeout, 0))
+            return set()
+        time.sleep(max(delay, 0))
+        self._next_scan = time.monotonic() + self.interval
+
+        files = scan_files(self.root)
+        changed = {
+            path
+            for path in files.keys() | self._files.keys()
+            if files.get(path) != self._files.get(path)
+        }
+        self._files = files
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher (recursive), through the C library."""
+
+    backend = "inotify"
+
+    def __init__(self, root: str):
+        """
+        Initialize the watcher.
+
+        Args:
+            root: Directory to watch
+
+        Raises:
+            OSError: If inotify is unavailable or a watch cannot be added
+                (e.g. fs.inotify.max_user_watches is exhausted)
+        """
+        library = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(library or "libc.so.6", use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+
+        self.root = root
+        self._fd = self._libc.inotify_init1(IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        self._directories: Dict[int, str] = {}
+        try:
+            self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def changes(self, timeout: float) -> Set[str]:
+        """
+        Wait up to timeout seconds for changes.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Paths (relative to root) of files created, modified or deleted
+        """
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not readable:
+            return set()
+
+        data = os.read(self._fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            descriptor, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = (
+                data[offset : offset + length]
+                .rstrip(b"\0")
+                .decode("utf-8", "surrogateescape")
+            )
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: report every file
+                changed.update(scan_files(self.root))
+                continue
+            if mask & IN_IGNORED:
+                self._directories.pop(descriptor, None)
+                continue
+
+            directory = self._directories.get(descriptor)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not _skipped(name):
+                    # New directory: watch it and report what it already holds
+                    try:
+                        self._watch_tree(path)
+                    except OSError:
+                        continue
+                    relative = os.path.relpath(path, self.root).replace(os.sep, "/")
+                    changed.update(f"{relative}/{file}" for file in scan_files(path))
+                continue
+
+            if is_watched_file(name):
+                changed.add(os.path.relpath(path, self.root).replace(os.sep, "/"))
+        return changed
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _watch_tree(self, root: str) -> None:
+        """Add watches for a directory and its subdirectories."""
+        for directory, subdirectories, _ in os.walk(root):
+            subdirectories[:] = [name for name in subdirectories if not _skipped(name)]
+            descriptor = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), WATCH_MASK
+            )
+            if descriptor < 0:
+                error = ctypes.get_errno()
+                raise OSError(error, f"{os.strerror(error)}: {directory}")
+            self._directories[descriptor] = directory
+
+
+def create_watcher(root: str, polling: bool = False, interval: float = 1.0) -> Any:
+    """
+    Create the best available watcher for a directory.
+
+    Args:
+        root: Directory to watch
+        polling: Always poll instead of using inotify
+        interval: Polling interval in seconds
+
+    Returns:
+        InotifyWatcher on Linux when available, else PollingWatcher
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except OSError:
+            pass
+    return PollingWatcher(root, interval)
+
+
+class Debouncer:
+    """Collects changed paths until they stop changing."""
+
+    def __init__(self, quiet: float = 0.5, max_delay: float = 5.0):
+        """
+        Initialize the debouncer.
+
+        Args:
+            quiet: Seconds without new changes after which a batch is due
+            max_delay: Seconds after the first change after which a batch is due
+                even if changes keep arriving
+        """
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self._pending: Set[str] = set()
+        self._first: Optional[float] = None
+        self._last: Optional[float] = None
+
+    def add(self, paths: Set[str], now: Optional[float] = None) -> None:
+        """Record changed paths."""
+        if not paths:
+            return
+        now = time.monotonic() if now is None else now
+        self._pending |= paths
+        self._first = self._first if self._first is not None else now
+        self._last = now
+
+    def timeout(self, now: Optional[float] = None, idle: float = 1.0) -> float:
+        """Seconds until the pending batch is due (idle if nothing is pending)."""
+        if not self._pending:
+            return idle
+        now = time.monotonic() if now is None else now
+        due = min(self._last + self.quiet, self._first + self.max_delay)
+        return max(due - now, 0.0)
+
+    def due(self, now: Optional[float] = None) -> bool:
+        """Whether the pending batch should be processed now."""
+        return bool(self._pending) and self.timeout(now) == 0.0
+
+    def drain(self) -> Set[str]:
+        """Take the pending batch."""
+        paths, self._pending = self._pending, set()
+        self._first = self._last = None
+        return paths
+
+
+class WatchReviewer:
+    """Reviews the changed parts of files under a directory as they are saved."""
+
+    def __init__(
+        self,
+        orchestrator: Any,
+        root: str,
+        watcher: Optional[Any] = None,
+        debounce: float = 0.5,
+        max_workers: int = 4,
+    ):
+        """
+        Initialize the watch reviewer.
+
+        Args:
+            orchestrator: SimpleMultiAgentOrchestrator used for the reviews
+            root: Directory to watch
+            watcher: Watcher to use (defaults to create_watcher(root))
+            debounce: Seconds of quiet before a burst of saves is reviewed
+            max_workers: Maximum number of concurrent reviews
+        """
+        from .diff_review import DiffReviewer
+
+        self.orchestrator = orchestrator
+        self.root = root
+        self.watcher = watcher or create_watcher(root)
+        self.debouncer = Debouncer(quiet=debounce)
+        self.reviewer = DiffReviewer(orchestrator, max_workers=max_workers)
+        self.stats = {"batches": 0, "files": 0, "regions": 0}
+        # Last reviewed (or initial) content of each file
+        self._contents: Dict[str, str] = {}
+        for path in scan_files(root):
+            content = self._read(path)
+            if content is not None:
+                self._contents[path] = content
+
+    @property
+    def file_count(self) -> int:
+        """Number of source files being tracked."""
+        return len(self._contents)
+
+    def run(
+        self,
+        on_result: Callable[[Any, Any], None],
+        on_batch: Optional[Callable[[List[str], int], None]] = None,
+        stop: Optional[threading.Event] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> None:
+        """
+        Watch and review until stopped.
+
+        Args:
+            on_result: Callback receiving (region, task result) for each review
+            on_batch: Optional callback receiving (changed files, region count)
+                before a batch is reviewed
+            stop: Optional event ending the loop
+            cancel_token: Optional token ending the loop and cancelling the
+                reviews in progress
+        """
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                if cancel_token and cancel_token.cancelled:
+                    break
+                self.debouncer.add(self.watcher.changes(self.debouncer.timeout()))
+                if self.debouncer.due():
+                    self.review_changes(
+                        self.debouncer.drain(), on_result, on_batch, cancel_token
+                    )
+        finally:
+            self.watcher.close()
+
+    def review_changes(
+        self,
+        paths: Set[str],
+        on_result: Optional[Callable[[Any, Any], None]] = None,
+        on_batch: Optional[Callable[[List[str], int], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> List[Any]:
+        """
+        Review what changed in files since they were last seen.
+
+        Args:
+            paths: Changed files, relative to the watched directory
+            on_result: Optional callback receiving (region, task result)
+            on_batch: Optional callback receiving (changed files, region count)
+            cancel_token: Optional token cancelling the reviews
+
+        Returns:
+            List of (region, task result) pairs
+        """
+        from .diff_review import build_regions, diff_hunks
+
+        hunks = []
+        sources = {}
+        changed = []
+        for path in sorted(paths):
+            content = self._read(path)
+            previous = self._contents.get(path, "")
+            if content is None:
+                # Deleted (or unreadable): nothing left to review
+                self._contents.pop(path, None)
+                continue
+            if content == previous:
+                continue
+            self._contents[path] = content
+            file_hunks = diff_hunks(path, previous, content)
+            if file_hunks:
+                hunks.extend(file_hunks)
+                sources[path] = content
+                changed.append(path)
+
+        regions = build_regions(hunks, sources)
+        if not regions:
+            return []
+
+        self.stats["batches"] += 1
+        self.stats["files"] += len(changed)
+        self.stats["regions"] += len(regions)
+        if on_batch:
+            on_batch(changed, len(regions))
+        return self.reviewer.review_regions(regions, on_result, cancel_token)
+
+    def _read(self, path: str) -> Optional[str]:
+        """Read a watched file, or None if it is gone or not text."""
+        try:
+            with open(os.path.join(self.root, path), "r") as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Watch a directory and review changes as files are saved."""
+    from colorama import Fore, Style
+
+    from .multi_agent_orchestrator import SimpleMultiAgentOrchestrator
+
+    parser = argparse.ArgumentParser(
+        description="Review changed code whenever files are saved"
+    )
+    parser.add_argument("directory", nargs="?", default=".", help="Directory to watch")
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=float(os.getenv("WATCH_DEBOUNCE", "0.5")),
+        help="Seconds of quiet before a burst of saves is reviewed",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        default=os.getenv("WATCH_POLLING", "False").lower() == "true",
+        help="Poll for changes instead of using inotify",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=float(os.getenv("WATCH_POLL_INTERVAL", "1.0")),
+        help="Polling interval in seconds",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Maximum concurrent reviews"
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"{Fore.RED}❌ Not a directory: {args.directory}{Style.RESET_ALL}")
+        return 1
+
+    try:
+        orchestrator = SimpleMultiAgentOrchestrator(verbose=False)
+    except ValueError as e:
+        print(f"{Fore.RED}❌ Failed to initialize agents: {e}{Style.RESET_ALL}")
+        return 1
+
+    watcher = create_watcher(args.directory, polling=args.poll, interval=args.interval)
+    session = WatchReviewer(
+        orchestrator,
+        args.directory,
+        watcher=watcher,
+        debounce=args.debounce,
+        max_workers=args.workers,
+    )
+    agent = orchestrator.get_agent("code_reviewer")
+    token = CancellationToken()
+    print_lock = threading.Lock()
+
+    def on_batch(files: List[str], regions: int) -> None:
+        print(
+            f"\n{Fore.CYAN}🔄 {len(files)} file(s) changed ({', '.join(files)}), "
+            f"reviewing {regions} region(s)...{Style.RESET_ALL}"
+        )
+
+    def on_result(region: Any, result: Any) -> None:
+        with print_lock:
+            if token.cancelled:
+                return
+            print(f"\n{Fore.GREEN}📍 {region.location}{Style.RESET_ALL}")
+            if result.success:
+                if result.cache_hit:
+                    print(f"♻️  {result.cache_hit} cache hit")
+                print(agent.format_output(result.output))
+            else:
+                print(
+                    f"{Fore.RED}❌ Review failed: {result.error_message}{Style.RESET_ALL}"
+                )
+
+    print(
+        f"{Fore.CYAN}👀 Watching {os.path.abspath(args.directory)} "
+        f"({session.file_count} files, {watcher.backend}); "
+        f"Ctrl+C to stop{Style.RESET_ALL}"
+    )
+    try:
+        session.run(on_result, on_batch, cancel_token=token)
+    except KeyboardInterrupt:
+        token.cancel("Stopped watching")
+        print(
+            f"\n{Fore.YELLOW}👋 Stopped watching after {session.stats['batches']} "
+            f"batch(es), {session.stats['regions']} region(s) reviewed{Style.RESET_ALL}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
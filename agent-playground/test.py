@@ -4,7 +4,12 @@ Simple test script for Multi-Agent Developer System.
 """
 
 import os
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
 
 # Add src directory to path
@@ -74,13 +79,37 @@ def test_file_structure():
         "examples/example_code.py",
         "src/__init__.py",
         "src/cli.py",
+        "src/concurrency.py",
+        "src/diff_review.py",
         "src/multi_agent_orchestrator.py",
+        "src/task_cache.py",
+        "src/result_writer.py",
+        "src/scheduler.py",
+        "src/pipeline.py",
+        "src/profiling.py",
         "src/agents/__init__.py",
         "src/agents/base_agent.py",
         "src/agents/code_reviewer.py",
         "src/agents/test_writer.py",
         "src/agents/documentation_agent.py",
         "src/agents/architecture_advisor.py",
+        "src/agents/cassette.py",
+        "src/agents/compaction.py",
+        "src/agents/micro_batcher.py",
+        "src/agents/static_analysis.py",
+        "src/agents/repo_summarizer.py",
+        "src/retrieval.py",
+        "src/history_store.py",
+        "src/blob_store.py",
+        "src/daemon.py",
+        "src/jobs.py",
+        "src/watcher.py",
+        "src/agents/verification.py",
+        "src/agents/doc_index.py",
+        "src/agents/cancellation.py",
+        "src/agents/normalization.py",
+        "src/agents/section_parsers.py",
+        "src/agents/token_budget.py",
     ]
 
     all_exist = True
@@ -142,6 +171,1725 @@ def test_environment_template():
     return True
 
 
+def test_cassette():
+    """Check that cassettes replay only complete responses."""
+    print("\n📼 Testing cassette record/replay...")
+
+    try:
+        from langchain_core.messages import AIMessage, HumanMessage
+
+        from src.agents.cassette import Cassette
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    params = {"model": "gpt-4o", "temperature": 0.2, "max_tokens": 2000}
+    complete = [HumanMessage(content="review a")]
+    truncated = [HumanMessage(content="review b")]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cassette.jsonl.gz")
+        recorder = Cassette(path, "record")
+        recorder.invoke(lambda: AIMessage(content="full review"), complete, params)
+        for degraded in ("partial", "reduced", "cancelled"):
+            recorder.invoke(
+                lambda: AIMessage(
+                    content="cut off", response_metadata={"degraded": degraded}
+                ),
+                truncated,
+                params,
+            )
+
+        player = Cassette(path, "replay")
+        replayed = player.invoke(lambda: None, complete, params).content
+        try:
+            player.invoke(lambda: None, truncated, params)
+            degraded_replayed = True
+        except ValueError:
+            degraded_replayed = False
+
+    checks = [
+        (len(player) == 1, "only the complete response is recorded"),
+        (replayed == "full review", "recorded responses are replayed"),
+        (not degraded_replayed, "degraded responses are never replayed"),
+    ]
+    return _report(checks)
+
+
+def test_normalization():
+    """Check canonical hashing and the result cache."""
+    print("\n🗝️  Testing input normalization and the result cache...")
+
+    try:
+        from src.agents.normalization import canonical_hash
+        from src.task_cache import TaskCache
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    original = (
+        "import os\nimport sys\n\n"
+        "def area(width, height):\n    result = width * height\n    return result\n"
+    )
+    reformatted = (
+        "import sys\nimport os\n\n"
+        "def area(width, height):\n"
+        '    """Area of a rectangle."""\n'
+        "    total = width * height  # renamed local\n"
+        "    return total\n"
+    )
+
+    cache = TaskCache(policy="normalized", max_entries=2)
+    cache.put("code_review", original, {"review": "ok", "sections": {}})
+    hit = cache.get("code_review", reformatted)
+    hit[0]["sections"]["bugs"] = "changed by the caller"
+    again = cache.get("code_review", original)
+    scoped = cache.get("code_review", original, scope=("gpt-4o", "0.2"))
+    for index in range(3):
+        cache.put("code_review", f"x = {index}", {"review": str(index)})
+
+    checks = [
+        (
+            hit is not None and hit[1] == "normalized",
+            "comments, docstrings, local names and import order are normalized",
+        ),
+        (again[0]["sections"] == {}, "cached outputs are returned as copies"),
+        (scoped is None, "the agent settings are part of the key"),
+        (
+            canonical_hash("#define N 10") != canonical_hash("#define N 99")
+            and canonical_hash("#include <a.h>") != canonical_hash("#include <b.h>"),
+            "code in an unknown language keeps its '#' lines",
+        ),
+        (
+            canonical_hash("x = a // b") != canonical_hash("x = a // c"),
+            "Python floor division is not taken for a comment",
+        ),
+        (
+            canonical_hash("int n; // a", "C++")
+            == canonical_hash("int n; // b", "C++"),
+            "comments of a known language are ignored",
+        ),
+        (cache.get_stats()["entries"] == 2, "the in-memory cache is bounded"),
+    ]
+    return _report(checks)
+
+
+def test_compaction():
+    """Check that compacted inputs map back to original line numbers."""
+    print("\n✂️  Testing input compaction...")
+
+    try:
+        from src.agents.compaction import compact_source
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    source = "\n".join(
+        ["# Copyright (c) Example", "# License: MIT", "", "def f(x):", "", "", ""]
+        + ["    return x"]
+    )
+    compacted = compact_source(source, "Python")
+    code_line = compacted.text.split("\n").index("    return x") + 1
+
+    checks = [
+        (
+            "Copyright" not in compacted.text and code_line < 8,
+            "license headers and blank runs are removed",
+        ),
+        (
+            compacted.remap_line_references(f"see line {code_line}") == "see line 8",
+            "line references map back to the original lines",
+        ),
+        (
+            compacted.report()["tokens_saved"] > 0,
+            "the report counts the saved tokens",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_diff_review():
+    """Check the mapping of a git diff to review regions."""
+    print("\n🔀 Testing diff review regions...")
+
+    try:
+        from src.diff_review import DiffReviewer
+        from src.multi_agent_orchestrator import TaskResult, TaskType
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    class ReviewStub:
+        """Orchestrator stand-in answering every review with a line reference."""
+
+        def execute_batch(self, tasks, max_workers, on_result, cancel_token):
+            results = []
+            for index, task in enumerate(tasks):
+                result = TaskResult(
+                    agent_name="Code Reviewer",
+                    task_type=TaskType.CODE_REVIEW,
+                    input_data=task["input_data"],
+                    output={"review": "Bug on line 2", "sections": {}},
+                    timestamp=datetime.now(),
+                    execution_time=0.0,
+                    success=True,
+                )
+                on_result(index, result)
+                results.append(result)
+            return results
+
+    python_source = "\n".join(
+        ["import os", "", "def first():", "    a = 1", "    return a", ""]
+        + [f"x{n} = {n}" for n in range(30)]
+        + ["", "def second():", "    return 2", ""]
+    )
+    c_source = "int f() {\n  counter++;\n  return 0;\n}\n"
+
+    with tempfile.TemporaryDirectory() as repo:
+
+        def git(*args):
+            subprocess.run(
+                ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+                + list(args),
+                cwd=repo,
+                check=True,
+                capture_output=True,
+            )
+
+        os.makedirs(os.path.join(repo, "src"))
+        for name, text in (("module.py", python_source), ("src/count.c", c_source)):
+            with open(os.path.join(repo, name), "w") as f:
+                f.write(text)
+        git("init", "-q")
+        git("config", "diff.mnemonicPrefix", "true")
+        git("add", ".")
+        git("commit", "-qm", "initial")
+
+        with open(os.path.join(repo, "module.py"), "w") as f:
+            f.write(
+                python_source.replace("a = 1", "a = 10").replace(
+                    "return 2", "return 20"
+                )
+            )
+        with open(os.path.join(repo, "src/count.c"), "w") as f:
+            f.write(c_source.replace("counter++;", "++ counter;"))
+
+        # Run from a subdirectory: diff paths are relative to the root
+        reviewer = DiffReviewer(ReviewStub(), repo_dir=os.path.join(repo, "src"))
+        regions = reviewer.collect_regions("HEAD")
+        reviews = reviewer.review_regions(regions)
+
+    located = {(r.path, r.start, r.end) for r in regions}
+    c_regions = [r for r in regions if r.path == "src/count.c"]
+
+    checks = [
+        (
+            {("module.py", 3, 5), ("module.py", 38, 39)} <= located,
+            "Python hunks are widened to their enclosing functions",
+        ),
+        (
+            len(c_regions) == 1
+            and [h.added for h in c_regions[0].hunks] == [["  ++ counter;"]],
+            "an added '++' line is not taken for a file header",
+        ),
+        (
+            reviews[0][1].output["review"] == f"Bug on line {regions[0].start + 1}",
+            "region-relative line references are shifted to file lines",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_concurrency_limiter():
+    """Check the AIMD limiter and what counts as overload."""
+    print("\n🚦 Testing adaptive concurrency...")
+
+    try:
+        import httpx
+        import openai
+
+        from src.agents.cancellation import TaskCancelled
+        from src.concurrency import AdaptiveConcurrencyLimiter
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    request = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+
+    def provider_error(status, error_type):
+        response = httpx.Response(status, request=request)
+        return error_type("provider error", response=response, body=None)
+
+    def fail(limiter, error):
+        try:
+            with limiter.slot():
+                raise error
+        except Exception:
+            pass
+
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=9, cooldown=0)
+    fail(limiter, TimeoutError("Deadline exceeded before the request was sent"))
+    fail(limiter, TaskCancelled("Cancelled by user"))
+    fail(limiter, provider_error(500, openai.InternalServerError))
+    unchanged = limiter.limit
+    fail(limiter, provider_error(429, openai.RateLimitError))
+    after_rate_limit = limiter.limit
+    fail(limiter, openai.APITimeoutError(request=request))
+    after_timeout = limiter.limit
+    for _ in range(after_timeout):
+        with limiter.slot():
+            pass
+
+    stats = limiter.get_stats()
+    checks = [
+        (unchanged == 8, "deadlines, cancellations and other errors keep the limit"),
+        (after_rate_limit == 4, "a rate limit halves the limit"),
+        (after_timeout == 2, "a provider timeout halves the limit"),
+        (stats["limit"] == 3, "a full window of successes adds one slot"),
+        (
+            [event["reason"] for event in stats["recent_backoffs"]]
+            == ["rate_limit", "timeout"],
+            "backoff events are reported",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_section_parsers():
+    """Check that streamed sections do not depend on chunk boundaries."""
+    print("\n📑 Testing incremental section parsers...")
+
+    try:
+        from src.agents.section_parsers import (
+            MarkdownSectionParser,
+            ReviewSectionParser,
+        )
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    def parse(parser, text, size):
+        segments = []
+        for index in range(0, len(text), size):
+            segments += parser.feed(text[index : index + size])
+        return segments + parser.close(), parser.result()
+
+    markdown = "# Title\nIntro\n## Usage\nRun it\n## API Reference\nfunctions\n"
+    review = "Overview\nBugs found:\n- off by one\nSecurity concerns:\n- eval on input"
+
+    whole = parse(MarkdownSectionParser(), markdown, len(markdown))
+    chunked = parse(MarkdownSectionParser(), markdown, 3)
+    review_whole = parse(ReviewSectionParser(), review, len(review))
+    review_chunked = parse(ReviewSectionParser(), review, 2)
+
+    checks = [
+        (
+            whole == chunked
+            and [name for name, _ in whole[0]]
+            == ["introduction", "usage", "api_reference"],
+            "Markdown sections do not depend on chunk boundaries",
+        ),
+        (
+            review_whole == review_chunked
+            and [name for name, _ in review_whole[0]]
+            == ["general", "bugs", "security"],
+            "review segments are emitted as each category closes",
+        ),
+        (
+            review_whole[1]["security"] == "Security concerns:\n- eval on input",
+            "the section still open at the end is kept",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_json_lines():
+    """Check that concurrent results are written as whole JSON lines."""
+    print("\n🧾 Testing JSON Lines output...")
+
+    try:
+        import gzip
+        import json
+        import threading
+
+        from src.multi_agent_orchestrator import TaskResult, TaskType
+        from src.result_writer import JsonLinesWriter
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    def result(index):
+        return TaskResult(
+            agent_name="Code Reviewer",
+            task_type=TaskType.CODE_REVIEW,
+            input_data=f"def f{index}(): pass",
+            output={"review": "line\n" * 200},
+            timestamp=datetime(2024, 1, 1, 12, 0),
+            execution_time=0.5,
+            success=True,
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results.jsonl.gz")
+        with JsonLinesWriter(path) as writer:
+            threads = [
+                threading.Thread(
+                    target=lambda start=start: [
+                        writer.write(result(i)) for i in range(start, start + 25)
+                    ]
+                )
+                for start in range(0, 100, 25)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+
+    restored = TaskResult.from_dict(records[0])
+    checks = [
+        (writer.count == 100 and len(records) == 100, "every result is one line"),
+        (
+            sorted(r["input_data"] for r in records)
+            == sorted(f"def f{i}(): pass" for i in range(100)),
+            "lines from concurrent writers do not interleave",
+        ),
+        (
+            restored.task_type == TaskType.CODE_REVIEW
+            and restored.output == result(0).output,
+            "records convert back to TaskResults",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_priority_scheduler():
+    """Check priority order and aging of queued tasks."""
+    print("\n🎚️  Testing priority scheduling...")
+
+    try:
+        import threading
+
+        from src.scheduler import Priority, PriorityScheduler
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    def run(aging_interval, batch_wait):
+        """Queue batch, normal and interactive tasks behind a blocked worker."""
+        scheduler = PriorityScheduler(
+            max_workers=1, reserved_interactive=0, aging_interval=aging_interval
+        )
+        gate = threading.Event()
+        order = []
+        scheduler.submit(gate.wait, Priority.INTERACTIVE)
+        futures = [scheduler.submit(lambda: order.append("batch"), Priority.BATCH)]
+        time.sleep(batch_wait)
+        for priority in (Priority.NORMAL, Priority.INTERACTIVE):
+            futures.append(
+                scheduler.submit(
+                    lambda name=priority.value: order.append(name), priority
+                )
+            )
+        gate.set()
+        for future in futures:
+            future.result(timeout=10)
+        stats = scheduler.get_stats()
+        scheduler.shutdown()
+        return order, stats["classes"]["batch"]["aged"]
+
+    fresh_order, fresh_aged = run(aging_interval=0, batch_wait=0.0)
+    aged_order, aged = run(aging_interval=0.05, batch_wait=0.3)
+
+    checks = [
+        (
+            fresh_order == ["interactive", "normal", "batch"] and fresh_aged == 0,
+            "queued tasks run in priority order",
+        ),
+        (
+            aged_order == ["batch", "interactive", "normal"] and aged == 1,
+            "a batch task waiting long enough is promoted ahead of newer tasks",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_pipeline():
+    """Check that pipeline outputs feed dependents and failures are contained."""
+    print("\n🔗 Testing the agent pipeline...")
+
+    try:
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.multi_agent_orchestrator import TaskResult, TaskType
+        from src.pipeline import AgentPipeline, PipelineNode, full_analysis_nodes
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    class PipelineStub:
+        """Orchestrator stand-in; documentation tasks cannot be scheduled."""
+
+        def __init__(self):
+            self.pool = ThreadPoolExecutor(max_workers=4)
+            self.contexts = {}
+
+        def submit_task(self, task_type, input_data, context=None, **options):
+            if task_type == TaskType.DOCUMENTATION:
+                raise RuntimeError("scheduler is shut down")
+            self.contexts[task_type] = context or {}
+            output = {"review": "Bug: off by one", "sections": {"bugs": "off by one"}}
+            return self.pool.submit(
+                lambda: TaskResult(
+                    agent_name="stub",
+                    task_type=task_type,
+                    input_data=input_data,
+                    output=output,
+                    timestamp=datetime.now(),
+                    execution_time=0.01,
+                    success=True,
+                )
+            )
+
+    stub = PipelineStub()
+    runs = []
+    worker = threading.Thread(
+        target=lambda: runs.append(
+            AgentPipeline(stub, full_analysis_nodes()).run("def f(): pass")
+        ),
+        daemon=True,
+    )
+    worker.start()
+    worker.join(timeout=10)
+    stub.pool.shutdown()
+
+    try:
+        AgentPipeline(
+            stub,
+            [
+                PipelineNode("a", TaskType.CODE_REVIEW, depends_on=["b"]),
+                PipelineNode("b", TaskType.DOCUMENTATION, depends_on=["a"]),
+            ],
+        )
+        cycle_rejected = False
+    except ValueError:
+        cycle_rejected = True
+
+    run = runs[0] if runs else None
+    checks = [
+        (run is not None, "a stage that cannot be scheduled does not hang the run"),
+        (
+            run is not None
+            and not run.results["documentation"].success
+            and run.results["test_generation"].success,
+            "the failed stage is reported and independent stages complete",
+        ),
+        (
+            stub.contexts.get(TaskType.TEST_GENERATION, {}).get("known_issues")
+            == "off by one",
+            "review findings are passed to test generation",
+        ),
+        (
+            run is not None and run.critical_path[-1] in run.results,
+            "the critical path is reported",
+        ),
+        (cycle_rejected, "dependency cycles are rejected"),
+    ]
+    return _report(checks)
+
+
+def test_profiling():
+    """Check per-task profiles and the attribution of allocations."""
+    print("\n📈 Testing task profiling...")
+
+    try:
+        import threading
+        import tracemalloc
+
+        from src.profiling import TaskProfiler
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    was_tracing = tracemalloc.is_tracing()
+    kept = []
+
+    def allocate():
+        kept.append([str(n) for n in range(20000)])
+
+    with tempfile.TemporaryDirectory() as directory:
+        profiler = TaskProfiler(mode="sample", output_dir=directory, trace_memory=True)
+        with profiler.profile("Code Reviewer"):
+            allocate()
+
+        # Two tasks running at the same time cannot be told apart
+        both_running = threading.Barrier(2)
+
+        def overlapping():
+            with profiler.profile("Test Writer"):
+                both_running.wait(timeout=5)
+                allocate()
+                both_running.wait(timeout=5)
+
+        threads = [threading.Thread(target=overlapping) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        paths = profiler.write_reports()
+        with open(os.path.join(directory, "report.txt")) as f:
+            report = f.read()
+
+    if not was_tracing:
+        tracemalloc.stop()
+
+    stats = profiler.get_stats()
+    checks = [
+        (
+            stats["tasks"] == {"Code Reviewer": 1, "Test Writer": 2},
+            "every task is counted for its agent",
+        ),
+        (
+            "Code Reviewer" in profiler.allocations
+            and "Test Writer" not in profiler.allocations,
+            "allocations are only attributed to tasks that ran alone",
+        ),
+        (
+            stats["memory_skipped"] == 2 and "2 task(s) left out" in report,
+            "the report says which tasks were left out",
+        ),
+        (
+            TaskProfiler().trace_memory is False,
+            "memory tracing is opt-in",
+        ),
+        (any(p.endswith("report.txt") for p in paths), "reports are written"),
+    ]
+    return _report(checks)
+
+
+def test_deadlines():
+    """Check that only tasks the deadline kept from starting are skipped."""
+    print("\n⏱️  Testing deadline handling...")
+
+    try:
+        from src.multi_agent_orchestrator import SimpleMultiAgentOrchestrator, TaskType
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    class SlowAgent:
+        """Agent stand-in whose request times out after the deadline."""
+
+        name = "slow_agent"
+        role = "Times out"
+
+        def __init__(self):
+            self.calls = 0
+
+        def cache_scope(self):
+            return {}
+
+        def process(self, input_data, context, on_section, deadline_at, cancel_token):
+            self.calls += 1
+            time.sleep(max(0.0, deadline_at - time.monotonic()))
+            raise TimeoutError("Request timed out")
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    orchestrator = SimpleMultiAgentOrchestrator(verbose=False)
+    agent = SlowAgent()
+    orchestrator.agents[agent.name] = agent
+
+    expired = orchestrator.execute_task(
+        TaskType.CODE_REVIEW,
+        "def f(): pass",
+        agent_name=agent.name,
+        verbose=False,
+        deadline_at=time.monotonic() - 1,
+    )
+    timed_out = orchestrator.execute_task(
+        TaskType.CODE_REVIEW,
+        "def g(): pass",
+        agent_name=agent.name,
+        verbose=False,
+        deadline_at=time.monotonic() + 0.05,
+    )
+
+    checks = [
+        (expired.degraded == "skipped", "a task past its deadline is skipped"),
+        (agent.calls == 1, "a skipped task never reaches the agent"),
+        (
+            not timed_out.success and timed_out.degraded is None,
+            "a task that started and then timed out stays a failure",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_token_budget():
+    """Check that output budgets follow the agent and the input."""
+    print("\n🎚️  Testing token budgets...")
+
+    try:
+        from src.agents.token_budget import count_symbols, policy_for
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    one_function = "def add(a, b):\n    return a + b\n"
+    many_functions = "".join(f"def f{i}(x):\n    return x + {i}\n\n" for i in range(8))
+    module = (
+        "class Store:\n"
+        "    def get(self, key):\n        pass\n"
+        "    def _load(self):\n        pass\n\n"
+        "def _helper():\n    pass\n"
+    )
+    javascript = "export function load(path) {\n}\nclass Cache {\n}\n"
+
+    writer = policy_for("Test Writer")
+    huge = "".join(f"def f{i}(x):\n    return x\n\n" for i in range(100))
+
+    checks = [
+        (
+            count_symbols(module) == {"functions": 3, "classes": 1, "public": 2},
+            "Python symbols are counted from the syntax tree",
+        ),
+        (
+            count_symbols(javascript, "javascript")
+            == {"functions": 1, "classes": 1, "public": 2},
+            "other languages are counted with patterns",
+        ),
+        (
+            writer.budget(many_functions) > writer.budget(one_function),
+            "test budgets grow with the number of functions",
+        ),
+        (
+            writer.budget(huge) == writer.max_tokens
+            and writer.budget("") == writer.min_tokens,
+            "budgets are clamped to the policy's range",
+        ),
+        (policy_for("Unknown Agent") is None, "unknown agents have no policy"),
+    ]
+    return _report(checks)
+
+
+def test_micro_batcher():
+    """Check that concurrent requests share batches and cancels drop out."""
+    print("\n📦 Testing micro-batching...")
+
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.agents.cancellation import CancellationToken, TaskCancelled
+        from src.agents.micro_batcher import MicroBatcher
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    class BatchLLM:
+        """LLM stand-in echoing each prompt with its bound options."""
+
+        def __init__(self, sent, options=None):
+            self.sent = sent
+            self.options = options or {}
+
+        def bind(self, **options):
+            return BatchLLM(self.sent, options)
+
+        def batch(self, inputs, config=None, return_exceptions=False):
+            self.sent.append(list(inputs))
+            return [f"{prompt}:{self.options.get('max_tokens')}" for prompt in inputs]
+
+    sent = []
+    llm = BatchLLM(sent)
+    batcher = MicroBatcher(lambda: llm, window=1.0, max_batch_size=4)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(
+            pool.map(lambda i: batcher.invoke(f"p{i}", max_tokens=100), range(4))
+        )
+    full_batch = list(sent)
+
+    sent.clear()
+    mixed = MicroBatcher(lambda: llm, window=0.05, max_batch_size=4)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        split = list(
+            pool.map(lambda size: mixed.invoke("p", max_tokens=size), (100, 200))
+        )
+    split_batches = len(sent)
+
+    sent.clear()
+    slow = MicroBatcher(lambda: llm, window=0.3, max_batch_size=4)
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel).start()
+    try:
+        slow.invoke("dropped", cancel_token=token)
+        cancelled = False
+    except TaskCancelled:
+        cancelled = True
+    time.sleep(0.4)
+
+    checks = [
+        (
+            len(full_batch) == 1 and sorted(full_batch[0]) == ["p0", "p1", "p2", "p3"],
+            "concurrent requests are sent as one batch",
+        ),
+        (
+            responses == ["p0:100", "p1:100", "p2:100", "p3:100"],
+            "each caller receives its own response",
+        ),
+        (batcher.get_stats()["full_batches"] == 1, "full batches are counted"),
+        (
+            sorted(split) == ["p:100", "p:200"] and split_batches == 2,
+            "requests with different options are sent separately",
+        ),
+        (cancelled, "a cancelled request releases its caller"),
+        (
+            slow.get_stats()["requests"] == 0,
+            "a request cancelled in its window is never sent",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_static_analysis():
+    """Check the local analysis and the reviewer's static fast path."""
+    print("\n🔎 Testing static analysis fast path...")
+
+    try:
+        from src.agents.code_reviewer import CodeReviewer
+        from src.agents.static_analysis import analyze_source
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    code = (
+        "import os\n"
+        "def load(items=[]):\n"
+        "    try:\n"
+        "        return eval(items)\n"
+        "    except:\n"
+        "        return None\n"
+    )
+    report = analyze_source(code, "Python")
+    rules = {finding.rule for finding in report.findings}
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    previous = os.environ.get("STATIC_FAST_PATH")
+    os.environ["STATIC_FAST_PATH"] = "True"
+    try:
+        reviewer = CodeReviewer()
+    finally:
+        if previous is None:
+            del os.environ["STATIC_FAST_PATH"]
+        else:
+            os.environ["STATIC_FAST_PATH"] = previous
+
+    trivial = reviewer.process(
+        "def add(a, b):\n    return a + b\n", {"language": "python"}
+    )
+    broken = reviewer.process("def add(a, b)\n    return a + b\n", {"file": "m.py"})
+
+    checks = [
+        (
+            {"unused-import", "mutable-default", "eval", "bare-except"} <= rules,
+            "lint rules report the known problems",
+        ),
+        (
+            analyze_source("fn main() {}", "rust").parsed is False,
+            "other languages get line metrics only",
+        ),
+        (trivial.get("local") is True, "trivial Python input is reviewed locally"),
+        (
+            broken.get("local") is True and "bugs" in broken["sections"],
+            "a syntax error is reported without calling the LLM",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_summary_cache():
+    """Check that concurrent summary cache saves never corrupt the file."""
+    print("\n🗂️  Testing repository summary cache...")
+
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.agents.repo_summarizer import SummaryCache
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "summaries.json")
+        caches = []
+        for run in range(8):
+            cache = SummaryCache(path)
+            for key in range(50):
+                cache.put(f"run{run}-{key}", "summary " * 50)
+            caches.append(cache)
+
+        def save(cache):
+            try:
+                cache.save()
+            except Exception as e:
+                return e
+            return None
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            errors = [e for e in pool.map(save, caches) if e]
+
+        reloaded = SummaryCache(path)
+        entries = sum(1 for run in range(8) if reloaded.get(f"run{run}-0"))
+        leftovers = [name for name in os.listdir(directory) if name != "summaries.json"]
+
+        stale = SummaryCache(path)
+        stale.put("fresh", "kept")
+        stale.save()
+        pruned = SummaryCache(path)
+
+    checks = [
+        (not errors, "concurrent saves do not fail"),
+        (entries == 1, "the file holds one complete run"),
+        (not leftovers, "no temporary files are left behind"),
+        (
+            pruned.get("fresh") == "kept" and pruned.get("run0-0") is None,
+            "entries not used in a run are dropped on save",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_retrieval():
+    """Check BM25 retrieval and incremental index updates."""
+    print("\n🧭 Testing definition retrieval...")
+
+    try:
+        from src.retrieval import RetrievalIndex, tokenize
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    with tempfile.TemporaryDirectory() as root:
+        files = {
+            "http.py": (
+                "def parse_http_response(raw):\n"
+                '    """Split a raw HTTP response into headers and body."""\n'
+                "    return raw.split('\\r\\n\\r\\n', 1)\n"
+            ),
+            "store.py": (
+                "class SessionStore:\n"
+                '    """Keep user sessions in memory."""\n'
+                "    def get_session(self, session_id):\n"
+                "        return None\n"
+            ),
+        }
+        for name, text in files.items():
+            with open(os.path.join(root, name), "w") as f:
+                f.write(text)
+
+        index_path = os.path.join(root, ".index", "retrieval.json")
+        index = RetrievalIndex(root, index_path=index_path, top_k=2)
+        first_update = index.update()
+        unchanged_update = index.update()
+
+        results = index.search("body = parse_http_response(data)")
+        enriched = index.enrich(
+            "def handle(data):\n    return parse_http_response(data)\n"
+        )
+        own = index.enrich("def parse_http_response(raw):\n    return raw\n")
+
+        os.remove(os.path.join(root, "store.py"))
+        removed_update = index.update()
+        reloaded = RetrievalIndex(root, index_path=index_path)
+        session_results = reloaded.search("get_session")
+
+    checks = [
+        (
+            {"parsehttpresponse", "parse", "http", "response"}
+            <= set(tokenize("parseHTTPResponse")),
+            "identifiers are split into their camelCase parts",
+        ),
+        (
+            first_update == 2 and unchanged_update == 0 and removed_update == 1,
+            "only added, changed or removed files are re-indexed",
+        ),
+        (
+            results and results[0][1]["name"] == "parse_http_response",
+            "the matching definition ranks first",
+        ),
+        (
+            "parse_http_response" in (enriched or {}).get("related_definitions", ""),
+            "related definitions are added to the context",
+        ),
+        (own is None, "definitions from the input itself are not added"),
+        (
+            reloaded.documents and not session_results,
+            "the saved index reloads without the removed file",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_verification():
+    """Check that generated tests run isolated, and only for Python input."""
+    print("\n🧪 Testing generated test verification...")
+
+    try:
+        import socket
+
+        from langchain_core.language_models.fake_chat_models import (
+            FakeListChatModel,
+        )
+
+        from src.agents.test_writer import TestWriter
+        from src.agents.verification import TestVerifier
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    if not hasattr(os, "fork"):
+        print("⚠️  Skipped: test verification requires os.fork")
+        return True
+
+    source = "def add(a, b):\n    return a + b\n"
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    isolation_tests = (
+        "import os, socket, tempfile\n"
+        "from calculator import add\n\n"
+        "def test_add():\n"
+        "    assert add(1, 2) == 3\n\n"
+        "def test_environment():\n"
+        '    assert "OPENAI_API_KEY" not in os.environ\n'
+        "    assert os.listdir(os.getcwd()) == []\n"
+        '    assert os.environ["HOME"] == tempfile.gettempdir() == os.getcwd()\n\n'
+        "def test_network():\n"
+        "    try:\n"
+        f"        socket.create_connection(('127.0.0.1', {server.getsockname()[1]}), 2)\n"
+        "    except OSError:\n"
+        "        return\n"
+        "    raise AssertionError('network is reachable')\n"
+    )
+    library_tests = (
+        "import not_installed_lib\n"
+        "from calculator import add\n\n"
+        "def test_add():\n"
+        "    assert add(1, 2) == not_installed_lib.three\n"
+    )
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    verifier = TestVerifier(workers=1, timeout=20)
+    try:
+        isolated = verifier.verify(source, f"```python\n{isolation_tests}```")
+        library = verifier.verify(source, library_tests)
+
+        writer = TestWriter()
+        writer.verifier = verifier
+        writer.llm = FakeListChatModel(
+            responses=[f"```python\n{isolation_tests}```", "TEST(Add, Works) {}"]
+        )
+        python_result = writer.process(source)
+        cpp_result = writer.process("int add(int a, int b) { return a + b; }")
+    finally:
+        verifier.shutdown()
+        server.close()
+
+    checks = [
+        (
+            isolated["status"] == "passed" and isolated["passed"] == 3,
+            "tests run in an empty home without secrets or network",
+        ),
+        (
+            library["status"] == "skipped" and "not_installed_lib" in library["output"],
+            "tests needing a missing library are skipped, not aliased",
+        ),
+        (
+            python_result.get("verification", {}).get("status") == "passed",
+            "tests generated for Python input are verified",
+        ),
+        (
+            "verification" not in cpp_result,
+            "input that only defaults to Python is not verified",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_doc_index():
+    """Check that only complete sections are indexed, per prompt and settings."""
+    print("\n📚 Testing incremental documentation index...")
+
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+
+        from langchain_core.language_models.fake_chat_models import (
+            GenericFakeChatModel,
+        )
+        from langchain_core.messages import AIMessage
+
+        from src.agents.doc_index import DocumentationIndex
+        from src.agents.documentation_agent import DocumentationAgent
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    code = "def add(a, b):\n    return a + b\n"
+    documentation = "# Module\nAdds numbers.\n\n### add\nReturns the sum of a and b.\n"
+
+    def responses(*finish_reasons):
+        return iter(
+            AIMessage(
+                content=documentation,
+                response_metadata={"finish_reason": finish_reason},
+            )
+            for finish_reason in finish_reasons
+        )
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "doc_index.json")
+        agent = DocumentationAgent()
+        agent.doc_index = DocumentationIndex(path)
+        agent.llm = GenericFakeChatModel(messages=responses("length", "stop"))
+
+        agent.process(code, {"language": "Python"})
+        after_truncated = agent.doc_index.get_stats()["stored"]
+        agent.process(code, {"language": "Python"})
+        after_complete = agent.doc_index.get_stats()["stored"]
+
+        agent.llm = GenericFakeChatModel(messages=iter([]))
+        reused = agent.process(code, {"language": "Python"})
+
+        agent.temperature += 0.1
+        agent.llm = GenericFakeChatModel(messages=responses("stop"))
+        agent.process(code, {"language": "Python"})
+        after_temperature = agent.doc_index.get_stats()["stored"]
+
+        agent.system_prompt += " Be brief."
+        agent.llm = GenericFakeChatModel(messages=responses("stop"))
+        agent.process(code, {"language": "Python"})
+        after_prompt = agent.doc_index.get_stats()["stored"]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: agent.doc_index.save(), range(16)))
+        reloaded = DocumentationIndex(path).get_stats()["entries"]
+        leftovers = [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+    checks = [
+        (after_truncated == 0, "sections of a truncated response are not indexed"),
+        (after_complete == 2, "sections of a complete response are indexed"),
+        (
+            "Returns the sum" in reused["documentation"],
+            "unchanged symbols are served from the index",
+        ),
+        (after_temperature == 4, "a temperature change does not reuse sections"),
+        (after_prompt == 6, "a system prompt change does not reuse sections"),
+        (
+            reloaded == 6 and not leftovers,
+            "concurrent saves leave one complete index",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_history_store():
+    """Check that binary history files round-trip task results."""
+    print("\n🗃️  Testing binary task history...")
+
+    try:
+        from src.blob_store import BlobOutput, BlobStore, materialize
+        from src.history_store import HistoryWriter, is_history_file, read_history
+        from src.multi_agent_orchestrator import TaskResult, TaskType
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    def result(output, **fields):
+        return TaskResult(
+            agent_name="Code Reviewer",
+            task_type=TaskType.CODE_REVIEW,
+            input_data="def f(): pass",
+            output=output,
+            timestamp=datetime(2026, 1, 2, 3, 4, 5),
+            execution_time=1.5,
+            success=fields.pop("success", True),
+            **fields,
+        )
+
+    review = {"review": "Looks fine. " * 200, "sections": {"bugs": "None ✅"}}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.bin")
+        blobs = BlobStore(os.path.join(directory, "blobs"))
+        results = [
+            result(review, cache_hit="exact"),
+            result({}, success=False, error_message="boom", degraded="skipped"),
+            result(blobs.wrap(review)),
+        ]
+        with HistoryWriter(path, compress=True) as writer:
+            writer.write_all(results[:2])
+        with HistoryWriter(path, compress=True) as writer:
+            writer.write(results[2])
+        compressed_size = os.path.getsize(path)
+
+        records = list(read_history(path, blobs))
+        try:
+            list(read_history(path))
+            needs_store = False
+        except ValueError:
+            needs_store = True
+
+        with open(path, "ab") as f:
+            f.write(b"\x00\x00\x01\x00\x00partial")
+        after_crash = list(read_history(path, blobs))
+
+        plain = os.path.join(directory, "plain.bin")
+        with HistoryWriter(plain) as writer:
+            writer.write_all(results)
+
+        checks = [
+            (is_history_file(path), "history files are recognized by their header"),
+            (
+                [TaskResult.from_dict(r).to_dict() for r in records[:2]]
+                == [r.to_dict() for r in results[:2]],
+                "appended records read back unchanged",
+            ),
+            (
+                isinstance(records[2]["output"], BlobOutput)
+                and materialize(records[2]["output"]) == review,
+                "blob outputs are stored as references and resolved on read",
+            ),
+            (needs_store, "a blob reference without a blob store is an error"),
+            (len(after_crash) == 3, "a truncated last record is ignored"),
+            (
+                compressed_size * 4 < os.path.getsize(plain),
+                "large records are compressed",
+            ),
+        ]
+    return _report(checks)
+
+
+def test_blob_store():
+    """Check deduplication, lazy loading and error handling of blobs."""
+    print("\n🧱 Testing blob store...")
+
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.blob_store import BlobOutput, BlobStore, materialize
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    output = {"review": "Consider a guard clause. " * 100, "severity": "low"}
+    with tempfile.TemporaryDirectory() as directory:
+        store = BlobStore(directory, min_bytes=256, cache_size=1)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            digests = set(pool.map(lambda _: store.put(dict(output)), range(16)))
+        digest = digests.pop()
+        files = [name for _, _, names in os.walk(directory) for name in names]
+
+        small = store.wrap({"review": "ok"})
+        wrapped = store.wrap(output)
+
+        cold = BlobStore(directory, cache_size=1)
+        loaded = materialize(cold.wrap(output))
+        cold.get(digest)
+        cold.get(digest)
+        cache_hits = cold.get_stats()["cache_hits"]
+
+        blob_path = os.path.join(directory, digest[:2], digest[2:])
+        with open(blob_path, "wb") as f:
+            f.write(b"not zlib")
+        corrupt = BlobStore(directory)
+        errors = []
+        for bad in (digest, "0" * 64):
+            try:
+                corrupt.get(bad)
+            except ValueError as e:
+                errors.append(str(e))
+
+    checks = [
+        (not digests and len(files) == 1, "identical outputs are stored once"),
+        (
+            not isinstance(small, BlobOutput) and isinstance(wrapped, BlobOutput),
+            "only outputs of at least min_bytes become blobs",
+        ),
+        (
+            wrapped["severity"] == "low" and loaded == output,
+            "blob references load their output on access",
+        ),
+        (cache_hits >= 1, "repeated reads are served from the cache"),
+        (
+            len(errors) == 2 and "corrupt" in errors[0] and "not found" in errors[1],
+            "corrupt and missing blobs raise ValueError",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_daemon():
+    """Check daemon output routing, configuration keys and orchestrator reuse."""
+    print("\n👻 Testing CLI daemon...")
+
+    try:
+        import contextlib
+        import contextvars
+        import io
+
+        from src.daemon import CLIDaemon, DaemonClient, orchestrator_key
+        from src.scheduler import PriorityScheduler
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    base = {"OPENAI_MODEL": "gpt-4o", "PATH": "/usr/bin", "TERM": "xterm"}
+    same_configuration = orchestrator_key(base) == orchestrator_key(
+        {**base, "PATH": "/bin", "TERM": "dumb", "GIT_PAGER": "less"}
+    )
+    new_configuration = orchestrator_key(base) != orchestrator_key(
+        {**base, "CODE_REVIEWER_PROMPT": "Be strict."}
+    )
+
+    # Tasks (and their completion callbacks) run in the submitter's context
+    request = contextvars.ContextVar("request", default=None)
+    scheduler = PriorityScheduler(max_workers=2)
+    request.set("command-1")
+    future = scheduler.submit(request.get)
+    seen_by_callback = []
+    future.add_done_callback(lambda _: seen_by_callback.append(request.get()))
+    seen_by_task = future.result(timeout=5)
+    scheduler.shutdown()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    previous = os.environ.get("OPENAI_TEMPERATURE")
+    daemon = CLIDaemon()
+    schedulers = []
+    try:
+        for index in range(5):
+            os.environ["OPENAI_TEMPERATURE"] = f"0.{index}"
+            orchestrator = daemon.orchestrator(verbose=False)
+            # An expired task starts the scheduler without calling the LLM
+            orchestrator.submit_task(
+                "code_review", "x = 1", deadline_at=time.monotonic() - 1
+            ).result(timeout=5)
+            schedulers.append(orchestrator.scheduler)
+    finally:
+        if previous is None:
+            os.environ.pop("OPENAI_TEMPERATURE", None)
+        else:
+            os.environ["OPENAI_TEMPERATURE"] = previous
+
+    try:
+        schedulers[0].submit(lambda: None)
+        evicted_running = True
+    except RuntimeError:
+        evicted_running = False
+
+    with tempfile.TemporaryDirectory() as directory:
+        client = DaemonClient(os.path.join(directory, "daemon.sock"))
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                code = client.run(["status"])
+        finally:
+            client.stop()
+
+    checks = [
+        (same_configuration, "unrelated variables do not split configurations"),
+        (new_configuration, "agent settings select another orchestrator"),
+        (
+            seen_by_task == "command-1" and seen_by_callback == ["command-1"],
+            "scheduled tasks run in the submitter's context",
+        ),
+        (
+            not evicted_running and schedulers[-1].submit(lambda: 1).result() == 1,
+            "evicted orchestrators stop their scheduler",
+        ),
+        (
+            code == 0 and "Available Agents" in output.getvalue(),
+            "command output is streamed to the client",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_jobs():
+    """Check background job status, completion callbacks and cancellation."""
+    print("\n🧵 Testing background jobs...")
+
+    try:
+        from concurrent.futures import CancelledError, Future
+
+        from src.agents.cancellation import CancellationToken
+        from src.jobs import JobManager
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    finished = []
+    manager = JobManager(on_done=lambda job: finished.append(job.id))
+
+    release = threading.Event()
+    quick = manager.start("review a.py", lambda: release.wait(5) and "reviewed")
+    failing = manager.start("test b.py", lambda: 1 / 0)
+    running_while_blocked = [job.id for job in manager.running()]
+    release.set()
+    quick_result = quick.result(timeout=5)
+    try:
+        failing.result(timeout=5)
+    except ZeroDivisionError:
+        pass
+
+    token = CancellationToken()
+    cooperative = manager.start(
+        "doc c.py", lambda: "partial" if token.wait(5) else "complete", token
+    )
+    manager.cancel(cooperative.id)
+    partial = cooperative.result(timeout=5)
+
+    queued = manager.submit("arch", Future())
+    manager.cancel(queued.id)
+    try:
+        queued.result()
+        queued_cancelled = False
+    except CancelledError:
+        queued_cancelled = True
+
+    try:
+        manager.cancel(quick.id)
+        finished_cancellable = True
+    except ValueError:
+        finished_cancellable = False
+    time.sleep(0.05)
+
+    checks = [
+        (quick.id in running_while_blocked, "running jobs are listed"),
+        (
+            quick_result == "reviewed" and quick.status == "done",
+            "finished jobs keep their result",
+        ),
+        (failing.status == "failed", "jobs that raise are reported as failed"),
+        (
+            partial == "partial" and cooperative.status == "cancelled",
+            "cancelling through the token keeps the partial result",
+        ),
+        (queued_cancelled, "cancelling a queued job discards it"),
+        (not finished_cancellable, "finished jobs cannot be cancelled"),
+        (
+            sorted(finished) == [quick.id, failing.id],
+            "completion callbacks skip cancelled jobs",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_stream_cancellation():
+    """Check that cancelling a streamed request aborts it before the first token."""
+    print("\n🛑 Testing stream cancellation...")
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    try:
+        import asyncio
+
+        from langchain_core.language_models.chat_models import BaseChatModel
+        from langchain_core.messages import AIMessage
+
+        from src.agents.cancellation import CancellationToken, TaskCancelled
+        from src.agents.code_reviewer import CodeReviewer
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    closed = threading.Event()
+
+    class SlowModel(BaseChatModel):
+        """Model that takes far longer than the test to send its first token."""
+
+        @property
+        def _llm_type(self):
+            return "slow"
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            raise NotImplementedError
+
+        async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+            try:
+                await asyncio.sleep(30)
+                yield None
+            finally:
+                closed.set()
+
+    reviewer = CodeReviewer()
+    streams_usage = reviewer.llm.stream_usage is True
+    reviewer.verbose = False
+    reviewer.llm = SlowModel()
+
+    token = CancellationToken()
+    threading.Timer(0.1, token.cancel, args=("Cancelled by test",)).start()
+    started = time.monotonic()
+    try:
+        reviewer.process("def add(a, b):\n    return a + b\n", cancel_token=token)
+        raised = False
+    except TaskCancelled:
+        raised = True
+    elapsed = time.monotonic() - started
+
+    checks = [
+        (streams_usage, "agents ask for token usage on streamed responses"),
+        (raised and elapsed < 2, "cancelling returns before the first token"),
+        (closed.wait(1), "the cancelled request is closed at once"),
+    ]
+    return _report(checks)
+
+
+def test_watcher():
+    """Check that saved files are detected and only their changes are reviewed."""
+    print("\n👀 Testing the watcher...")
+
+    try:
+        from src.diff_review import diff_hunks
+        from src.multi_agent_orchestrator import TaskResult
+        from src.watcher import Debouncer, PollingWatcher, WatchReviewer
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    class RecordingOrchestrator:
+        """Orchestrator that records the tasks it is given."""
+
+        def __init__(self):
+            self.tasks = []
+
+        def execute_batch(self, tasks, max_workers, on_result, cancel_token):
+            self.tasks.extend(tasks)
+            results = []
+            for index, task in enumerate(tasks):
+                result = TaskResult(
+                    agent_name="Code Reviewer",
+                    task_type=task["task_type"],
+                    input_data=task["input_data"],
+                    output={"review": "Looks fine."},
+                    timestamp=datetime.now(),
+                    execution_time=0.0,
+                    success=True,
+                )
+                on_result(index, result)
+                results.append(result)
+            return results
+
+    old = "".join(f"def f{i}(x):\n    return x + {i}\n\n" for i in range(10))
+    new = old.replace("return x + 7", "return x * 7")
+    hunks = diff_hunks("module.py", old, new)
+
+    debouncer = Debouncer(quiet=0.5, max_delay=2.0)
+    debouncer.add({"a.py"}, now=0.0)
+    debouncer.add({"b.py"}, now=0.4)
+    quiet_due = (not debouncer.due(now=0.8), debouncer.due(now=0.9))
+    for moment in (1.0, 1.4, 1.8):
+        debouncer.add({"a.py"}, now=moment)
+    capped = debouncer.due(now=2.0)
+    batch = debouncer.drain()
+
+    with tempfile.TemporaryDirectory() as root:
+        with open(os.path.join(root, "module.py"), "w") as f:
+            f.write(old)
+        os.makedirs(os.path.join(root, ".git"))
+        with open(os.path.join(root, ".git", "hook.py"), "w") as f:
+            f.write("")
+
+        watcher = PollingWatcher(root, interval=0.05)
+        time.sleep(0.05)
+        with open(os.path.join(root, "module.py"), "w") as f:
+            f.write(new)
+        with open(os.path.join(root, "notes.txt"), "w") as f:
+            f.write("not source\n")
+        with open(os.path.join(root, "added.py"), "w") as f:
+            f.write("def added():\n    pass\n")
+        changed = watcher.changes(timeout=1.0)
+        os.remove(os.path.join(root, "added.py"))
+        removed = watcher.changes(timeout=1.0)
+        idle = watcher.changes(timeout=0.01)
+
+        orchestrator = RecordingOrchestrator()
+        with open(os.path.join(root, "module.py"), "w") as f:
+            f.write(old)
+        reviewer = WatchReviewer(orchestrator, root, watcher=watcher)
+        tracked = reviewer.file_count
+        with open(os.path.join(root, "module.py"), "w") as f:
+            f.write(new)
+        results = reviewer.review_changes({"module.py"})
+        unchanged = reviewer.review_changes({"module.py"})
+        watcher.close()
+
+    region = results[0][0] if results else None
+    checks = [
+        (
+            [(hunk.start, hunk.length) for hunk in hunks] == [(23, 1)]
+            and hunks[0].added == ["    return x * 7"]
+            and hunks[0].removed == ["    return x + 7"],
+            "diff_hunks reports only the edited line",
+        ),
+        (
+            [(hunk.start, hunk.length) for hunk in diff_hunks("m.py", "", new)]
+            == [(1, new.count("\n"))],
+            "a new file is one hunk covering the whole file",
+        ),
+        (quiet_due == (True, True), "a batch is due after a quiet period"),
+        (
+            capped and batch == {"a.py", "b.py"},
+            "continuous saves are batched no later than the maximum delay",
+        ),
+        (
+            changed == {"module.py", "added.py"},
+            "polling reports modified and created source files only",
+        ),
+        (removed == {"added.py"}, "polling reports deleted files"),
+        (idle == set(), "polling reports nothing when nothing changed"),
+        (tracked == 1, "the reviewer tracks the source files already present"),
+        (
+            len(results) == 1
+            and len(orchestrator.tasks) == 1
+            and region.start <= 23 <= region.end
+            and "def f7" in orchestrator.tasks[0]["input_data"]
+            and "def f0" not in orchestrator.tasks[0]["input_data"],
+            "only the function around the edit is reviewed",
+        ),
+        (
+            results
+            and results[0][1].output.get("location") == region.location,
+            "reviews are annotated with the file and lines",
+        ),
+        (unchanged == [], "saving identical content reviews nothing"),
+        (
+            reviewer.stats == {"batches": 1, "files": 1, "regions": 1},
+            "batches, files and regions are counted",
+        ),
+    ]
+    return _report(checks)
+
+
+def test_benchmark():
+    """Check that the benchmark matrix only reports p99 from enough samples."""
+    print("\n⏱️  Testing the provider benchmark...")
+
+    try:
+        import json
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        from test_api import (
+            MIN_TAIL_SAMPLES,
+            ProviderBenchmark,
+            format_row,
+            save_benchmark,
+        )
+    except ImportError as e:
+        print(f"⚠️  Skipped: {e}")
+        return True
+
+    class StreamingHandler(BaseHTTPRequestHandler):
+        """OpenAI-compatible endpoint streaming a two-token answer."""
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            choice = {"index": 0, "delta": {"content": "Adds"}, "finish_reason": None}
+            events = [
+                {"choices": [choice]},
+                {"choices": [dict(choice, delta={"content": " numbers."})]},
+                {"choices": [dict(choice, delta={}, finish_reason="stop")]},
+                {
+                    "choices": [],
+                    "usage": {
+                        "prompt_tokens": 10,
+                        "completion_tokens": 2,
+                        "total_tokens": 12,
+                    },
+                },
+            ]
+            for event in events:
+                event.update(
+                    id="bench", object="chat.completion.chunk", created=0, model="m"
+                )
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    target = {
+        "api_key": "sk-test",
+        "base_url": f"http://127.0.0.1:{server.server_port}/v1",
+        "model": "m",
+    }
+    try:
+        small = ProviderBenchmark(
+            {"local": target}, prompt_sizes=[16], concurrency_levels=[1], warmup=0
+        ).run()[0]
+        large = ProviderBenchmark(
+            {"local": target},
+            prompt_sizes=[16],
+            concurrency_levels=[8],
+            requests_per_level=MIN_TAIL_SAMPLES,
+            warmup=0,
+        ).run()[0]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmarks.csv")
+        save_benchmark([small, large], path)
+        with open(path, "r") as f:
+            lines = f.read().splitlines()
+    header = lines[0].split(",")
+    p99_column = header.index("latency_p99")
+
+    checks = [
+        (
+            small["samples"] == 4 and small["errors"] == 0,
+            "default cells send twice the concurrency (at least 4) requests",
+        ),
+        (
+            small["latency_p99"] is None and small["ttft_p99"] is None,
+            "p99 is left out of cells with too few samples",
+        ),
+        (
+            "n/a (4 < 100 samples)" in format_row(small),
+            "the summary explains the missing p99",
+        ),
+        (
+            large["samples"] == MIN_TAIL_SAMPLES
+            and large["latency_p99"] >= large["latency_p50"] > 0,
+            "p99 is reported from enough samples",
+        ),
+        (large["output_tokens"] == 2, "output tokens come from streamed usage"),
+        (
+            "samples" in header
+            and lines[1].split(",")[p99_column] == ""
+            and lines[2].split(",")[p99_column] != "",
+            "CSV rows leave p99 blank and record the sample count",
+        ),
+    ]
+    return _report(checks)
+
+
+def _report(checks):
+    """Print the outcome of (passed, description) checks."""
+    all_passed = True
+    for passed, description in checks:
+        print(f"{'✅' if passed else '❌'} {description}")
+        all_passed = all_passed and bool(passed)
+    return all_passed
+
+
 def main():
     """Run all tests."""
     print("🧪 Multi-Agent System Test")
@@ -152,6 +1900,31 @@ def main():
         ("Requirements", test_requirements),
         ("Environment Template", test_environment_template),
         ("Imports", test_imports),
+        ("Cassette", test_cassette),
+        ("Normalization", test_normalization),
+        ("Compaction", test_compaction),
+        ("Diff Review", test_diff_review),
+        ("Concurrency Limiter", test_concurrency_limiter),
+        ("Section Parsers", test_section_parsers),
+        ("JSON Lines", test_json_lines),
+        ("Priority Scheduler", test_priority_scheduler),
+        ("Pipeline", test_pipeline),
+        ("Profiling", test_profiling),
+        ("Deadlines", test_deadlines),
+        ("Token Budget", test_token_budget),
+        ("Micro Batcher", test_micro_batcher),
+        ("Static Analysis", test_static_analysis),
+        ("Summary Cache", test_summary_cache),
+        ("Retrieval", test_retrieval),
+        ("Verification", test_verification),
+        ("Doc Index", test_doc_index),
+        ("History Store", test_history_store),
+        ("Blob Store", test_blob_store),
+        ("Daemon", test_daemon),
+        ("Jobs", test_jobs),
+        ("Stream Cancellation", test_stream_cancellation),
+        ("Watcher", test_watcher),
+        ("Benchmark", test_benchmark),
     ]
 
     results = []
@@ -6,12 +6,17 @@ This script tests connectivity to various AI providers to ensure
 the system can connect to the configured API endpoint.
 """
 
+import argparse
+import csv
 import json
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
@@ -21,12 +26,43 @@ try:
     from dotenv import load_dotenv
     from langchain_openai import ChatOpenAI
 
+    from agents.compaction import estimate_tokens
+
     init(autoreset=True)
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Please install dependencies: pip install -r requirements.txt")
     sys.exit(1)
 
+# Code used to fill benchmark prompts up to the requested size
+BENCHMARK_SOURCE = Path(__file__).parent / "examples" / "example_code.py"
+
+# Successful requests a cell needs before its p99 columns are filled in
+MIN_TAIL_SAMPLES = 100
+
+# Columns of the benchmark matrix (CSV header and JSON row keys); the p99
+# columns are empty (null in JSON) for cells with fewer than MIN_TAIL_SAMPLES
+BENCHMARK_COLUMNS = [
+    "timestamp",
+    "provider",
+    "model",
+    "base_url",
+    "prompt_tokens",
+    "concurrency",
+    "requests",
+    "errors",
+    "error_rate",
+    "ttft_p50",
+    "ttft_p99",
+    "latency_p50",
+    "latency_p99",
+    "tokens_per_second",
+    "throughput",
+    "output_tokens",
+    "first_error",
+    "samples",
+]
+
 
 class APITester:
     """Test connectivity to AI providers."""
@@ -131,12 +167,9 @@ class APITester:
 
         return results
 
-    def test_providers(self) -> Dict[str, Dict[str, Any]]:
-        """Test multiple common providers."""
-        print(f"{Fore.CYAN}🌐 Testing Common Providers{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{'=' * 50}{Style.RESET_ALL}")
-
-        providers = {
+    def common_providers(self) -> Dict[str, Dict[str, Any]]:
+        """Connection settings of common providers, by display name."""
+        return {
             "OpenAI (Default)": {
                 "api_key": self.api_key,
                 "base_url": None,
@@ -154,6 +187,12 @@ class APITester:
             },
         }
 
+    def test_providers(self) -> Dict[str, Dict[str, Any]]:
+        """Test multiple common providers."""
+        print(f"{Fore.CYAN}🌐 Testing Common Providers{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}{'=' * 50}{Style.RESET_ALL}")
+
+        providers = self.common_providers()
         results = {}
 
         for provider_name, config in providers.items():
@@ -224,6 +263,260 @@ class APITester:
         return results
 
 
+class ProviderBenchmark:
+    """Latency and throughput matrix across providers, prompt sizes and concurrency."""
+
+    def __init__(
+        self,
+        targets: Dict[str, Dict[str, Any]],
+        prompt_sizes: List[int],
+        concurrency_levels: List[int],
+        requests_per_level: int = 0,
+        max_tokens: int = 128,
+        timeout: float = 120.0,
+        warmup: int = 1,
+        parallel_providers: bool = True,
+    ):
+        """
+        Initialize the benchmark.
+
+        Args:
+            targets: Connection settings (api_key, base_url, model) by name
+            prompt_sizes: Approximate prompt sizes in tokens
+            concurrency_levels: Numbers of requests kept in flight at once
+            requests_per_level: Requests per matrix cell (0 uses twice the
+                concurrency, at least 4; p99 needs MIN_TAIL_SAMPLES successes)
+            max_tokens: Maximum tokens generated per request
+            timeout: Request timeout in seconds
+            warmup: Unmeasured requests sent to each target first
+            parallel_providers: Benchmark targets concurrently (targets sharing
+                hardware, e.g. two local servers, should run one at a time)
+        """
+        self.targets = targets
+        self.prompt_sizes = prompt_sizes
+        self.concurrency_levels = concurrency_levels
+        self.requests_per_level = requests_per_level
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.warmup = warmup
+        self.parallel_providers = parallel_providers
+        self._print_lock = threading.Lock()
+
+    def run(self) -> List[Dict[str, Any]]:
+        """
+        Run every cell of the matrix.
+
+        Cells of one target run one after another so each concurrency level is
+        measured on its own; targets run concurrently.
+
+        Returns:
+            One row per (target, prompt size, concurrency), see BENCHMARK_COLUMNS
+        """
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        workers = len(self.targets) if self.parallel_providers else 1
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            futures = [
+                executor.submit(self._run_target, name, config, timestamp)
+                for name, config in self.targets.items()
+            ]
+            return [row for future in futures for row in future.result()]
+
+    def _run_target(
+        self, name: str, config: Dict[str, Any], timestamp: str
+    ) -> List[Dict[str, Any]]:
+        """Benchmark one target over all prompt sizes and concurrency levels."""
+        llm_kwargs = {
+            "model": config["model"],
+            "temperature": 0.1,
+            "max_tokens": self.max_tokens,
+            "openai_api_key": config["api_key"],
+            "timeout": self.timeout,
+            "max_retries": 0,  # retries would hide errors and skew latency
+            "stream_usage": True,
+        }
+        if config.get("base_url"):
+            llm_kwargs["base_url"] = config["base_url"]
+        llm = ChatOpenAI(**llm_kwargs)
+
+        for _ in range(self.warmup):
+            self._measure(llm, build_prompt(16))
+
+        rows = []
+        for size in self.prompt_sizes:
+            prompt = build_prompt(size)
+            for concurrency in self.concurrency_levels:
+                row = self._run_level(llm, prompt, concurrency)
+                row.update(
+                    timestamp=timestamp,
+                    provider=name,
+                    model=config["model"],
+                    base_url=config.get("base_url") or "",
+                    prompt_tokens=size,
+                    concurrency=concurrency,
+                )
+                rows.append(row)
+                with self._print_lock:
+                    print(format_row(row))
+        return rows
+
+    def _run_level(self, llm: Any, prompt: str, concurrency: int) -> Dict[str, Any]:
+        """Send requests with a fixed number in flight and aggregate them."""
+        count = self.requests_per_level or max(2 * concurrency, 4)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(
+                executor.map(lambda _: self._measure(llm, prompt), range(count))
+            )
+        wall_time = time.perf_counter() - start
+
+        succeeded = [sample for sample in samples if sample["error"] is None]
+        errors = [sample["error"] for sample in samples if sample["error"] is not None]
+        ttfts = sorted(sample["ttft"] for sample in succeeded)
+        latencies = sorted(sample["latency"] for sample in succeeded)
+        rates = [
+            sample["output_tokens"] / (sample["latency"] - sample["ttft"])
+            for sample in succeeded
+            if sample["latency"] > sample["ttft"]
+        ]
+        output_tokens = sum(sample["output_tokens"] for sample in succeeded)
+        # With few samples the nearest-rank p99 is just the slowest request
+        tail = len(succeeded) >= MIN_TAIL_SAMPLES
+
+        return {
+            "requests": count,
+            "errors": len(errors),
+            "error_rate": round(len(errors) / count, 4),
+            "ttft_p50": round(_percentile(ttfts, 0.50), 4),
+            "ttft_p99": round(_percentile(ttfts, 0.99), 4) if tail else None,
+            "latency_p50": round(_percentile(latencies, 0.50), 4),
+            "latency_p99": (round(_percentile(latencies, 0.99), 4) if tail else None),
+            # Per-request generation speed (after the first token)
+            "tokens_per_second": round(sum(rates) / len(rates), 2) if rates else 0.0,
+            # Output tokens per second across all requests in flight
+            "throughput": round(output_tokens / wall_time, 2) if wall_time else 0.0,
+            "output_tokens": (
+                round(output_tokens / len(succeeded), 1) if succeeded else 0
+            ),
+            "first_error": errors[0][:200] if errors else "",
+            "samples": len(succeeded),
+        }
+
+    def _measure(self, llm: Any, prompt: str) -> Dict[str, Any]:
+        """Stream one request, timing the first token and the whole response."""
+        start = time.perf_counter()
+        ttft = None
+        content = []
+        usage = None
+        try:
+            for chunk in llm.stream(prompt):
+                text = chunk.content if isinstance(chunk.content, str) else ""
+                if text:
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    content.append(text)
+                usage = getattr(chunk, "usage_metadata", None) or usage
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}", "ttft": 0.0, "latency": 0.0}
+
+        latency = time.perf_counter() - start
+        # Providers that do not report usage get the same estimate as the agents
+        output_tokens = (usage or {}).get("output_tokens") or estimate_tokens(
+            "".join(content)
+        )
+        return {
+            "error": None,
+            "ttft": ttft if ttft is not None else latency,
+            "latency": latency,
+            "output_tokens": output_tokens,
+        }
+
+
+def build_prompt(tokens: int) -> str:
+    """
+    Build a code summary prompt of roughly the given size.
+
+    Args:
+        tokens: Approximate prompt size in tokens
+
+    Returns:
+        Prompt text
+    """
+    instruction = (
+        "Summarize what the following Python code does in a few sentences.\n\n"
+    )
+    try:
+        source = BENCHMARK_SOURCE.read_text()
+    except OSError:
+        source = "def add(a, b):\n    return a + b\n\n"
+    length = max(tokens * 4 - len(instruction), 0)
+    code = (source * (length // len(source) + 1))[:length]
+    return instruction + code
+
+
+def format_row(row: Dict[str, Any]) -> str:
+    """One-line summary of a benchmark row."""
+    p99 = (
+        f"{row['latency_p99']:.2f}s"
+        if row["latency_p99"] is not None
+        else f"n/a ({row['samples']} < {MIN_TAIL_SAMPLES} samples)"
+    )
+    status = f"{Fore.GREEN}✅" if not row["errors"] else f"{Fore.YELLOW}⚠️"
+    if row["errors"] == row["requests"]:
+        status = f"{Fore.RED}❌"
+    return (
+        f"{status} {row['provider']} ({row['model']}) "
+        f"prompt≈{row['prompt_tokens']} x{row['concurrency']}: "
+        f"TTFT p50 {row['ttft_p50']:.2f}s, "
+        f"latency p50 {row['latency_p50']:.2f}s / p99 {p99}, "
+        f"{row['tokens_per_second']:.1f} tok/s, "
+        f"{row['throughput']:.1f} tok/s total, "
+        f"errors {row['error_rate']:.0%}{Style.RESET_ALL}"
+    )
+
+
+def save_benchmark(rows: List[Dict[str, Any]], path: str) -> None:
+    """
+    Save benchmark rows, appending to an existing file.
+
+    Runs accumulate in the same file so results can be compared over time.
+
+    Args:
+        rows: Rows from ProviderBenchmark.run
+        path: Output path; .csv writes CSV, anything else JSON
+
+    Raises:
+        ValueError: If an existing JSON file is not a benchmark file
+    """
+    if path.endswith(".csv"):
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=BENCHMARK_COLUMNS)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+        return
+
+    document = {"runs": []}
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            document = json.load(f)
+        if not isinstance(document, dict) or not isinstance(document.get("runs"), list):
+            raise ValueError(f"Not a benchmark file: {path}")
+    document["runs"].append(
+        {"timestamp": rows[0]["timestamp"] if rows else None, "rows": rows}
+    )
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
 def main():
     """Main entry point."""
     print(f"{Fore.CYAN}🤖 API Connection Test Suite{Style.RESET_ALL}")
@@ -309,8 +602,159 @@ def main():
     return 0 if connection_result["success"] else 1
 
 
+def _int_list(value: str) -> List[int]:
+    """Parse a comma-separated list of positive integers."""
+    try:
+        numbers = [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected comma-separated integers: {value}")
+    if not numbers or min(numbers) < 1:
+        raise argparse.ArgumentTypeError(f"Expected positive integers: {value}")
+    return numbers
+
+
+def run_benchmark(argv: Optional[List[str]] = None) -> int:
+    """Benchmark latency and throughput of providers and models."""
+    parser = argparse.ArgumentParser(
+        prog="test_api.py benchmark",
+        description="Latency/throughput matrix of providers x prompt sizes x concurrency",
+    )
+    parser.add_argument(
+        "--models",
+        help="Comma-separated models to test on the configured endpoint "
+        "(default: OPENAI_MODEL)",
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        metavar="NAME=MODEL@URL",
+        help="Additional endpoint to test (repeatable; the key is OPENAI_API_KEY)",
+    )
+    parser.add_argument(
+        "--providers",
+        action="store_true",
+        help="Also test the common providers (OpenAI, Ollama, LM Studio)",
+    )
+    parser.add_argument(
+        "--prompt-sizes",
+        type=_int_list,
+        default=[128, 1024, 4096],
+        help="Comma-separated prompt sizes in tokens (default: 128,1024,4096)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=_int_list,
+        default=[1, 4, 8],
+        help="Comma-separated concurrency levels (default: 1,4,8)",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=0,
+        help="Requests per cell (default: twice the concurrency, at least 4; "
+        f"p99 is only reported from {MIN_TAIL_SAMPLES} successful requests)",
+    )
+    parser.add_argument(
+        "--max-tokens", type=int, default=128, help="Tokens generated per request"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=120.0, help="Request timeout in seconds"
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Benchmark providers one at a time (e.g. local servers sharing a GPU)",
+    )
+    parser.add_argument(
+        "--output",
+        action="append",
+        default=[],
+        help="Append the matrix to a .csv or .json file (repeatable)",
+    )
+    args = parser.parse_args(argv)
+
+    tester = APITester()
+    targets = {}
+    models = args.models.split(",") if args.models else [tester.model]
+    for model in (model.strip() for model in models if model.strip()):
+        targets[model] = {
+            "api_key": tester.api_key,
+            "base_url": tester.api_base_url,
+            "model": model,
+        }
+    for spec in args.target:
+        name, _, rest = spec.rpartition("=")
+        model, _, base_url = rest.partition("@")
+        if not model:
+            print(f"{Fore.RED}❌ Invalid target: {spec}{Style.RESET_ALL}")
+            return 1
+        targets[name or rest] = {
+            "api_key": tester.api_key or "not-needed",
+            "base_url": base_url or tester.api_base_url,
+            "model": model,
+        }
+    if args.providers:
+        for name, config in tester.common_providers().items():
+            if config["api_key"]:
+                targets[name] = config
+
+    missing = [name for name, config in targets.items() if not config["api_key"]]
+    for name in missing:
+        print(f"{Fore.YELLOW}⚠️  Skipped {name}: No API key{Style.RESET_ALL}")
+        del targets[name]
+    if not targets:
+        print(f"{Fore.RED}❌ Nothing to benchmark{Style.RESET_ALL}")
+        return 1
+
+    print(f"{Fore.CYAN}⏱️  Provider Benchmark{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'=' * 50}{Style.RESET_ALL}")
+    print(f"  Targets: {', '.join(targets)}")
+    print(f"  Prompt sizes: {', '.join(map(str, args.prompt_sizes))} tokens")
+    print(f"  Concurrency: {', '.join(map(str, args.concurrency))}\n")
+
+    benchmark = ProviderBenchmark(
+        targets,
+        prompt_sizes=args.prompt_sizes,
+        concurrency_levels=args.concurrency,
+        requests_per_level=args.requests,
+        max_tokens=args.max_tokens,
+        timeout=args.timeout,
+        parallel_providers=not args.sequential,
+    )
+    rows = benchmark.run()
+
+    working = [row for row in rows if row["errors"] < row["requests"]]
+    if working:
+        print(f"\n{Fore.CYAN}🏆 Best per prompt size{Style.RESET_ALL}")
+        for size in args.prompt_sizes:
+            cells = [row for row in working if row["prompt_tokens"] == size]
+            if not cells:
+                continue
+            fastest = min(cells, key=lambda row: row["ttft_p50"])
+            busiest = max(cells, key=lambda row: row["throughput"])
+            print(
+                f"  prompt≈{size}: fastest first token {fastest['provider']} "
+                f"({fastest['ttft_p50']:.2f}s), highest throughput "
+                f"{busiest['provider']} x{busiest['concurrency']} "
+                f"({busiest['throughput']:.1f} tok/s)"
+            )
+
+    for path in args.output:
+        try:
+            save_benchmark(rows, path)
+            print(f"{Fore.GREEN}💾 Saved matrix to {path}{Style.RESET_ALL}")
+        except (OSError, ValueError) as e:
+            print(f"{Fore.RED}❌ Failed to save {path}: {e}{Style.RESET_ALL}")
+            return 1
+
+    return 0 if working else 1
+
+
 if __name__ == "__main__":
     try:
+        if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+            sys.exit(run_benchmark(sys.argv[2:]))
         sys.exit(main())
     except KeyboardInterrupt:
         print(f"\n{Fore.YELLOW}👋 Goodbye!{Style.RESET_ALL}")